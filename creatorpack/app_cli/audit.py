@@ -0,0 +1,363 @@
+"""License audits: check a whole media library against the license gate without running the pipeline."""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+from .batch import load_batch_manifest
+from .ingest.license_gate import LicenseGate, LicenseInfo, LicenseViolationError, license_info
+from .ingest.metadata import LicenseResolver, license_code_from_url
+from .ingest.sources import ALLOWED_DOMAINS, IngestInput
+from .util.errors import CreatorPackError
+from .watch import MEDIA_EXTENSIONS
+
+try:  # pragma: no cover - optional dependency
+    import yaml  # type: ignore
+except Exception:  # pragma: no cover - fallback parser
+    yaml = None
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Per-file sidecars are looked up as ``<name><suffix>`` then ``<stem><suffix>``.
+SIDECAR_SUFFIXES = (".json", ".xmp", ".yaml", ".yml")
+# Folder-wide defaults apply to every file below them that has no sidecar of its own.
+FOLDER_SIDECARS = ("license.json", "license.yaml", "license.yml")
+_LISTING_CACHE = 4096
+
+_RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+_DC = "http://purl.org/dc/elements/1.1/"
+_CC = "http://creativecommons.org/ns#"
+_XMP_RIGHTS = "http://ns.adobe.com/xap/1.0/rights/"
+
+
+class AuditError(CreatorPackError):
+    """Raised when an audit target cannot be read."""
+
+
+@dataclass
+class AuditResult:
+    """Outcome for one file or URL: ``allowed``, ``blocked``, ``missing`` (no license metadata) or ``error``."""
+
+    path: str
+    status: str
+    license_code: Optional[str] = None
+    requires_attribution: bool = False
+    sidecar: Optional[str] = None
+    reason: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass
+class AuditSummary:
+    counts: Dict[str, int] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def passed(self) -> bool:
+        return self.total == self.counts.get("allowed", 0)
+
+    def add(self, result: AuditResult) -> None:
+        self.counts[result.status] = self.counts.get(result.status, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "files": self.total,
+            "counts": dict(sorted(self.counts.items())),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "files_per_second": round(self.total / self.wall_seconds, 1) if self.wall_seconds > 0 else None,
+        }
+
+
+class SidecarFinder:
+    """Finds the metadata file that describes a media file, listing each directory once.
+
+    Directory listings come from the library walk when there is one (see
+    :func:`iter_library`) or from a single ``os.listdir`` otherwise, so a file
+    costs set lookups rather than a failed ``stat`` per candidate name.
+    """
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = root
+        self._listings: "OrderedDict[Path, FrozenSet[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def remember(self, directory: Path, names: Iterable[str]) -> None:
+        with self._lock:
+            self._listings[directory] = frozenset(names)
+            self._listings.move_to_end(directory)
+            while len(self._listings) > _LISTING_CACHE:
+                self._listings.popitem(last=False)
+
+    def find(self, path: Path) -> Optional[Path]:
+        names = self._listing(path.parent)
+        stem = path.name.rsplit(".", 1)[0]
+        for base in (path.name, stem):
+            for suffix in SIDECAR_SUFFIXES:
+                if base + suffix in names:
+                    return path.parent / (base + suffix)
+        directory = path.parent
+        while True:
+            names = self._listing(directory)
+            for name in FOLDER_SIDECARS:
+                if name in names:
+                    return directory / name
+            if self.root is None or directory == self.root or directory.parent == directory:
+                return None
+            directory = directory.parent
+
+    def _listing(self, directory: Path) -> FrozenSet[str]:
+        with self._lock:
+            names = self._listings.get(directory)
+        if names is None:
+            try:
+                names = frozenset(os.listdir(directory))
+            except OSError:
+                names = frozenset()
+            self.remember(directory, names)
+        return names
+
+
+def iter_library(root: Path, finder: Optional[SidecarFinder] = None) -> Iterator[Path]:
+    """Media files under ``root`` (hidden directories skipped), walked with ``os.scandir``."""
+
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                listing = list(entries)
+        except OSError:
+            continue
+        if finder is not None:
+            finder.remember(directory, (entry.name for entry in listing))
+        subdirs = []
+        for entry in sorted(listing, key=lambda item: item.name):
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith("."):
+                    subdirs.append(Path(entry.path))
+            elif os.path.splitext(entry.name)[1].lower() in MEDIA_EXTENSIONS:
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
+def iter_manifest(path: Path) -> Iterator[IngestInput]:
+    """Inputs listed in a batch manifest (``file``/``url`` columns) or a plain text file of paths."""
+
+    if path.suffix.lower() in {".csv", ".jsonl", ".ndjson"}:
+        for row in load_batch_manifest(path):
+            for column, kind in (("file", "local"), ("url", None)):
+                raw = row.values.get(column)
+                values = raw if isinstance(raw, list) else str(raw or "").split(";")
+                for value in (str(item).strip() for item in values):
+                    if value:
+                        yield IngestInput(kind or ALLOWED_DOMAINS.get(urlparse(value).netloc.lower(), "unknown"), value)
+        return
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            value = line.strip()
+            if value and not value.startswith("#"):
+                yield IngestInput("local", value)
+
+
+def read_sidecar(path: Path) -> Dict[str, Optional[str]]:
+    """License fields (``license_code``, ``license_url``, ``title``, ``creator``, ``source``) of a sidecar file."""
+
+    if path.suffix.lower() == ".xmp":
+        return _read_xmp(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        data = json.loads(text)
+    elif yaml is not None:
+        try:
+            data = yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        except yaml.YAMLError as exc:
+            raise AuditError(f"{path} is not valid YAML: {exc}") from exc
+    else:  # pragma: no cover - exercised only without PyYAML
+        from .branding.theme import _fallback_yaml_load
+
+        data = _fallback_yaml_load(text)
+    if not isinstance(data, dict):
+        raise AuditError(f"{path} does not hold a mapping")
+    license_value = data.get("license_code") or data.get("license")
+    license_url = data.get("license_url")
+    return {
+        "license_code": _license_code(str(license_value)) if license_value else _url_code(license_url),
+        "license_url": license_url,
+        "title": data.get("title"),
+        "creator": data.get("creator") or data.get("author") or data.get("artist"),
+        "source": data.get("source"),
+    }
+
+
+def audit_inputs(
+    inputs: Iterable[IngestInput],
+    gate: LicenseGate,
+    *,
+    finder: Optional[SidecarFinder] = None,
+    workers: int = 16,
+    default_license: Optional[str] = None,
+    resolver: Optional[LicenseResolver] = None,
+) -> Iterator[AuditResult]:
+    """Check every input against ``gate`` on ``workers`` threads, yielding results in input order.
+
+    Local files take their license from a sidecar (see :class:`SidecarFinder`),
+    falling back to ``default_license`` when given; URLs are looked up by
+    ``resolver``. Inputs are consumed lazily, so a walk of a large library
+    streams through a bounded window instead of being listed up front.
+    """
+
+    finder = finder or SidecarFinder()
+
+    def _audit(ingest: IngestInput) -> AuditResult:
+        try:
+            return _audit_one(ingest, gate, finder, default_license, resolver)
+        except (CreatorPackError, OSError, ValueError, ElementTree.ParseError) as exc:
+            return AuditResult(path=ingest.value, status="error", reason=str(exc) or exc.__class__.__name__)
+
+    return _bounded_map(_audit, inputs, workers)
+
+
+def run_audit(
+    results: Iterable[AuditResult], write: Callable[[str], None], *, flush: Callable[[], None], flush_every: int = 256
+) -> AuditSummary:
+    """Stream ``results`` as JSON lines through ``write`` and tally them."""
+
+    summary = AuditSummary()
+    started = time.monotonic()
+    for count, result in enumerate(results, start=1):
+        summary.add(result)
+        write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+        if count % flush_every == 0:
+            flush()
+    flush()
+    summary.wall_seconds = time.monotonic() - started
+    return summary
+
+
+def _audit_one(
+    ingest: IngestInput,
+    gate: LicenseGate,
+    finder: SidecarFinder,
+    default_license: Optional[str],
+    resolver: Optional[LicenseResolver],
+) -> AuditResult:
+    sidecar: Optional[Path] = None
+    if ingest.kind == "local":
+        path = Path(ingest.value)
+        if not path.is_file():
+            return AuditResult(path=ingest.value, status="error", reason="file not found")
+        sidecar = finder.find(path)
+        fields = read_sidecar(sidecar) if sidecar else {}
+        if not fields.get("license_code"):
+            if default_license is None:
+                reason = "no license in sidecar" if sidecar else "no sidecar metadata"
+                return AuditResult(path=ingest.value, status="missing", sidecar=_str(sidecar), reason=reason)
+            fields = {**fields, "license_code": default_license}
+        info = license_info(
+            source=fields.get("source") or "local",
+            title=fields.get("title") or path.stem,
+            creator=fields.get("creator"),
+            license_code=str(fields["license_code"]),
+            license_url=fields.get("license_url"),
+        )
+    elif resolver is None:
+        return AuditResult(path=ingest.value, status="error", reason="URL lookups are disabled")
+    elif ingest.kind not in resolver.adapters:
+        return AuditResult(path=ingest.value, status="error", reason="domain is not allowlisted")
+    else:
+        info = resolver.resolve(ingest)
+    return _verdict(ingest.value, info, gate, sidecar)
+
+
+def _verdict(value: str, info: LicenseInfo, gate: LicenseGate, sidecar: Optional[Path]) -> AuditResult:
+    result = AuditResult(
+        path=value,
+        status="allowed",
+        license_code=info.license_code,
+        requires_attribution=info.requires_attribution,
+        sidecar=_str(sidecar),
+    )
+    try:
+        gate.ensure_allowed(info)
+    except LicenseViolationError as exc:
+        result.status, result.reason = "blocked", str(exc)
+    return result
+
+
+def _bounded_map(fn: Callable[[T], R], items: Iterable[T], workers: int) -> Iterator[R]:
+    workers = max(workers, 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="creatorpack-audit") as executor:
+        window: Deque = deque()
+        for item in items:
+            window.append(executor.submit(fn, item))
+            if len(window) >= workers * 4:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def _read_xmp(path: Path) -> Dict[str, Optional[str]]:
+    root = ElementTree.parse(path).getroot()
+    license_url = _xmp_value(root, _CC, "license") or _xmp_value(root, _XMP_RIGHTS, "WebStatement")
+    terms = _xmp_value(root, _XMP_RIGHTS, "UsageTerms")
+    code = _url_code(license_url)
+    if code in (None, "unknown") and terms:
+        code = _license_code(terms)
+    return {
+        "license_code": None if code == "unknown" else code,
+        "license_url": license_url,
+        "title": _xmp_value(root, _DC, "title"),
+        "creator": _xmp_value(root, _DC, "creator"),
+        "source": None,
+    }
+
+
+def _xmp_value(root: ElementTree.Element, namespace: str, name: str) -> Optional[str]:
+    tag = f"{{{namespace}}}{name}"
+    for element in root.iter():
+        if element.get(tag):  # attribute form: <rdf:Description cc:license="...">
+            return element.get(tag)
+    for element in root.iter(tag):
+        resource = element.get(f"{{{_RDF}}}resource")
+        if resource:
+            return resource
+        items: List[str] = [li.text.strip() for li in element.iter(f"{{{_RDF}}}li") if li.text and li.text.strip()]
+        if items:
+            return ", ".join(items)
+        if element.text and element.text.strip():
+            return element.text.strip()
+    return None
+
+
+def _license_code(value: str) -> str:
+    if "://" in value:
+        return license_code_from_url(value)
+    code = re.sub(r"[\s_]+", "-", value.strip().lower())
+    return {"cc-zero": "cc0", "cc0-1.0": "cc0", "public-domain-mark": "pd"}.get(code, code)
+
+
+def _url_code(url: Optional[str]) -> Optional[str]:
+    return license_code_from_url(url) if url else None
+
+
+def _str(path: Optional[Path]) -> Optional[str]:
+    return str(path) if path is not None else None
+
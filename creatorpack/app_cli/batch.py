@@ -0,0 +1,186 @@
+"""Batch runs: many jobs from one manifest in a single warm process."""
+from __future__ import annotations
+
+import contextvars
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .util.errors import CreatorPackError
+from .util.io import dump_json
+
+
+class BatchManifestError(CreatorPackError):
+    """Raised when a batch manifest cannot be read."""
+
+
+@dataclass
+class BatchRow:
+    """One manifest row: ``run`` option values keyed by column name."""
+
+    line: int
+    values: Dict[str, Any]
+
+
+@dataclass
+class BatchRowResult:
+    line: int
+    status: str  # completed | skipped | duplicate | failed
+    job_id: Optional[str] = None
+    error: Optional[str] = None
+    exit_code: Optional[int] = None
+    media_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+
+@dataclass
+class BatchReport:
+    results: List[BatchRowResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def failures(self) -> List[BatchRowResult]:
+        return [result for result in self.results if result.status == "failed"]
+
+    @property
+    def media_seconds(self) -> float:
+        return sum(result.media_seconds for result in self.results)
+
+    @property
+    def throughput(self) -> float:
+        """Media hours processed per wall-clock hour."""
+
+        return self.media_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        counts: Dict[str, int] = {}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return {
+            "rows": len(self.results),
+            "counts": counts,
+            "media_hours": round(self.media_seconds / 3600, 4),
+            "wall_hours": round(self.wall_seconds / 3600, 4),
+            "media_hours_per_wall_hour": round(self.throughput, 3),
+        }
+
+
+def load_batch_manifest(path: Path) -> List[BatchRow]:
+    """Read a ``.csv`` (header row) or ``.jsonl`` manifest; blank lines (and ``#`` lines in JSONL) are ignored."""
+
+    suffix = path.suffix.lower()
+    rows: List[BatchRow] = []
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        if suffix == ".csv":
+            reader = csv.DictReader(handle)
+            for record in reader:
+                values = {key.strip(): value.strip() for key, value in record.items() if key and value}
+                if values:
+                    rows.append(BatchRow(line=reader.line_num, values=values))
+        elif suffix in {".jsonl", ".ndjson"}:
+            for line_no, line in enumerate(handle, start=1):
+                text = line.strip()
+                if not text or text.startswith("#"):
+                    continue
+                try:
+                    values = json.loads(text)
+                except ValueError as exc:
+                    raise BatchManifestError(f"{path}:{line_no}: invalid JSON ({exc})") from exc
+                if not isinstance(values, dict):
+                    raise BatchManifestError(f"{path}:{line_no}: each line must be a JSON object")
+                rows.append(BatchRow(line=line_no, values=values))
+        else:
+            raise BatchManifestError(f"Unsupported batch manifest '{path.name}'; use .csv or .jsonl")
+    return rows
+
+
+def run_batch(
+    rows: List[BatchRow],
+    *,
+    prepare: Callable[[Dict[str, Any]], Any],
+    execute: Callable[[Any], float],
+    is_complete: Callable[[Any], bool],
+    jobs: int = 2,
+) -> BatchReport:
+    """Run every row with at most ``jobs`` jobs in flight.
+
+    ``prepare`` turns row values into options carrying a ``job_id`` (validation
+    errors fail only that row), ``is_complete`` lets rows whose export already
+    finished be skipped, and ``execute`` runs one job and returns the seconds of
+    media it processed. A failing row is recorded and the batch carries on.
+    """
+
+    started = time.monotonic()
+    results: Dict[int, BatchRowResult] = {}
+    seen: Dict[str, int] = {}
+    pending = []
+    with ThreadPoolExecutor(max_workers=max(jobs, 1), thread_name_prefix="creatorpack-batch") as executor:
+        for index, row in enumerate(rows):
+            try:
+                options = prepare(row.values)
+            except Exception as exc:
+                results[index] = _failed(row, None, exc)
+                continue
+            job_id = options.job_id
+            if job_id in seen:
+                results[index] = BatchRowResult(
+                    line=row.line, status="duplicate", job_id=job_id, error=f"same job as line {seen[job_id]}"
+                )
+                continue
+            seen[job_id] = row.line
+            if is_complete(options):
+                results[index] = BatchRowResult(line=row.line, status="skipped", job_id=job_id)
+                continue
+            # Each job runs in its own context so its log records stay in its own job log.
+            context = contextvars.copy_context()
+            pending.append((index, executor.submit(context.run, _execute_row, row, options, execute)))
+        for index, future in pending:
+            results[index] = future.result()
+    return BatchReport(
+        results=[results[index] for index in sorted(results)],
+        wall_seconds=time.monotonic() - started,
+    )
+
+
+def write_batch_report(report: BatchReport, report_dir: Path) -> None:
+    """Write ``batch.results.jsonl``, ``batch.failures.jsonl`` and ``batch.summary.json``."""
+
+    report_dir.mkdir(parents=True, exist_ok=True)
+    for filename, results in (
+        ("batch.results.jsonl", report.results),
+        ("batch.failures.jsonl", report.failures),
+    ):
+        lines = [json.dumps(asdict(result), ensure_ascii=False) for result in results]
+        (report_dir / filename).write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+    dump_json(report.to_dict(), report_dir / "batch.summary.json")
+
+
+def _execute_row(row: BatchRow, options: Any, execute: Callable[[Any], float]) -> BatchRowResult:
+    started = time.monotonic()
+    try:
+        media_seconds = execute(options)
+    except Exception as exc:
+        return _failed(row, options.job_id, exc, wall_seconds=time.monotonic() - started)
+    return BatchRowResult(
+        line=row.line,
+        status="completed",
+        job_id=options.job_id,
+        media_seconds=round(media_seconds, 3),
+        wall_seconds=round(time.monotonic() - started, 3),
+    )
+
+
+def _failed(row: BatchRow, job_id: Optional[str], exc: Exception, *, wall_seconds: float = 0.0) -> BatchRowResult:
+    return BatchRowResult(
+        line=row.line,
+        status="failed",
+        job_id=job_id,
+        error=str(exc) or exc.__class__.__name__,
+        # CreatorPackError and click usage errors both carry the exit code ``run`` would have used.
+        exit_code=getattr(exc, "exit_code", None),
+        wall_seconds=round(wall_seconds, 3),
+    )
@@ -1,9 +1,9 @@
 """Brand theme parsing."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from ..util.errors import CreatorPackError, ExitCodes
 
@@ -60,6 +60,14 @@ def _load_yaml(path: Path) -> dict:
     return _fallback_yaml_load(content)
 
 
+# Fractions of a 9:16 frame covered by platform UI (top, right, bottom, left).
+SAFE_AREA_MARGINS = {
+    "tiktok": (0.09, 0.14, 0.20, 0.05),
+    "shorts": (0.08, 0.12, 0.18, 0.05),
+    "reels": (0.10, 0.12, 0.22, 0.05),
+}
+
+
 @dataclass
 class BrandTheme:
     name: str
@@ -72,11 +80,26 @@ class BrandTheme:
     watermark_position_expr: str
     watermark_scale: float
     watermark_opacity: float
+    watermark_anchor: str = "top_right"
+    safe_areas: dict = field(default_factory=dict)
 
     @property
     def watermark_position(self) -> str:
         return self.watermark_position_expr
 
+    def safe_area_margins(self) -> Tuple[float, float, float, float]:
+        """Return (top, right, bottom, left) margins covering every enabled platform UI."""
+
+        enabled = [name for name, value in self.safe_areas.items() if value and name in SAFE_AREA_MARGINS]
+        if not enabled:
+            return (0.0, 0.0, 0.0, 0.0)
+        return tuple(max(SAFE_AREA_MARGINS[name][side] for name in enabled) for side in range(4))  # type: ignore[return-value]
+
+    def safe_watermark_position(self) -> str:
+        """Overlay expression that keeps the watermark clear of platform UI chrome."""
+
+        return _resolve_safe_overlay(self.watermark_anchor, self.safe_area_margins())
+
 
 def _resolve_overlay(position: str) -> str:
     mapping = {
@@ -89,6 +112,23 @@ def _resolve_overlay(position: str) -> str:
     return mapping.get(position, "10:10")
 
 
+def _resolve_safe_overlay(position: str, margins: Tuple[float, float, float, float]) -> str:
+    # Plain arithmetic only: commas inside overlay expressions would split the filter chain.
+    top, right, bottom, left = margins
+    x_left = f"main_w*{left}" if left else "10"
+    x_right = f"main_w-overlay_w-main_w*{right}" if right else "main_w-overlay_w-10"
+    y_top = f"main_h*{top}" if top else "10"
+    y_bottom = f"main_h-overlay_h-main_h*{bottom}" if bottom else "main_h-overlay_h-10"
+    mapping = {
+        "top_left": f"{x_left}:{y_top}",
+        "top_right": f"{x_right}:{y_top}",
+        "bottom_left": f"{x_left}:{y_bottom}",
+        "bottom_right": f"{x_right}:{y_bottom}",
+        "center": "(main_w-overlay_w)/2:(main_h-overlay_h)/2",
+    }
+    return mapping.get(position, f"{x_left}:{y_top}")
+
+
 class BrandThemeError(CreatorPackError):
     """Raised when branding configuration is invalid."""
 
@@ -111,6 +151,12 @@ def load_brand_theme(path: Path) -> BrandTheme:
     if watermark_path and not watermark_path.exists():
         raise BrandThemeError(f"Watermark file not found: {watermark_path}")
 
+    safe_areas = content.get("safe_areas", {})
+    if safe_areas is None:
+        safe_areas = {}
+    if not isinstance(safe_areas, dict):
+        raise BrandThemeError("Brand theme safe_areas config must be a mapping")
+
     scale = float(watermark.get("scale", 1.0))
     opacity = float(watermark.get("opacity", 1.0))
     if not 0.05 <= scale <= 1.0:
@@ -129,4 +175,6 @@ def load_brand_theme(path: Path) -> BrandTheme:
         watermark_position_expr=_resolve_overlay(watermark.get("position", "top_right")),
         watermark_scale=scale,
         watermark_opacity=opacity,
+        watermark_anchor=watermark.get("position", "top_right"),
+        safe_areas=safe_areas,
     )
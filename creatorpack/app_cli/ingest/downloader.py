@@ -1,15 +1,19 @@
 """Asset downloading utilities."""
 from __future__ import annotations
 
-import shutil
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from .http import HttpDownloader, HttpDownloadError
 from .license_gate import LicenseGate, LicenseInfo
+from .metadata import LicenseResolver
 from .sources import IngestInput
 from ..util.errors import CreatorPackError, ExitCodes
+from ..util.io import clone_file, copy_with_progress, reflink_file
+from ..util.logging import job_logger
 
 
 class DownloadError(CreatorPackError):
@@ -18,20 +22,60 @@ class DownloadError(CreatorPackError):
     exit_code = ExitCodes.DOWNLOAD_FAILED
 
 
+INGEST_STRATEGIES = ("auto", "reflink", "hardlink", "symlink", "reference", "copy")
+# Log copy progress at most this often (fraction of the file).
+_PROGRESS_STEP = 0.05
+
+
 @dataclass
 class DownloadResult:
-    """Captures download outcome."""
+    """Captures download outcome.
+
+    ``ingest_method`` records how a local file reached the job: ``reflink``,
+    ``hardlink`` and ``symlink`` cost no data copy, ``reference`` uses the
+    original path in place, ``copy`` is a full physical copy and ``download``
+    marks a remote asset linked in from the download cache. For anything
+    but a copy the source's size and mtime are kept in ``fingerprint`` so a
+    file changed mid-job is caught by :meth:`ensure_unchanged`.
+    """
 
     path: Path
     source: str
     original_name: str
     retrieved_at: datetime
     license_info: LicenseInfo
+    ingest_method: str = "copy"
+    fingerprint: Optional[Dict[str, Any]] = None
+
+    def ensure_unchanged(self) -> None:
+        if self.fingerprint is not None and _local_fingerprint(self.path) != self.fingerprint:
+            raise DownloadError(f"Source changed while the job was running: {self.path}")
+
+
+def download_inputs(
+    inputs: List[IngestInput],
+    download_dir: Path,
+    license_gate: LicenseGate,
+    *,
+    strategy: str = "auto",
+    downloader: Optional[HttpDownloader] = None,
+    resolver: Optional[LicenseResolver] = None,
+) -> List[DownloadResult]:
+    """Bring every input into ``download_dir``; local files use ``strategy`` (see ``INGEST_STRATEGIES``).
 
+    ``auto`` tries a reflink, then a hardlink, and copies only when both fail.
+    The explicit strategies fall back to a copy when the filesystem refuses them.
+    Remote inputs are fetched by ``downloader`` (a throwaway one caching under
+    ``download_dir`` when not given) and linked in from its cache. Their
+    licenses are looked up by ``resolver`` and checked by the gate before any
+    of them is downloaded.
+    """
 
-def download_inputs(inputs: List[IngestInput], download_dir: Path, license_gate: LicenseGate) -> List[DownloadResult]:
+    if strategy not in INGEST_STRATEGIES:
+        raise DownloadError(f"Unknown ingest strategy '{strategy}'")
     download_dir.mkdir(parents=True, exist_ok=True)
     results: List[DownloadResult] = []
+    licenses = _remote_licenses([ingest for ingest in inputs if ingest.kind != "local"], license_gate, resolver)
 
     for ingest in inputs:
         if ingest.kind == "local":
@@ -40,9 +84,9 @@ def download_inputs(inputs: List[IngestInput], download_dir: Path, license_gate:
                 raise DownloadError(f"File not found: {src_path}")
             dest = download_dir / src_path.name
             if src_path.resolve() != dest.resolve():
-                shutil.copy2(src_path, dest)
+                dest, method = _ingest_local(src_path, dest, strategy)
             else:
-                dest = src_path
+                dest, method = src_path, "reference"
             license_info = license_gate.build_info(
                 source="local",
                 title=src_path.stem,
@@ -57,14 +101,103 @@ def download_inputs(inputs: List[IngestInput], download_dir: Path, license_gate:
                     original_name=src_path.name,
                     retrieved_at=datetime.utcnow(),
                     license_info=license_info,
+                    ingest_method=method,
+                    fingerprint=None if method == "copy" else _local_fingerprint(dest),
                 )
             )
         else:
-            raise DownloadError(
-                f"Source '{ingest.kind}' is not implemented in this offline build."
-            )
+            results.append(_download_remote(ingest, download_dir, licenses[ingest.value], downloader))
 
     if not results:
         raise DownloadError("No assets downloaded")
 
     return results
+
+
+def _remote_licenses(
+    inputs: List[IngestInput], license_gate: LicenseGate, resolver: Optional[LicenseResolver]
+) -> Dict[str, LicenseInfo]:
+    if not inputs:
+        return {}
+    owned = resolver is None
+    resolver = resolver or LicenseResolver(None)
+    try:
+        infos = resolver.resolve_many(inputs)
+    finally:
+        if owned:
+            resolver.close()
+    for info in infos:
+        license_gate.ensure_allowed(info)
+    return {ingest.value: info for ingest, info in zip(inputs, infos)}
+
+
+def _download_remote(
+    ingest: IngestInput, download_dir: Path, license_info: LicenseInfo, downloader: Optional[HttpDownloader]
+) -> DownloadResult:
+    owned = downloader is None
+    downloader = downloader or HttpDownloader(download_dir / ".downloads")
+    try:
+        fetched = downloader.fetch(ingest.value)
+    except HttpDownloadError as exc:
+        raise DownloadError(str(exc)) from exc
+    finally:
+        if owned:
+            downloader.close()
+    dest = download_dir / fetched.filename
+    dest.unlink(missing_ok=True)
+    method = clone_file(fetched.path, dest)
+    job_logger().info("input_ingested", extra={"file": fetched.filename, "method": method, "path": str(dest)})
+    return DownloadResult(
+        path=dest,
+        source=ingest.kind,
+        original_name=fetched.filename,
+        retrieved_at=datetime.utcnow(),
+        license_info=license_info,
+        ingest_method="download",
+    )
+
+
+def _ingest_local(source: Path, dest: Path, strategy: str) -> Tuple[Path, str]:
+    if strategy == "reference":
+        method, dest = "reference", source.resolve()
+    else:
+        dest.unlink(missing_ok=True)
+        method = "copy"
+        if strategy in ("auto", "reflink") and reflink_file(source, dest):
+            method = "reflink"
+        elif strategy in ("auto", "hardlink") and _try(os.link, source, dest):
+            method = "hardlink"
+        elif strategy == "symlink" and _try(os.symlink, source.resolve(), dest):
+            method = "symlink"
+        else:
+            copy_with_progress(source, dest, _progress_logger(source))
+    job_logger().info("input_ingested", extra={"file": source.name, "method": method, "path": str(dest)})
+    return dest, method
+
+
+def _try(link: Callable[[Path, Path], None], source: Path, dest: Path) -> bool:
+    try:
+        link(source, dest)
+    except OSError:
+        return False
+    return True
+
+
+def _progress_logger(source: Path) -> Callable[[int, int], None]:
+    reported = [-1.0]
+
+    def _report(copied: int, total: int) -> None:
+        fraction = copied / total if total else 1.0
+        if fraction - reported[0] >= _PROGRESS_STEP or copied == total:
+            reported[0] = fraction
+            job_logger().info(
+                "ingest_progress",
+                extra={"file": source.name, "copied_bytes": copied, "total_bytes": total, "percent": round(fraction * 100, 1)},
+            )
+
+    return _report
+
+
+def _local_fingerprint(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
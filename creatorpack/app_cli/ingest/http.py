@@ -0,0 +1,473 @@
+"""Resumable, segmented HTTP downloads with a conditional-request cache."""
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from urllib.parse import unquote, urljoin, urlparse
+
+from ..util.errors import CreatorPackError, ExitCodes
+from ..util.io import write_text_atomic
+from ..util.logging import job_logger
+from .sources import ALLOWED_DOMAINS
+
+try:  # pragma: no cover - POSIX only
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: in-process locking only
+    fcntl = None  # type: ignore[assignment]
+
+
+T = TypeVar("T")
+
+USER_AGENT = "creatorpack/0.1"
+_CHUNK_SIZE = 256 * 1024
+# Progress of segmented downloads is checkpointed to the sidecar at least this often per segment.
+_CHECKPOINT_BYTES = 4 * 1024 * 1024
+_RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+# One fetch per cache entry at a time within this process; an flock on the entry covers other processes.
+_ENTRY_LOCKS: Dict[str, threading.Lock] = {}
+_ENTRY_LOCKS_GUARD = threading.Lock()
+
+
+class HttpDownloadError(CreatorPackError):
+    """Raised when a remote asset cannot be fetched."""
+
+    exit_code = ExitCodes.DOWNLOAD_FAILED
+
+
+class _RetryableError(Exception):
+    pass
+
+
+class _SourceChanged(Exception):
+    pass
+
+
+@dataclass
+class FetchResult:
+    """A downloaded body in the cache; ``reused`` when a conditional request returned 304."""
+
+    url: str
+    path: Path
+    filename: str
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    reused: bool = False
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: Optional[int]  # inclusive; None while the length is unknown
+    written: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.end is not None and self.start + self.written > self.end
+
+
+@dataclass
+class _PartState:
+    url: str
+    size: Optional[int]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    segments: List[_Segment] = field(default_factory=list)
+    # Where the requests go once HEAD followed redirects; not persisted, since redirect targets expire.
+    location: Optional[str] = None
+
+
+class ConnectionPool:
+    """Keeps idle HTTP(S) connections per host so segment and metadata requests reuse them."""
+
+    def __init__(self, *, max_idle_per_host: int = 8, timeout: float = 30.0) -> None:
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, int], "queue.LifoQueue[http.client.HTTPConnection]"] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self, method: str, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request; hand the connection back with :meth:`release` once the body is read."""
+
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.hostname or "", parsed.port or (443 if parsed.scheme == "https" else 80))
+        path = parsed.path or "/"
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+        all_headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        for attempt in range(2):
+            conn = self._checkout(key)
+            try:
+                conn.request(method, path, headers=all_headers)
+                response = conn.getresponse()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if attempt:
+                    raise
+                continue  # a pooled connection the server already closed; retry on a fresh one
+            response.pool_key = key  # type: ignore[attr-defined]
+            return conn, response
+        raise AssertionError("unreachable")
+
+    def release(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        if response.will_close or not response.isclosed():
+            conn.close()
+            return
+        with self._lock:
+            idle = self._idle.setdefault(response.pool_key, queue.LifoQueue())  # type: ignore[attr-defined]
+        if idle.qsize() >= self.max_idle_per_host:
+            conn.close()
+        else:
+            idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._idle = list(self._idle.values()), {}
+        for idle in pools:
+            while not idle.empty():
+                idle.get().close()
+
+    def _checkout(self, key: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(key)
+        if idle is not None:
+            try:
+                return idle.get_nowait()
+            except queue.Empty:
+                pass
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+
+class HttpDownloader:
+    """Fetches remote assets into a download cache (``<cache>/<url digest>/``).
+
+    Files of at least ``segment_threshold`` bytes from servers that accept
+    ranges are split into ``segments`` parallel ranged requests writing into one
+    ``body.part``; smaller files stream in a single request. Progress is kept in
+    ``body.part.json`` so an interrupted download resumes (guarded by
+    ``If-Range``, so a changed file starts over). A cached body is revalidated
+    with ``If-None-Match``/``If-Modified-Since`` and reused on ``304``.
+    Up to :data:`MAX_REDIRECTS` redirects are followed, each only to the
+    original host, an allowlisted source domain (or a subdomain of one, such
+    as archive.org's storage nodes) or one of ``allowed_hosts``. Fetches of
+    the same URL are serialized, across processes too, so they never share
+    a half-written ``body.part``. Failed requests are retried ``retries``
+    times with exponential backoff, each retry continuing from the bytes
+    already written. Progress is logged as ``download_progress`` every 5%
+    and passed to ``progress`` if given.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        segments: int = 4,
+        segment_threshold: int = 16 * 1024 * 1024,
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool: Optional[ConnectionPool] = None,
+        progress: Optional[Callable[[str, int, Optional[int]], None]] = None,
+        allowed_hosts: Iterable[str] = (),
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.allowed_hosts = {host.lower() for host in allowed_hosts}
+        self.segments = max(segments, 1)
+        self.segment_threshold = segment_threshold
+        self.retries = retries
+        self.backoff = backoff
+        self.pool = pool or ConnectionPool()
+        self.progress = progress
+        self._progress_lock = threading.Lock()
+        self._progress_steps: Dict[str, int] = {}
+
+    def fetch(self, url: str) -> FetchResult:
+        entry = self.cache_dir / hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+        entry.mkdir(parents=True, exist_ok=True)
+        with _entry_lock(entry):
+            return self._fetch(url, entry)
+
+    def _fetch(self, url: str, entry: Path) -> FetchResult:
+        body, meta_path = entry / "body", entry / "meta.json"
+        cached = _read_json(meta_path) if body.exists() else None
+
+        status, headers, location = self._head(url, cached)
+        if cached is not None and status == 304:
+            job_logger().info("download_reused", extra={"url": url})
+            return FetchResult(**{**cached, "path": body, "reused": True})
+        if status >= 400 and status != 405:
+            raise HttpDownloadError(f"HEAD {url} returned HTTP {status}")
+
+        part = entry / "body.part"
+        for attempt in range(2):
+            size = _int(headers.get("content-length")) if status < 300 else None
+            state = _PartState(
+                url=url,
+                size=size,
+                etag=headers.get("etag"),
+                last_modified=headers.get("last-modified"),
+                location=location,
+            )
+            state = self._resume_or_plan(part, state, ranges=headers.get("accept-ranges") == "bytes")
+            try:
+                self._download(part, state)
+                break
+            except _SourceChanged:
+                # The remote file was replaced mid-download: drop the partial data and start over once.
+                part.unlink(missing_ok=True)
+                _sidecar(part).unlink(missing_ok=True)
+                if attempt:
+                    raise HttpDownloadError(f"{url} keeps changing during download") from None
+                job_logger().warning("download_restarted", extra={"url": url})
+                status, headers, location = self._head(url, None)
+
+        if state.size is not None and part.stat().st_size != state.size:
+            raise HttpDownloadError(f"Download of {url} is incomplete ({part.stat().st_size} of {state.size} bytes)")
+        os.replace(part, body)
+        _sidecar(part).unlink(missing_ok=True)
+        result = FetchResult(
+            url=url,
+            path=body,
+            filename=_filename(url, headers),
+            size=body.stat().st_size,
+            etag=state.etag,
+            last_modified=state.last_modified,
+            content_type=headers.get("content-type"),
+        )
+        write_text_atomic(meta_path, json.dumps({k: v for k, v in asdict(result).items() if k not in ("path", "reused")}))
+        job_logger().info("download_completed", extra={"url": url, "bytes": result.size})
+        return result
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _head(self, url: str, cached: Optional[dict]) -> Tuple[int, Dict[str, str], str]:
+        conditional: Dict[str, str] = {}
+        if cached is not None:
+            if cached.get("etag"):
+                conditional["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                conditional["If-Modified-Since"] = cached["last_modified"]
+
+        def _send() -> Tuple[int, Dict[str, str], str]:
+            conn, response, location = self._request("HEAD", url, conditional)
+            response.read()
+            self.pool.release(conn, response)
+            if response.status in _RETRY_STATUSES:
+                raise _RetryableError(f"HTTP {response.status}")
+            return response.status, {key.lower(): value for key, value in response.getheaders()}, location
+
+        return self._with_retries(url, _send)
+
+    def _request(
+        self, method: str, url: str, headers: Dict[str, str]
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse, str]:
+        """Send through the pool, following allowed redirects; returns the URL that answered."""
+
+        origin = (urlparse(url).hostname or "").lower()
+        location = url
+        for _ in range(MAX_REDIRECTS + 1):
+            conn, response = self.pool.request(method, location, headers)
+            target = response.getheader("Location")
+            if response.status not in _REDIRECT_STATUSES or not target:
+                return conn, response, location
+            response.read()
+            self.pool.release(conn, response)
+            location = urljoin(location, target)
+            host = (urlparse(location).hostname or "").lower()
+            if not self._redirect_allowed(host, origin):
+                raise HttpDownloadError(f"{url} redirects to {host!r}, which is not an allowlisted source")
+            job_logger().info("download_redirected", extra={"url": url, "location": location})
+        raise HttpDownloadError(f"{url} redirected more than {MAX_REDIRECTS} times")
+
+    def _redirect_allowed(self, host: str, origin: str) -> bool:
+        if host == origin or host in self.allowed_hosts:
+            return True
+        return any(host == domain or host.endswith("." + domain) for domain in ALLOWED_DOMAINS)
+
+    def _resume_or_plan(self, part: Path, state: _PartState, *, ranges: bool) -> _PartState:
+        previous = _read_json(_sidecar(part)) if part.exists() else None
+        if (
+            previous is not None
+            and previous.get("size") == state.size
+            and previous.get("etag") == state.etag
+            and previous.get("last_modified") == state.last_modified
+            and (state.etag or state.last_modified)
+        ):
+            state.segments = [_Segment(*segment) for segment in previous.get("segments", [])]
+            resumed = sum(segment.written for segment in state.segments)
+            job_logger().info("download_resumed", extra={"url": state.url, "bytes": resumed})
+            return state
+
+        part.unlink(missing_ok=True)
+        with part.open("wb") as handle:
+            if state.size:
+                handle.truncate(state.size)
+        if state.size and ranges:
+            count = self.segments if state.size >= self.segment_threshold else 1
+            step = -(-state.size // count)
+            state.segments = [
+                _Segment(start, min(start + step, state.size) - 1) for start in range(0, state.size, step)
+            ]
+        else:
+            # Unknown length or no range support: one stream, restarted from zero on failure.
+            state.segments = [_Segment(0, None)]
+        self._checkpoint(part, state)
+        return state
+
+    def _download(self, part: Path, state: _PartState) -> None:
+        pending = [segment for segment in state.segments if not segment.done]
+        lock = threading.Lock()
+        if len(pending) == 1:
+            self._with_retries(state.url, lambda: self._fetch_segment(part, state, pending[0], lock))
+            return
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="creatorpack-download") as pool:
+            futures = [
+                pool.submit(self._with_retries, state.url, lambda segment=segment: self._fetch_segment(part, state, segment, lock))
+                for segment in pending
+            ]
+            for future in futures:
+                future.result()
+
+    def _fetch_segment(self, part: Path, state: _PartState, segment: _Segment, lock: threading.Lock) -> None:
+        unbounded = segment.end is None
+        headers: Dict[str, str] = {}
+        if not unbounded:
+            headers["Range"] = f"bytes={segment.start + segment.written}-{segment.end}"
+            if state.etag or state.last_modified:
+                headers["If-Range"] = state.etag or state.last_modified or ""
+        elif segment.written:
+            segment.written = 0
+            with part.open("r+b") as handle:
+                handle.truncate(0)
+        conn, response, location = self._request("GET", state.location or state.url, headers)
+        state.location = location
+        try:
+            if response.status in _RETRY_STATUSES:
+                raise _RetryableError(f"HTTP {response.status}")
+            if response.status == 200 and not unbounded and (segment.start + segment.written or len(state.segments) > 1):
+                # If-Range did not match: the file changed under us, so every byte so far is stale.
+                raise _SourceChanged()
+            if response.status not in (200, 206):
+                raise HttpDownloadError(f"GET {state.url} returned HTTP {response.status}")
+            with part.open("r+b" if part.exists() else "wb") as handle:
+                handle.seek(segment.start + segment.written)
+                unsaved = 0
+                while True:
+                    block = response.read(_CHUNK_SIZE)
+                    if not block:
+                        break
+                    handle.write(block)
+                    segment.written += len(block)
+                    unsaved += len(block)
+                    self._report(state, len(block))
+                    if unsaved >= _CHECKPOINT_BYTES:
+                        handle.flush()
+                        with lock:
+                            self._checkpoint(part, state)
+                        unsaved = 0
+                handle.flush()
+            with lock:
+                self._checkpoint(part, state)
+            if not unbounded and not segment.done:
+                raise _RetryableError(f"connection closed after {segment.written} bytes")
+        except (OSError, http.client.HTTPException) as exc:
+            with lock:
+                self._checkpoint(part, state)
+            raise _RetryableError(str(exc)) from exc
+        finally:
+            self.pool.release(conn, response)
+
+    def _with_retries(self, url: str, call: Callable[[], T]) -> T:
+        for attempt in range(self.retries + 1):
+            try:
+                return call()
+            except (_RetryableError, OSError, http.client.HTTPException) as exc:
+                if attempt == self.retries:
+                    raise HttpDownloadError(f"Download of {url} failed: {exc}") from exc
+                job_logger().warning("download_retry", extra={"url": url, "attempt": attempt + 1, "error": str(exc)})
+                time.sleep(self.backoff * (2**attempt))
+        raise AssertionError("unreachable")
+
+    def _report(self, state: _PartState, delta: int) -> None:
+        if self.progress is not None:
+            self.progress(state.url, delta, state.size)
+        with self._progress_lock:
+            done = sum(segment.written for segment in state.segments)
+            step = int(done * 20 / state.size) if state.size else 0
+            if step > self._progress_steps.get(state.url, -1):
+                self._progress_steps[state.url] = step
+                job_logger().info(
+                    "download_progress", extra={"url": state.url, "bytes": done, "total_bytes": state.size}
+                )
+
+    def _checkpoint(self, part: Path, state: _PartState) -> None:
+        data = {
+            "url": state.url,
+            "size": state.size,
+            "etag": state.etag,
+            "last_modified": state.last_modified,
+            "segments": [[segment.start, segment.end, segment.written] for segment in state.segments],
+        }
+        write_text_atomic(_sidecar(part), json.dumps(data))
+
+
+@contextmanager
+def _entry_lock(entry: Path) -> Iterator[None]:
+    with _ENTRY_LOCKS_GUARD:
+        lock = _ENTRY_LOCKS.setdefault(str(entry), threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        with (entry / ".lock").open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _sidecar(part: Path) -> Path:
+    return part.with_name(part.name + ".json")
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _filename(url: str, headers: Dict[str, str]) -> str:
+    disposition = headers.get("content-disposition", "")
+    for part in disposition.split(";"):
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "filename" and value:
+            return Path(value.strip('"')).name
+    return Path(unquote(urlparse(url).path)).name or "download"
@@ -39,6 +39,32 @@ class LicenseInfo:
             "requires_attribution": self.requires_attribution,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "LicenseInfo":
+        return cls(
+            source=data["source"],
+            title=data["title"],
+            creator=data.get("creator"),
+            license_code=data["license_code"],
+            license_url=data.get("license_url"),
+            requires_attribution=bool(data.get("requires_attribution")),
+        )
+
+
+def license_info(
+    *, source: str, title: str, creator: Optional[str], license_code: str, license_url: Optional[str]
+) -> LicenseInfo:
+    """Describe an asset's license without checking it against any policy."""
+
+    return LicenseInfo(
+        source=source,
+        title=title,
+        creator=creator,
+        license_code=license_code,
+        license_url=license_url,
+        requires_attribution=ALLOWED_LICENSES.get(license_code.lower().strip(), False),
+    )
+
 
 class LicenseViolationError(CreatorPackError):
     """Raised when a license is not allowed."""
@@ -77,15 +103,8 @@ class LicenseGate:
         license_code: str,
         license_url: Optional[str],
     ) -> LicenseInfo:
-        normalized_code = license_code.lower().strip()
-        requires_attr = ALLOWED_LICENSES.get(normalized_code, False)
-        info = LicenseInfo(
-            source=source,
-            title=title,
-            creator=creator,
-            license_code=license_code,
-            license_url=license_url,
-            requires_attribution=requires_attr,
+        info = license_info(
+            source=source, title=title, creator=creator, license_code=license_code, license_url=license_url
         )
         self.ensure_allowed(info)
         return info
@@ -0,0 +1,375 @@
+"""Per-asset license and creator lookups for remote sources, cached on disk."""
+from __future__ import annotations
+
+import abc
+import hashlib
+import html
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote, unquote, urlencode, urlparse
+
+from .http import _RETRY_STATUSES, ConnectionPool
+from .license_gate import LicenseInfo, license_info
+from .sources import IngestInput
+from ..util.errors import CreatorPackError, ExitCodes
+from ..util.io import write_text_atomic
+from ..util.logging import job_logger
+
+
+METADATA_CACHE_VERSION = 1
+DEFAULT_TTL = 7 * 24 * 3600.0
+DEFAULT_CONCURRENCY = 8
+
+_CC_URL = re.compile(r"creativecommons\.org/(licenses|publicdomain)/([a-z-]+)(?:/(\d+\.\d+))?", re.IGNORECASE)
+_RIGHTS_URL = re.compile(r"rightsstatements\.org/vocab/([A-Za-z-]+)/", re.IGNORECASE)
+_TAGS = re.compile(r"<[^>]+>")
+
+
+class LicenseLookupError(CreatorPackError):
+    """Raised when an asset's license cannot be determined."""
+
+    exit_code = ExitCodes.LICENSE_BLOCKED
+
+
+def license_code_from_url(url: Optional[str]) -> str:
+    """Map a Creative Commons or rightsstatements.org URL to a gate code (``cc-by-4.0``, ``cc0``, ``pd``)."""
+
+    if not url:
+        return "unknown"
+    match = _CC_URL.search(url)
+    if match:
+        kind, name, version = match.group(1).lower(), match.group(2).lower(), match.group(3)
+        if kind == "publicdomain":
+            return "cc0" if name == "zero" else "pd"
+        return f"cc-{name}-{version}" if version else f"cc-{name}"
+    match = _RIGHTS_URL.search(url)
+    if match:
+        return match.group(1).lower()
+    return "unknown"
+
+
+class SourceAdapter(abc.ABC):
+    """Knows where one source publishes asset metadata and how to read it.
+
+    ``metadata_url`` returns the API URL to fetch for an asset (``None`` when
+    the license follows from the source alone) and ``parse`` turns the JSON
+    answer into a :class:`LicenseInfo`. ``api_base`` is overridable so tests
+    can point adapters at a local server.
+    """
+
+    source = ""
+    default_api = ""
+
+    def __init__(self, api_base: Optional[str] = None) -> None:
+        self.api_base = (api_base or self.default_api).rstrip("/")
+
+    def metadata_url(self, url: str) -> Optional[str]:
+        return None
+
+    @abc.abstractmethod
+    def parse(self, url: str, data: Optional[dict]) -> LicenseInfo:
+        """License, title and creator of ``url`` from the metadata answer (``None`` when none was fetched)."""
+
+
+class NasaAdapter(SourceAdapter):
+    """NASA media is public domain; the images API supplies title and credit."""
+
+    source = "nasa"
+    default_api = "https://images-api.nasa.gov"
+    license_url = "https://www.nasa.gov/nasa-brand-center/images-and-media/"
+
+    def metadata_url(self, url: str) -> Optional[str]:
+        nasa_id = _nasa_id(url)
+        return f"{self.api_base}/search?{urlencode({'nasa_id': nasa_id})}" if nasa_id else None
+
+    def parse(self, url: str, data: Optional[dict]) -> LicenseInfo:
+        items = ((data or {}).get("collection") or {}).get("items") or [{}]
+        record = (items[0].get("data") or [{}])[0]
+        creator = record.get("photographer") or record.get("secondary_creator") or record.get("center")
+        return license_info(
+            source=self.source,
+            title=record.get("title") or _url_stem(url),
+            creator=creator,
+            license_code="pd",
+            license_url=self.license_url,
+        )
+
+
+class CommonsAdapter(SourceAdapter):
+    """Wikimedia Commons: ``extmetadata`` of the file page via the MediaWiki API."""
+
+    source = "commons"
+    default_api = "https://commons.wikimedia.org"
+
+    def metadata_url(self, url: str) -> Optional[str]:
+        path = unquote(urlparse(url).path)
+        name = path.split("File:", 1)[1] if "File:" in path else Path(path).name
+        query = {"action": "query", "format": "json", "prop": "imageinfo", "iiprop": "extmetadata", "titles": f"File:{name}"}
+        return f"{self.api_base}/w/api.php?{urlencode(query)}"
+
+    def parse(self, url: str, data: Optional[dict]) -> LicenseInfo:
+        pages = ((data or {}).get("query") or {}).get("pages") or {}
+        page = next(iter(pages.values()), {})
+        if "missing" in page or not page.get("imageinfo"):
+            raise LicenseLookupError(f"Commons has no file page for {url}")
+        meta = page["imageinfo"][0].get("extmetadata") or {}
+
+        def _value(key: str) -> Optional[str]:
+            raw = (meta.get(key) or {}).get("value")
+            if not raw:
+                return None
+            return html.unescape(_TAGS.sub("", str(raw))).strip() or None
+
+        license_url = _value("LicenseUrl")
+        code = _value("License") or license_code_from_url(license_url)
+        return license_info(
+            source=self.source,
+            title=_value("ObjectName") or _url_stem(url),
+            creator=_value("Artist"),
+            license_code=code,
+            license_url=license_url,
+        )
+
+
+class ArchiveAdapter(SourceAdapter):
+    """Internet Archive: the item's ``licenseurl`` from the metadata API."""
+
+    source = "archive"
+    default_api = "https://archive.org"
+
+    def metadata_url(self, url: str) -> Optional[str]:
+        parts = [part for part in urlparse(url).path.split("/") if part]
+        if len(parts) < 2 or parts[0] not in ("details", "download", "embed"):
+            raise LicenseLookupError(f"Cannot find an archive.org item in {url}")
+        return f"{self.api_base}/metadata/{quote(parts[1])}"
+
+    def parse(self, url: str, data: Optional[dict]) -> LicenseInfo:
+        meta = (data or {}).get("metadata")
+        if not meta:
+            raise LicenseLookupError(f"archive.org has no metadata for {url}")
+        creator = meta.get("creator")
+        if isinstance(creator, list):
+            creator = ", ".join(creator)
+        return license_info(
+            source=self.source,
+            title=meta.get("title") or _url_stem(url),
+            creator=creator,
+            license_code=license_code_from_url(meta.get("licenseurl")),
+            license_url=meta.get("licenseurl"),
+        )
+
+
+class EuropeanaAdapter(SourceAdapter):
+    """Europeana: ``edmRights`` of the record API (key from ``EUROPEANA_API_KEY``)."""
+
+    source = "europeana"
+    default_api = "https://api.europeana.eu"
+
+    def metadata_url(self, url: str) -> Optional[str]:
+        path = urlparse(url).path
+        if "/item/" not in path:
+            raise LicenseLookupError(f"Cannot find a Europeana record in {url}")
+        record = path.split("/item/", 1)[1].strip("/")
+        key = os.environ.get("EUROPEANA_API_KEY", "api2demo")
+        return f"{self.api_base}/record/v2/{record}.json?{urlencode({'wskey': key})}"
+
+    def parse(self, url: str, data: Optional[dict]) -> LicenseInfo:
+        record = (data or {}).get("object")
+        if not record:
+            raise LicenseLookupError(f"Europeana has no record for {url}")
+        aggregation = (record.get("aggregations") or [{}])[0]
+        rights = ((aggregation.get("edmRights") or {}).get("def") or [None])[0]
+        creator = None
+        for proxy in record.get("proxies") or []:
+            values = next(iter((proxy.get("dcCreator") or {}).values()), None)
+            if values:
+                creator = values[0]
+                break
+        return license_info(
+            source=self.source,
+            title=(record.get("title") or [_url_stem(url)])[0],
+            creator=creator,
+            license_code=license_code_from_url(rights),
+            license_url=rights,
+        )
+
+
+class PexelsAdapter(SourceAdapter):
+    """Pexels media is under the Pexels License, which is not an open license the gate accepts."""
+
+    source = "pexels"
+
+    def parse(self, url: str, data: Optional[dict]) -> LicenseInfo:
+        return license_info(
+            source=self.source,
+            title=_url_stem(url),
+            creator=None,
+            license_code="pexels-license",
+            license_url="https://www.pexels.com/license/",
+        )
+
+
+DEFAULT_ADAPTERS = (NasaAdapter, CommonsAdapter, ArchiveAdapter, EuropeanaAdapter, PexelsAdapter)
+
+
+class LicenseResolver:
+    """Resolves :class:`LicenseInfo` for remote inputs through per-source adapters.
+
+    Metadata requests share a :class:`ConnectionPool` and run at most
+    ``concurrency`` at a time. Results are kept in memory and under
+    ``cache_dir`` (one JSON file per URL) for ``ttl`` seconds, so batches and
+    repeat runs look each asset up once. Lookup failures are not cached.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path],
+        *,
+        ttl: float = DEFAULT_TTL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = 2,
+        backoff: float = 0.5,
+        pool: Optional[ConnectionPool] = None,
+        adapters: Optional[Iterable[SourceAdapter]] = None,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.concurrency = max(concurrency, 1)
+        self.retries = retries
+        self.backoff = backoff
+        self.pool = pool or ConnectionPool()
+        self._owns_pool = pool is None
+        self.adapters: Dict[str, SourceAdapter] = {
+            adapter.source: adapter for adapter in (adapters or [factory() for factory in DEFAULT_ADAPTERS])
+        }
+        self._memory: Dict[str, LicenseInfo] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, ingest: IngestInput) -> LicenseInfo:
+        key = hashlib.sha256(f"{ingest.kind}\n{ingest.value}".encode("utf-8")).hexdigest()
+        with self._lock:
+            info = self._memory.get(key)
+        if info is None:
+            info = self._load(key)
+            cached = info is not None
+            if info is None:
+                info = self._lookup(ingest)
+                self._store(key, ingest.value, info)
+            with self._lock:
+                self._memory[key] = info
+            job_logger().info(
+                "license_resolved",
+                extra={"url": ingest.value, "license": info.license_code, "cached": cached},
+            )
+        return info
+
+    def resolve_many(self, inputs: Iterable[IngestInput]) -> List[LicenseInfo]:
+        """Resolve remote ``inputs`` concurrently, in order; the first failure is raised."""
+
+        inputs = list(inputs)
+        unique = list({(ingest.kind, ingest.value): ingest for ingest in inputs}.values())
+        if len(unique) <= 1:
+            resolved = [self.resolve(ingest) for ingest in unique]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(unique))) as executor:
+                resolved = list(executor.map(self.resolve, unique))
+        by_input = {(ingest.kind, ingest.value): info for ingest, info in zip(unique, resolved)}
+        return [by_input[(ingest.kind, ingest.value)] for ingest in inputs]
+
+    def prefetch(self, inputs: Iterable[IngestInput]) -> int:
+        """Warm the cache for ``inputs``; failures are logged and left for the job itself to report."""
+
+        def _try(ingest: IngestInput) -> bool:
+            try:
+                self.resolve(ingest)
+            except CreatorPackError as exc:
+                job_logger().warning("license_prefetch_failed", extra={"url": ingest.value, "error": str(exc)})
+                return False
+            return True
+
+        remote = [ingest for ingest in inputs if ingest.kind != "local"]
+        if not remote:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(remote))) as executor:
+            return sum(executor.map(_try, remote))
+
+    def close(self) -> None:
+        if self._owns_pool:
+            self.pool.close()
+
+    def _lookup(self, ingest: IngestInput) -> LicenseInfo:
+        adapter = self.adapters.get(ingest.kind)
+        if adapter is None:
+            raise LicenseLookupError(f"No license metadata adapter for source '{ingest.kind}'")
+        api_url = adapter.metadata_url(ingest.value)
+        return adapter.parse(ingest.value, self._get_json(api_url) if api_url else None)
+
+    def _get_json(self, url: str) -> dict:
+        for attempt in range(self.retries + 1):
+            try:
+                conn, response = self.pool.request("GET", url, {"Accept": "application/json"})
+                try:
+                    body = response.read()
+                finally:
+                    self.pool.release(conn, response)
+                if response.status in _RETRY_STATUSES:
+                    raise http.client.HTTPException(f"HTTP {response.status}")
+            except (OSError, http.client.HTTPException) as exc:
+                if attempt == self.retries:
+                    raise LicenseLookupError(f"License lookup {url} failed: {exc}") from exc
+                time.sleep(self.backoff * (2**attempt))
+                continue
+            if response.status >= 400:
+                raise LicenseLookupError(f"License lookup {url} returned HTTP {response.status}")
+            try:
+                data = json.loads(body)
+            except ValueError as exc:
+                raise LicenseLookupError(f"License lookup {url} returned invalid JSON") from exc
+            if not isinstance(data, dict):
+                raise LicenseLookupError(f"License lookup {url} returned unexpected JSON")
+            return data
+        raise AssertionError("unreachable")
+
+    def _entry(self, key: str) -> Optional[Path]:
+        return self.cache_dir / key[:2] / f"{key}.json" if self.cache_dir else None
+
+    def _load(self, key: str) -> Optional[LicenseInfo]:
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+            if data["version"] != METADATA_CACHE_VERSION or time.time() - data["resolved_at"] > self.ttl:
+                return None
+            return LicenseInfo.from_dict(data["info"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store(self, key: str, url: str, info: LicenseInfo) -> None:
+        entry = self._entry(key)
+        if entry is not None:
+            data = {"version": METADATA_CACHE_VERSION, "url": url, "resolved_at": time.time(), "info": info.to_dict()}
+            write_text_atomic(entry, json.dumps(data))
+
+
+def _nasa_id(url: str) -> Optional[str]:
+    parts = [part for part in unquote(urlparse(url).path).split("/") if part]
+    for index, part in enumerate(parts):
+        if part == "details" and index + 1 < len(parts):
+            return parts[index + 1]
+        if part.startswith("details-"):
+            return part[len("details-") :]
+    if len(parts) >= 2 and parts[-1].startswith(parts[-2]):
+        return parts[-2]  # images-assets.nasa.gov/video/<id>/<id>~orig.mp4
+    return None
+
+
+def _url_stem(url: str) -> str:
+    return Path(unquote(urlparse(url).path)).stem or urlparse(url).netloc
@@ -1,39 +1,76 @@
 """Command line entrypoint for CreatorPack."""
 from __future__ import annotations
 
+import json
 import logging
-from dataclasses import asdict, dataclass
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 import click
 
 from .ingest.sources import IngestInput, detect_input_sources
 from .ingest.license_gate import LicenseGate
-from .ingest.downloader import download_inputs
-from .media.chunking import ChapterPolicy, build_chapter_plan, chapters_to_segments
+from .ingest.downloader import INGEST_STRATEGIES, DownloadResult, download_inputs
+from .ingest.http import ConnectionPool, HttpDownloader
+from .ingest.metadata import LicenseResolver
+from .media.acoustic import AcousticIndex, acoustic_fingerprint, numpy_available, shift_transcript
+from .media.chunking import Chapter, ChapterPlan, ChapterPolicy, build_chapter_plan, chapters_to_segments
 from .media.ffmpeg_ops import (
+    AudioOutput,
     ChunkOutput,
+    FFmpegError,
+    LoudnessTarget,
+    MediaProbe,
     MediaSegment,
+    Rendition,
+    ShortsProfile,
     chunk_media,
+    parse_rendition_ladder,
     plan_chunk_outputs,
+    probe_from_dict,
     probe_media,
+    select_renditions,
 )
-from .nlp.highlights import HighlightPlan, HighlightPolicy, score_highlights
+from .media.reframe import estimate_focus_x
+from .media.render_cache import DEFAULT_MAX_BYTES, RenderCache, parse_size
+from .media.silence import SilencePolicy, TrimTimeline, build_keep_intervals, detect_silences
+from .nlp.highlights import Highlight, HighlightPlan, HighlightPolicy, score_highlights
 from .branding.theme import BrandTheme, load_brand_theme
+from .audit import SidecarFinder, audit_inputs, iter_library, iter_manifest, run_audit
+from .batch import BatchRow, load_batch_manifest, run_batch, write_batch_report
+from .search import SEARCH_INDEX_FILENAME, SearchError, TranscriptIndex, format_timestamp
+from .serve import KEEP_FINISHED_JOBS, MAX_JOB_EVENTS, JobService, create_server, write_token
+from .watch import FolderWatcher
 from .outputs.packaging import (
+    ARCHIVE_FORMATS,
+    ExportArchive,
     ExportContext,
     build_export_structure,
+    build_input_structure,
+    export_completed,
+    index_entry,
+    input_slug,
     write_assets_map,
     write_highlights_manifest,
+    write_job_index,
 )
+from .outputs.catalog import CATALOG_FILENAME, TRANSCRIPT_KIND, JobCatalog
 from .outputs.credits import CreditsBuilder
-from .stt.transcribe import TranscriptResult, transcribe_media
+from .stt.columnar import COLUMNAR_SUFFIX, ColumnarTranscript, restore_transcript, store_transcript
+from .stt.transcribe import TranscriptResult, transcribe_media, transcription_engine
+from .templates import TEMPLATES, StagePlan, plan_stages
+from .util.checkpoint import JobCheckpoint
 from .util.errors import CreatorPackError, ExitCodes
-from .util.job import compute_job_id
-from .util.io import dump_json
-from .util.logging import configure_logging, job_logger
+from .util.job import compute_job_id, input_fingerprint
+from .util.io import ManifestWriter, dump_json
+from .util.logging import configure_logging, job_logger, release_logging
 from .util.preflight import run_preflight
+from .util.scheduler import TaskGraph
+from .util.stage_cache import StageCache, fingerprint
 
 
 LOGGER = logging.getLogger(__name__)
@@ -57,6 +94,26 @@ class RunOptions:
     block_nc_nd: bool
     dry_run: bool
     job_id: str
+    vertical_shorts: bool = False
+    renditions: List[Rendition] = field(default_factory=list)
+    loudness_target: Optional[LoudnessTarget] = None
+    audio_only: bool = False
+    audio_format: str = "m4a"
+    render_jobs: int = 2
+    full_hash: bool = False
+    ingest_strategy: str = "auto"
+    stage_cache_dir: Optional[Path] = None
+    render_cache_dir: Optional[Path] = None
+    render_cache_max_bytes: Optional[int] = DEFAULT_MAX_BYTES
+    acoustic_index: Optional[Path] = None
+    download_cache_dir: Optional[Path] = None
+    license_cache_dir: Optional[Path] = None
+    resume: bool = False
+    archive_format: Optional[str] = None
+    archive_checksums: bool = False
+    search_index: Optional[Path] = None
+    catalog_path: Optional[Path] = None
+    cancel: Optional[threading.Event] = None
 
 
 @click.group()
@@ -68,7 +125,7 @@ def cli() -> None:
 @cli.command("run")
 @click.option("--url", "urls", multiple=True, help="Media URL from an allowlisted source.")
 @click.option("--file", "files", multiple=True, type=click.Path(exists=True, path_type=Path), help="Local media file")
-@click.option("--template", type=click.Choice(["creator-pack", "podcast", "chapters-only", "shorts-only"]), default="creator-pack")
+@click.option("--template", type=click.Choice(list(TEMPLATES)), default="creator-pack")
 @click.option("--minutes", type=click.IntRange(min=1, max=180), default=10)
 @click.option("--smart", is_flag=True, default=False, help="Use sentence-aligned chapter boundaries")
 @click.option("--highlights", is_flag=True, default=False, help="Generate 60-90 second highlights")
@@ -76,6 +133,13 @@ def cli() -> None:
 @click.option("--highlights-min-seconds", type=click.FloatRange(min=5.0, max=180.0), default=60.0)
 @click.option("--highlights-max-seconds", type=click.FloatRange(min=5.0, max=300.0), default=90.0)
 @click.option("--highlights-padding-seconds", type=click.FloatRange(min=0.0, max=30.0), default=2.0)
+@click.option("--vertical-shorts", is_flag=True, default=False, help="Render highlights as 9:16 shorts (crop in the cut pass)")
+@click.option("--renditions", default=None, help="Chapter rendition ladder encoded from one decode, e.g. 1080p,720p,480p")
+@click.option("--loudnorm", is_flag=True, default=False, help="Loudness-normalize every clip from one whole-source measurement")
+@click.option("--loudness-target", type=click.FloatRange(min=-70.0, max=-5.0), default=-16.0, show_default=True, help="Integrated loudness target (LUFS)")
+@click.option("--audio-only", is_flag=True, default=False, help="Render audio-only chapters/highlights (automatic for sources without video)")
+@click.option("--audio-format", type=click.Choice(["m4a", "opus"]), default="m4a", show_default=True)
+@click.option("--render-jobs", type=click.IntRange(min=1, max=16), default=2, show_default=True, help="Concurrent ffmpeg renders")
 @click.option("--brand", "brand_path", type=click.Path(exists=True, path_type=Path))
 @click.option("--localize", type=str, default=None, help="Comma separated list of locales to translate captions into")
 @click.option("--diarize", is_flag=True, default=False)
@@ -83,6 +147,15 @@ def cli() -> None:
 @click.option("--allow-sources", default="pexels,nasa,commons,europeana,archive,local", show_default=True)
 @click.option("--block-nc-nd/--no-block-nc-nd", default=True)
 @click.option("--dry-run", is_flag=True, default=False, help="Write manifests/logs only (skip ffmpeg renders)")
+@click.option("--full-hash", is_flag=True, default=False, help="Hash whole input files for the job id instead of sampled blocks")
+@click.option("--ingest", "ingest_strategy", type=click.Choice(INGEST_STRATEGIES), default="auto", show_default=True, help="How local files enter <job>/input (auto: reflink, else hardlink, else copy)")
+@click.option("--cache-dir", type=click.Path(file_okay=False, path_type=Path), default=None, help="Shared stage and render cache (default: <out>/.cache)")
+@click.option("--stage-cache/--no-stage-cache", default=True, help="Reuse probe/transcript/plan/render results across jobs")
+@click.option("--acoustic-dedupe/--no-acoustic-dedupe", default=True, help="Reuse transcripts of re-encoded copies of earlier recordings (needs NumPy)")
+@click.option("--render-cache-size", default="20G", show_default=True, callback=lambda ctx, param, value: _size_option(value), help="Evict least recently used renders beyond this size")
+@click.option("--resume", is_flag=True, default=False, help="Continue an interrupted job from its job.state.json")
+@click.option("--archive", "archive_format", type=click.Choice(ARCHIVE_FORMATS), default=None, help="Build <out>/<job_id>.zip|.tar for delivery while clips render")
+@click.option("--archive-checksums", is_flag=True, default=False, help="Add a SHA256SUMS manifest to the archive")
 def run_command(
     urls: Iterable[str],
     files: Iterable[Path],
@@ -94,6 +167,13 @@ def run_command(
     highlights_min_seconds: float,
     highlights_max_seconds: float,
     highlights_padding_seconds: float,
+    vertical_shorts: bool,
+    renditions: Optional[str],
+    loudnorm: bool,
+    loudness_target: float,
+    audio_only: bool,
+    audio_format: str,
+    render_jobs: int,
     brand_path: Optional[Path],
     localize: Optional[str],
     diarize: bool,
@@ -101,12 +181,70 @@ def run_command(
     allow_sources: str,
     block_nc_nd: bool,
     dry_run: bool,
+    full_hash: bool,
+    ingest_strategy: str,
+    cache_dir: Optional[Path],
+    stage_cache: bool,
+    acoustic_dedupe: bool,
+    render_cache_size: int,
+    resume: bool,
+    archive_format: Optional[str],
+    archive_checksums: bool,
 ) -> None:
     """Execute the CreatorPack workflow."""
 
+    options = build_run_options(**locals())
+    run_preflight(options.inputs)
+
+    try:
+        _run_pipeline(options)
+    except CreatorPackError as exc:
+        job_logger().error("job_failed", extra={"error": str(exc)})
+        raise SystemExit(exc.exit_code) from exc
+
+
+def build_run_options(
+    *,
+    urls: Iterable[str],
+    files: Iterable[Path],
+    template: str,
+    minutes: int,
+    smart: bool,
+    highlights: bool,
+    highlights_top_k: int,
+    highlights_min_seconds: float,
+    highlights_max_seconds: float,
+    highlights_padding_seconds: float,
+    vertical_shorts: bool,
+    renditions: Optional[str],
+    loudnorm: bool,
+    loudness_target: float,
+    audio_only: bool,
+    audio_format: str,
+    render_jobs: int,
+    brand_path: Optional[Path],
+    localize: Optional[str],
+    diarize: bool,
+    output_dir: Path,
+    allow_sources: str,
+    block_nc_nd: bool,
+    dry_run: bool,
+    full_hash: bool = False,
+    ingest_strategy: str = "auto",
+    cache_dir: Optional[Path] = None,
+    stage_cache: bool = True,
+    acoustic_dedupe: bool = True,
+    render_cache_size: int = DEFAULT_MAX_BYTES,
+    resume: bool = False,
+    archive_format: Optional[str] = None,
+    archive_checksums: bool = False,
+) -> RunOptions:
+    """Turn ``run`` option values (CLI flags or a batch row) into :class:`RunOptions`."""
+
     allow_sources_list = [item.strip() for item in allow_sources.split(",") if item.strip()]
     inputs = detect_input_sources(list(urls), list(files), allow_sources_list)
-    run_preflight(inputs)
+    rendition_ladder = parse_rendition_ladder(renditions) if renditions else []
+    loudness = LoudnessTarget(integrated=loudness_target) if loudnorm else None
 
     highlight_policy = HighlightPolicy(
         top_k=highlights_top_k,
@@ -124,9 +262,16 @@ def run_command(
         brand_path=brand_path,
         diarize=diarize,
         localize=localize,
+        vertical_shorts=vertical_shorts,
+        renditions=[rendition.name for rendition in rendition_ladder],
+        loudness=loudness.__dict__ if loudness else None,
+        audio_only=audio_only,
+        audio_format=audio_format,
+        full_hash=full_hash,
     )
+    cache_root = cache_dir or output_dir / ".cache"
 
-    options = RunOptions(
+    return RunOptions(
         inputs=inputs,
         template=template,
         minutes=minutes,
@@ -141,18 +286,572 @@ def run_command(
         block_nc_nd=block_nc_nd,
         dry_run=dry_run,
         job_id=job_id,
+        vertical_shorts=vertical_shorts,
+        renditions=rendition_ladder,
+        loudness_target=loudness,
+        audio_only=audio_only,
+        audio_format=audio_format,
+        render_jobs=render_jobs,
+        full_hash=full_hash,
+        ingest_strategy=ingest_strategy,
+        stage_cache_dir=cache_root / "stages" if stage_cache else None,
+        render_cache_dir=cache_root / "renders" if stage_cache else None,
+        render_cache_max_bytes=render_cache_size,
+        acoustic_index=cache_root / "acoustic.sqlite" if stage_cache and acoustic_dedupe else None,
+        download_cache_dir=cache_root / "downloads",
+        license_cache_dir=cache_root / "licenses",
+        resume=resume,
+        archive_format=archive_format,
+        archive_checksums=archive_checksums,
+        search_index=cache_root / SEARCH_INDEX_FILENAME,
+        catalog_path=output_dir / CATALOG_FILENAME,
     )
 
+
+@cli.command("batch")
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--jobs", type=click.IntRange(min=1, max=32), default=2, show_default=True, help="Jobs run concurrently")
+@click.option("--render-jobs", type=click.IntRange(min=1, max=16), default=2, show_default=True, help="Concurrent ffmpeg renders per job")
+@click.option("--out", "output_dir", type=click.Path(file_okay=False, path_type=Path), default=Path("exports"))
+@click.option("--report", "report_dir", type=click.Path(file_okay=False, path_type=Path), default=None, help="Directory for batch.* reports (defaults to --out)")
+@click.option("--allow-sources", default="pexels,nasa,commons,europeana,archive,local", show_default=True)
+@click.option("--block-nc-nd/--no-block-nc-nd", default=True)
+@click.option("--dry-run", is_flag=True, default=False, help="Write manifests/logs only (skip ffmpeg renders)")
+def batch_command(
+    manifest: Path,
+    jobs: int,
+    render_jobs: int,
+    output_dir: Path,
+    report_dir: Optional[Path],
+    allow_sources: str,
+    block_nc_nd: bool,
+    dry_run: bool,
+) -> None:
+    """Run every row of a CSV/JSONL manifest through one warm process.
+
+    Columns are ``run`` options (``file``, ``url``, ``template``, ``minutes``, ...);
+    several files or URLs in one CSV cell are separated with ``;``. The batch-level
+    options are defaults that a row may override.
+    """
+
     try:
-        _run_pipeline(options)
+        rows = load_batch_manifest(manifest)
     except CreatorPackError as exc:
-        job_logger().error("job_failed", extra={"error": str(exc)})
+        click.echo(str(exc), err=True)
         raise SystemExit(exc.exit_code) from exc
 
+    defaults = _job_defaults(render_jobs, output_dir, allow_sources, block_nc_nd, dry_run)
+    _prefetch_licenses(rows, defaults)
+    report = run_batch(
+        rows,
+        prepare=lambda values: _prepare_job({**defaults, **values}),
+        execute=_run_job,
+        is_complete=lambda options: export_completed(options.output_dir, options.job_id),
+        jobs=jobs,
+    )
+    write_batch_report(report, report_dir or output_dir)
 
-def _run_pipeline(options: RunOptions) -> None:
-    license_gate = LicenseGate(block_nc_nd=options.block_nc_nd)
+    summary = report.to_dict()
+    counts = ", ".join(f"{count} {status}" for status, count in sorted(summary["counts"].items()))
+    click.echo(
+        f"{summary['rows']} rows ({counts or 'nothing to do'}); "
+        f"{summary['media_hours_per_wall_hour']} media hours per wall-clock hour"
+    )
+    if report.failures:
+        raise SystemExit(ExitCodes.PARTIAL_FAILURE)
+
+
+@cli.command("serve")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface for the HTTP job API")
+@click.option("--port", type=click.IntRange(min=0, max=65535), default=8765, show_default=True)
+@click.option("--socket", "socket_path", type=click.Path(dir_okay=False, path_type=Path), default=None, help="Serve on a Unix socket instead of TCP")
+@click.option("--jobs", type=click.IntRange(min=1, max=32), default=1, show_default=True, help="Jobs run concurrently")
+@click.option("--render-jobs", type=click.IntRange(min=1, max=16), default=2, show_default=True, help="Concurrent ffmpeg renders per job")
+@click.option("--out", "output_dir", type=click.Path(file_okay=False, path_type=Path), default=Path("exports"))
+@click.option("--allow-sources", default="pexels,nasa,commons,europeana,archive,local", show_default=True)
+@click.option("--block-nc-nd/--no-block-nc-nd", default=True)
+@click.option("--dry-run", is_flag=True, default=False, help="Write manifests/logs only (skip ffmpeg renders)")
+@click.option("--keep-jobs", type=click.IntRange(min=0), default=KEEP_FINISHED_JOBS, show_default=True, help="Finished jobs kept for GET /jobs")
+@click.option("--max-events", type=click.IntRange(min=1), default=MAX_JOB_EVENTS, show_default=True, help="Most recent events kept per job")
+def serve_command(
+    host: str,
+    port: int,
+    socket_path: Optional[Path],
+    jobs: int,
+    render_jobs: int,
+    output_dir: Path,
+    allow_sources: str,
+    block_nc_nd: bool,
+    dry_run: bool,
+    keep_jobs: int,
+    max_events: int,
+) -> None:
+    """Keep a warm worker process and accept jobs over a local HTTP API.
+
+    ``POST /jobs`` with ``{"options": {...run options...}, "priority": 0}`` queues a
+    job; ``GET /jobs/<id>``, ``POST /jobs/<id>/cancel`` and ``GET /jobs/<id>/events``
+    (NDJSON stream) follow it. ``POST``/``DELETE`` need ``Authorization: Bearer <token>``
+    with the token written (mode 0600) to ``<socket>.token`` or ``<out>/.serve-token``.
+    """
+
+    defaults = _job_defaults(render_jobs, output_dir, allow_sources, block_nc_nd, dry_run)
+    service = JobService(
+        prepare=lambda values: _prepare_job({**defaults, **values}),
+        execute=_run_job,
+        workers=jobs,
+        keep_finished=keep_jobs,
+        max_events=max_events,
+    )
+    server = create_server(service, host=host, port=port, socket_path=socket_path)
+    where = socket_path or "http://{}:{}".format(*server.server_address[:2])
+    token_path = socket_path.with_name(socket_path.name + ".token") if socket_path else output_dir / ".serve-token"
+    write_token(token_path, server.token)
+    click.echo(f"creatorpack serving jobs on {where} (token in {token_path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        token_path.unlink(missing_ok=True)
+
+
+@cli.command("watch")
+@click.argument("folder", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--jobs", type=click.IntRange(min=1, max=32), default=1, show_default=True, help="Jobs run concurrently")
+@click.option("--settle-seconds", type=click.FloatRange(min=0.0), default=5.0, show_default=True, help="How long a file's size must hold still before it is processed")
+@click.option("--poll-interval", type=click.FloatRange(min=0.05), default=1.0, show_default=True)
+@click.option("--backend", type=click.Choice(["auto", "inotify", "poll"]), default="auto", show_default=True)
+@click.option("--set", "settings", multiple=True, metavar="OPTION=VALUE", help="run option for every job, e.g. --set template=podcast")
+@click.option("--render-jobs", type=click.IntRange(min=1, max=16), default=2, show_default=True, help="Concurrent ffmpeg renders per job")
+@click.option("--out", "output_dir", type=click.Path(file_okay=False, path_type=Path), default=Path("exports"))
+@click.option("--allow-sources", default="pexels,nasa,commons,europeana,archive,local", show_default=True)
+@click.option("--block-nc-nd/--no-block-nc-nd", default=True)
+@click.option("--dry-run", is_flag=True, default=False, help="Write manifests/logs only (skip ffmpeg renders)")
+def watch_command(
+    folder: Path,
+    jobs: int,
+    settle_seconds: float,
+    poll_interval: float,
+    backend: str,
+    settings: Iterable[str],
+    render_jobs: int,
+    output_dir: Path,
+    allow_sources: str,
+    block_nc_nd: bool,
+    dry_run: bool,
+) -> None:
+    """Process media dropped into FOLDER once each file has finished copying.
+
+    The job id follows the file's content and the options, so files already
+    exported under that id are skipped, including ones that were only touched,
+    renamed or copied, and restarting the watcher does not reprocess the folder.
+    """
+
+    defaults = _job_defaults(render_jobs, output_dir, allow_sources, block_nc_nd, dry_run)
+    for setting in settings:
+        key, sep, value = setting.partition("=")
+        if not sep:
+            raise click.BadParameter(f"expected OPTION=VALUE, got '{setting}'", param_hint="--set")
+        defaults[key.strip()] = value.strip()
+    try:
+        watcher = FolderWatcher(folder, settle_seconds=settle_seconds, backend=backend, ignore=[output_dir])
+    except CreatorPackError as exc:
+        click.echo(str(exc), err=True)
+        raise SystemExit(exc.exit_code) from exc
+
+    service = JobService(prepare=lambda values: _prepare_job({**defaults, **values}), execute=_run_job, workers=jobs)
+    click.echo(f"watching {watcher.root} ({watcher.backend}); exports go to {output_dir}")
+    reported: set[str] = set()
+    try:
+        while True:
+            for path in watcher.poll(poll_interval):
+                click.echo(f"{_enqueue_watched(service, {**defaults, 'file': str(path)})}: {path}")
+            listed = service.list()
+            for job in listed:
+                if job.done and job.id not in reported:
+                    reported.add(job.id)
+                    click.echo(f"{job.status}: {job.job_id}" + (f" ({job.error})" if job.error else ""))
+            reported &= {job.id for job in listed}  # the service forgets old finished jobs
+    except KeyboardInterrupt:
+        pass
+    except CreatorPackError as exc:
+        click.echo(str(exc), err=True)
+        raise SystemExit(exc.exit_code) from exc
+    finally:
+        watcher.close()
+        service.stop()
+
+
+@cli.command("audit")
+@click.argument("target", type=click.Path(exists=True, path_type=Path))
+@click.option("--report", "report_path", type=click.Path(dir_okay=False, allow_dash=True, path_type=Path), default=Path("-"), help="JSON lines report, one line per file (default: stdout)")
+@click.option("--workers", type=click.IntRange(min=1, max=256), default=32, show_default=True, help="Files checked concurrently")
+@click.option("--default-license", default=None, help="License assumed for files without sidecar metadata (default: report them as missing)")
+@click.option("--block-nc-nd/--no-block-nc-nd", default=True)
+@click.option("--out", "output_dir", type=click.Path(file_okay=False, path_type=Path), default=Path("exports"))
+@click.option("--cache-dir", type=click.Path(file_okay=False, path_type=Path), default=None, help="Cache root for URL license lookups (default: <out>/.cache)")
+def audit_command(
+    target: Path,
+    report_path: Path,
+    workers: int,
+    default_license: Optional[str],
+    block_nc_nd: bool,
+    output_dir: Path,
+    cache_dir: Optional[Path],
+) -> None:
+    """Check every media file under TARGET (a folder, batch manifest or list of paths) against the license gate.
+
+    Licenses come from sidecars next to each file (``<name>.json``, ``.xmp``,
+    ``.yaml``) or a ``license.json``/``license.yaml`` in a parent folder; URLs in
+    a manifest are looked up at their source. Exits with code 3 unless every
+    file is allowed.
+    """
+
+    gate = LicenseGate(block_nc_nd=block_nc_nd)
+    if target.is_dir():
+        finder = SidecarFinder(target)
+        inputs: Iterable[IngestInput] = (
+            IngestInput("local", str(path)) for path in iter_library(target, finder)
+        )
+    else:
+        finder = SidecarFinder()
+        inputs = iter_manifest(target)
+    resolver = LicenseResolver((cache_dir or output_dir / ".cache") / "licenses")
+    results = audit_inputs(
+        inputs, gate, finder=finder, workers=workers, default_license=default_license, resolver=resolver
+    )
+    try:
+        with click.open_file(str(report_path), "w", encoding="utf-8") as stream:
+            summary = run_audit(results, stream.write, flush=stream.flush)
+    except CreatorPackError as exc:
+        click.echo(str(exc), err=True)
+        raise SystemExit(exc.exit_code) from exc
+    finally:
+        resolver.close()
+
+    counts = ", ".join(f"{count} {status}" for status, count in sorted(summary.counts.items()))
+    click.echo(f"{summary.total} files ({counts or 'none found'}) in {summary.wall_seconds:.1f}s", err=True)
+    if not summary.passed:
+        raise SystemExit(ExitCodes.LICENSE_BLOCKED)
+
+
+@cli.command("index")
+@click.option("--out", "output_dir", type=click.Path(file_okay=False, path_type=Path), default=Path("exports"))
+@click.option("--cache-dir", type=click.Path(file_okay=False, path_type=Path), default=None, help="Cache root holding search.sqlite (default: <out>/.cache)")
+@click.option("--rebuild", is_flag=True, default=False, help="Drop the index and read every transcript again")
+def index_command(output_dir: Path, cache_dir: Optional[Path], rebuild: bool) -> None:
+    """Update the transcript search index from the exports under --out.
+
+    Only jobs whose ``manifests/job.json`` changed since the last update are
+    read again; jobs that were deleted are dropped. Jobs run by this version
+    index themselves as they finish.
+    """
+
+    index = TranscriptIndex((cache_dir or output_dir / ".cache") / SEARCH_INDEX_FILENAME)
+    report = index.update(output_dir, rebuild=rebuild)
+    click.echo(
+        f"{report.indexed} jobs indexed ({report.segments} segments), {report.unchanged} unchanged, "
+        f"{report.removed} removed in {report.wall_seconds:.2f}s"
+    )
+
+
+@cli.command("search")
+@click.argument("query")
+@click.option("--out", "output_dir", type=click.Path(file_okay=False, path_type=Path), default=Path("exports"))
+@click.option("--cache-dir", type=click.Path(file_okay=False, path_type=Path), default=None, help="Cache root holding search.sqlite (default: <out>/.cache)")
+@click.option("--job", "job_id", default=None, help="Only search this job")
+@click.option("--limit", type=click.IntRange(min=1, max=1000), default=20, show_default=True)
+@click.option("--raw", is_flag=True, default=False, help="Pass QUERY to SQLite FTS5 as is (phrases, OR, NEAR, prefix*)")
+@click.option("--json", "as_json", is_flag=True, default=False, help="One JSON object per hit")
+def search_command(
+    query: str, output_dir: Path, cache_dir: Optional[Path], job_id: Optional[str], limit: int, raw: bool, as_json: bool
+) -> None:
+    """Find transcript segments that mention QUERY across every indexed job."""
+
+    index = TranscriptIndex((cache_dir or output_dir / ".cache") / SEARCH_INDEX_FILENAME)
+    try:
+        hits = index.search(query, job_id=job_id, limit=limit, raw=raw)
+    except SearchError as exc:
+        click.echo(str(exc), err=True)
+        raise SystemExit(exc.exit_code) from exc
+    for hit in hits:
+        if as_json:
+            click.echo(json.dumps(hit.to_dict(), ensure_ascii=False))
+        else:
+            click.echo(f"{hit.job_id}  {format_timestamp(hit.start)}  #{hit.segment}  {hit.snippet}")
+    if not hits and not as_json:
+        click.echo("no matches", err=True)
+
+
+@cli.group("jobs")
+@click.option("--out", "output_dir", type=click.Path(file_okay=False, path_type=Path), default=Path("exports"))
+@click.pass_context
+def jobs_group(ctx: click.Context, output_dir: Path) -> None:
+    """Query the job catalog (<out>/catalog.sqlite) kept up to date as jobs run."""
+
+    ctx.obj = JobCatalog(output_dir / CATALOG_FILENAME)
+
+
+@jobs_group.command("list")
+@click.option("--status", type=click.Choice(["running", "completed", "failed"]), default=None)
+@click.option("--template", type=click.Choice(list(TEMPLATES)), default=None)
+@click.option("--input", "input_value", default=None, help="Only jobs made from this file or URL (local files also match renamed copies)")
+@click.option("--limit", type=click.IntRange(min=1), default=50, show_default=True)
+@click.option("--json", "as_json", is_flag=True, default=False, help="One JSON object per job")
+@click.pass_obj
+def jobs_list_command(
+    catalog: JobCatalog, status: Optional[str], template: Optional[str], input_value: Optional[str], limit: int, as_json: bool
+) -> None:
+    """List jobs, newest first."""
+
+    source_key = None
+    if input_value is not None and Path(input_value).is_file():
+        source_key = fingerprint(input_fingerprint(IngestInput(kind="local", value=input_value)))
+        input_value = str(Path(input_value).resolve())
+    for job in catalog.list_jobs(
+        status=status, template=template, input_value=input_value, source_key=source_key, limit=limit
+    ):
+        if as_json:
+            click.echo(json.dumps(job, ensure_ascii=False))
+        else:
+            click.echo(
+                f"{job['job_id']}  {job['status']:<9}  {job['template'] or '-':<13}  {job['started_at'][:19]}  "
+                f"{job['inputs']} inputs  {job['rendered_seconds'] / 60:.1f} min rendered"
+            )
+
+
+@jobs_group.command("show")
+@click.argument("job_id")
+@click.pass_obj
+def jobs_show_command(catalog: JobCatalog, job_id: str) -> None:
+    """Print a job with its inputs, stages and assets as JSON."""
+
+    job = catalog.show(job_id)
+    if job is None:
+        click.echo(f"unknown job {job_id}", err=True)
+        raise SystemExit(ExitCodes.INVALID_INPUT)
+    click.echo(json.dumps(job, indent=2, ensure_ascii=False))
+
+
+@jobs_group.command("stats")
+@click.option("--json", "as_json", is_flag=True, default=False)
+@click.pass_obj
+def jobs_stats_command(catalog: JobCatalog, as_json: bool) -> None:
+    """Job counts, media processed and rendered minutes per asset kind."""
+
+    stats = catalog.stats()
+    if as_json:
+        click.echo(json.dumps(stats, indent=2))
+        return
+    counts = ", ".join(f"{count} {status}" for status, count in sorted(stats["jobs"].items()))
+    click.echo(f"jobs: {counts or 'none'}")
+    click.echo(f"media processed: {stats['media_seconds'] / 3600:.2f} h")
+    click.echo(f"rendered: {stats['rendered_seconds'] / 60:.1f} min")
+    for kind, entry in stats["assets"].items():
+        click.echo(f"  {kind}: {entry['files']} files, {entry['seconds'] / 60:.1f} min, {entry['bytes']} bytes")
+
+
+@jobs_group.command("sync")
+@click.pass_context
+def jobs_sync_command(ctx: click.Context) -> None:
+    """Add completed exports under --out that the catalog does not know yet (e.g. made before it existed)."""
+
+    added = ctx.obj.sync(ctx.parent.params["output_dir"])
+    click.echo(f"{added} jobs added")
+
+
+@cli.group("cache")
+def cache_group() -> None:
+    """Inspect and trim the shared render cache."""
+
+
+@cache_group.command("gc")
+@click.option("--out", "output_dir", type=click.Path(file_okay=False, path_type=Path), default=Path("exports"))
+@click.option("--cache-dir", type=click.Path(file_okay=False, path_type=Path), default=None, help="Cache root (default: <out>/.cache)")
+@click.option("--max-size", default="20G", show_default=True, callback=lambda ctx, param, value: _size_option(value), help="Keep the most recently used renders up to this size")
+def cache_gc_command(output_dir: Path, cache_dir: Optional[Path], max_size: int) -> None:
+    """Evict least recently used renders and unreferenced files."""
+
+    cache = RenderCache((cache_dir or output_dir / ".cache") / "renders", max_bytes=max_size)
+    report = cache.evict()
+    click.echo(
+        f"removed {report.removed_entries} renders ({report.removed_bytes} bytes); "
+        f"{report.remaining_entries} renders ({report.remaining_bytes} bytes) kept"
+    )
+
+
+def _enqueue_watched(service: JobService, values: Dict[str, object]) -> str:
+    """Queue one settled file unless its export already exists; returns what happened.
+
+    Job ids follow content, so a copy of a file that is already queued or
+    exported is reported as a duplicate instead of being processed again.
+    """
+
+    try:
+        options = _prepare_job(values)
+    except Exception as exc:  # invalid input only affects this file
+        return f"rejected ({exc})"
+    if export_completed(options.output_dir, options.job_id):
+        return f"skipped {options.job_id}"
+    job = service.enqueue(options)
+    if job.options is not options:
+        return f"duplicate {job.job_id}"
+    return f"queued {job.job_id}"
+
+
+def _size_option(value: str) -> int:
+    try:
+        return parse_size(value)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc)) from exc
+
+
+def _job_defaults(
+    render_jobs: int, output_dir: Path, allow_sources: str, block_nc_nd: bool, dry_run: bool
+) -> Dict[str, object]:
+    """Daemon/batch-level option values that individual jobs may override."""
+
+    return {
+        "render-jobs": render_jobs,
+        "out": str(output_dir),
+        "allow-sources": allow_sources,
+        "block-nc-nd": block_nc_nd,
+        "dry-run": dry_run,
+    }
+
+
+def _prefetch_licenses(rows: List[BatchRow], defaults: Dict[str, object]) -> None:
+    """Resolve the licenses of every remote input in a batch concurrently before the jobs start."""
+
+    by_cache: Dict[Path, List[IngestInput]] = {}
+    for row in rows:
+        if not any(str(key).strip().lstrip("-") == "url" and value for key, value in row.values.items()):
+            continue
+        try:
+            options = _prepare_job({**defaults, **row.values})
+        except CreatorPackError:
+            continue  # the row reports its own error when it runs
+        if options.license_cache_dir is not None:
+            by_cache.setdefault(options.license_cache_dir, []).extend(options.inputs)
+    for cache_dir, inputs in by_cache.items():
+        resolver = LicenseResolver(cache_dir)
+        try:
+            resolver.prefetch(inputs)
+        finally:
+            resolver.close()
+
+
+def _prepare_job(values: Dict[str, object]) -> RunOptions:
+    """Parse a batch row or API request with the ``run`` command's own options, so values validate like flags."""
+
+    params = {}
+    for param in run_command.params:
+        for name in (*param.opts, param.name.replace("_", "-")):
+            params[name.lstrip("-")] = param
+    args: List[str] = []
+    for column, raw in values.items():
+        param = params.get(column.strip().lstrip("-").replace("_", "-"))
+        if param is None:
+            raise CreatorPackError(f"Unknown batch column '{column}'")
+        if raw is None or raw == "":
+            continue
+        if getattr(param, "is_flag", False):
+            if click.BOOL.convert(raw, param, None):
+                args.append(param.opts[0])
+            elif param.secondary_opts:
+                args.append(param.secondary_opts[0])
+            continue
+        items = raw if isinstance(raw, list) else str(raw).split(";") if param.multiple else [raw]
+        for item in items:
+            if str(item).strip():
+                args.extend([param.opts[0], str(item).strip()])
+    ctx = run_command.make_context("batch-row", args)
+    options = build_run_options(**ctx.params)
+    run_preflight(options.inputs)
+    return options
+
+
+def _run_job(options: RunOptions) -> float:
+    try:
+        return _run_pipeline(options).media_seconds
+    except CreatorPackError as exc:
+        job_logger().error("job_failed", extra={"error": str(exc)})
+        raise
+    finally:
+        release_logging()
+
+
+@dataclass
+class _InputWork:
+    """Mutable per-input state shared by the tasks that process one download."""
+
+    key: str
+    value: str
+    download: DownloadResult
+    export_ctx: ExportContext
+    source_fp: dict = field(default_factory=dict)
+    probe: Optional[MediaProbe] = None
+    audio_filter: Optional[str] = None
+    audio_output: Optional[AudioOutput] = None
+    transcript: Optional[Union[TranscriptResult, ColumnarTranscript]] = None
+    timeline: Optional[TrimTimeline] = None
+    chapter_segments: List[MediaSegment] = field(default_factory=list)
+    highlight_plan: Optional[HighlightPlan] = None
+    highlight_segments: List[MediaSegment] = field(default_factory=list)
+    rendered: Dict[str, Dict[int, ChunkOutput]] = field(default_factory=dict)
+
+    def outputs(self, stage: str) -> List[ChunkOutput]:
+        by_index = self.rendered.get(stage, {})
+        return [by_index[index] for index in sorted(by_index)]
+
+
+@dataclass
+class _RenderVariant:
+    stage: str
+    dir_attr: str
+    highlights: bool
+    branded: bool
+
+
+_RENDER_VARIANTS = (
+    _RenderVariant("render_chapters", "chapters_dir", highlights=False, branded=False),
+    _RenderVariant("branded_chapters", "branded_chapters_dir", highlights=False, branded=True),
+    _RenderVariant("render_highlights", "highlights_dir", highlights=True, branded=False),
+    _RenderVariant("branded_highlights", "branded_highlights_dir", highlights=True, branded=True),
+)
+
+
+@dataclass
+class _PipelineContext:
+    options: RunOptions
+    stages: StagePlan
+    export_ctx: ExportContext
+    graph: TaskGraph
+    brand: Optional[BrandTheme]
+    shorts_profile: Optional[ShortsProfile]
+    cache: StageCache
+    render_cache: Optional[RenderCache]
+    acoustic: Optional[AcousticIndex]
+    checkpoint: JobCheckpoint
+    manifests: ManifestWriter = field(default_factory=ManifestWriter)
+    archive: Optional[ExportArchive] = None
+    catalog: Optional[JobCatalog] = None
+
+
+@dataclass
+class PipelineResult:
+    job_id: str
+    export_root: Path
+    media_seconds: float
+
+
+def _run_pipeline(options: RunOptions) -> PipelineResult:
     brand: Optional[BrandTheme] = load_brand_theme(options.brand_path) if options.brand_path else None
+    stages = plan_stages(
+        options.template, smart=options.smart, highlights=options.highlights, branded=brand is not None
+    )
 
     export_ctx = build_export_structure(options.output_dir, options.job_id)
     configure_logging(export_ctx.logs_dir)
@@ -160,135 +859,550 @@ def _run_pipeline(options: RunOptions) -> None:
         "job_started",
         extra={"job_id": options.job_id, "template": options.template, "dry_run": options.dry_run},
     )
+    job_logger().info("stages_planned", extra=stages.to_dict())
 
-    download_results = download_inputs(options.inputs, export_ctx.input_dir, license_gate)
-    job_logger().info("inputs_downloaded", extra={"count": len(download_results)})
+    ctx = _PipelineContext(
+        options=options,
+        stages=stages,
+        export_ctx=export_ctx,
+        graph=TaskGraph(),
+        brand=brand,
+        shorts_profile=ShortsProfile() if options.vertical_shorts else None,
+        cache=StageCache(options.stage_cache_dir),
+        render_cache=(
+            RenderCache(options.render_cache_dir, max_bytes=options.render_cache_max_bytes)
+            if options.render_cache_dir
+            else None
+        ),
+        acoustic=_open_acoustic_index(options),
+        checkpoint=JobCheckpoint(export_ctx.root, options.job_id, resume=options.resume),
+        catalog=JobCatalog(options.catalog_path) if options.catalog_path is not None else None,
+    )
+    if ctx.catalog is None:
+        return _execute_pipeline(ctx)
+    ctx.catalog.start_job(options.job_id, template=options.template, root=export_ctx.root, dry_run=options.dry_run)
+    try:
+        return _execute_pipeline(ctx)
+    except BaseException as exc:
+        # Failures while finalizing (manifests, archive, checkpoint, index) count too, not just renders.
+        ctx.catalog.finish_job(options.job_id, "failed", error=str(exc) or exc.__class__.__name__)
+        raise
+
+
+def _execute_pipeline(ctx: _PipelineContext) -> PipelineResult:
+    """Download, run the task graph and finalize manifests, archive, search index and catalog."""
 
-    transcripts: List[TranscriptResult] = []
+    options, stages, export_ctx = ctx.options, ctx.stages, ctx.export_ctx
+    license_gate = LicenseGate(block_nc_nd=options.block_nc_nd)
     credits_builder = CreditsBuilder()
+    works: List[_InputWork] = []
+    # A single input keeps the flat layout; several inputs each get <job>/inputs/<NNN-stem>/
+    # so manifests and same-named files never overwrite each other.
+    namespaced = len(options.inputs) > 1
+    pool = ConnectionPool()
+    downloader = HttpDownloader(options.download_cache_dir or export_ctx.root / ".downloads", pool=pool)
+    resolver = LicenseResolver(options.license_cache_dir, pool=pool)
+    try:
+        # Look every remote license up at once; the per-input calls below then hit the resolver's memory.
+        resolver.resolve_many(ingest for ingest in options.inputs if ingest.kind != "local")
+        for index, ingest in enumerate(options.inputs, start=1):
+            item_ctx = build_input_structure(export_ctx, input_slug(index, ingest.value)) if namespaced else export_ctx
+            download = download_inputs(
+                [ingest],
+                item_ctx.input_dir,
+                license_gate,
+                strategy=options.ingest_strategy,
+                downloader=downloader,
+                resolver=resolver,
+            )[0]
+            license_gate.ensure_allowed(download.license_info)
+            if download.license_info.requires_attribution:
+                credits_builder.add_entry(download.license_info)
+            work = _InputWork(
+                key=f"input-{index:03d}",
+                value=ingest.value,
+                download=download,
+                export_ctx=item_ctx,
+                source_fp=input_fingerprint(ingest, full=options.full_hash),
+            )
+            works.append(work)
+            if ctx.catalog is not None:
+                ctx.catalog.add_input(
+                    options.job_id,
+                    work.key,
+                    work.value,
+                    source=download.source,
+                    source_key=fingerprint(work.source_fp),
+                    root=item_ctx.root,
+                )
+            _add_input_tasks(ctx, work)
+    finally:
+        pool.close()
+    job_logger().info("inputs_downloaded", extra={"count": len(works)})
+
+    if options.archive_format:
+        ctx.archive = ExportArchive(
+            options.output_dir / f"{options.job_id}.{options.archive_format}",
+            export_ctx.root,
+            fmt=options.archive_format,
+            checksums=options.archive_checksums,
+        )
+    try:
+        ctx.graph.run({"stt": 1, "render": options.render_jobs, "io": 1}, cancel=options.cancel)
+    except BaseException as exc:
+        ctx.checkpoint.finish("failed", error=str(exc) or exc.__class__.__name__)
+        ctx.manifests.flush()
+        if ctx.archive is not None:
+            ctx.archive.abort()
+        raise
+
+    if credits_builder:
+        credits_path = export_ctx.manifests_dir / "CREDITS.md"
+        credits_path.write_text(credits_builder.render_markdown(), encoding="utf-8")
+        ctx.manifests.stage(credits_builder.to_dict(), export_ctx.manifests_dir / "credits.json")
+    else:
+        ctx.manifests.stage({"entries": []}, export_ctx.manifests_dir / "credits.json")
+
+    transcripts = [work.transcript for work in works if work.transcript is not None and stages.runs("transcribe")]
+    summary_path = export_ctx.manifests_dir / "summary.md"
+    summary_path.write_text(_render_summary(transcripts), encoding="utf-8")
+    write_job_index(
+        export_ctx,
+        options.job_id,
+        [
+            index_entry(export_ctx, work.export_ctx, work.key, work.value, work.download, writer=ctx.manifests)
+            for work in works
+        ],
+        writer=ctx.manifests,
+    )
+    # Staged last so job.json (which marks the export complete) is the last manifest written.
+    ctx.manifests.stage(
+        {
+            "job_id": options.job_id,
+            "template": options.template,
+            "dry_run": options.dry_run,
+            "inputs": [item.value for item in options.inputs],
+            "stages": stages.to_dict(),
+            "stage_cache": _cache_summary(ctx),
+            "completed_at": datetime.utcnow().isoformat(),
+        },
+        export_ctx.manifests_dir / "job.json",
+    )
+    ctx.manifests.flush()
+
+    ctx.checkpoint.finish("completed")
+    if ctx.archive is not None:
+        ctx.archive.close()
+    if options.search_index is not None:
+        _index_transcripts(options, export_ctx, works)
+    media_seconds = sum(work.probe.duration for work in works if work.probe is not None)
+    if ctx.catalog is not None:
+        if ctx.archive is not None:
+            ctx.catalog.add_assets(options.job_id, None, "archive", [ctx.archive.path])
+        ctx.catalog.finish_job(
+            options.job_id,
+            "completed",
+            media_seconds=media_seconds,
+            stages=stages.to_dict(),
+            stage_cache=_cache_summary(ctx),
+        )
+    job_logger().info("stage_cache_summary", extra={"stages": _cache_summary(ctx)})
+    if ctx.render_cache is not None:
+        ctx.render_cache.evict()
+    job_logger().info("job_completed", extra={"outputs": str(export_ctx.root)})
+    return PipelineResult(job_id=options.job_id, export_root=export_ctx.root, media_seconds=media_seconds)
+
+
+def _index_transcripts(options: RunOptions, export_ctx: ExportContext, works: List[_InputWork]) -> None:
+    """Add the finished job's transcripts to the cross-job search index."""
+
+    assert options.search_index is not None
+    transcripts = [
+        (work.value, work.export_ctx.transcript_dir / "transcript.json", work.transcript)
+        for work in works
+        if work.transcript is not None and (work.export_ctx.transcript_dir / "transcript.json").exists()
+    ]
+    try:
+        count = TranscriptIndex(options.search_index).add_job(options.job_id, export_ctx.root, transcripts)
+    except sqlite3.Error as exc:
+        # The index can be rebuilt with `creatorpack index`; a locked or damaged one never fails the job.
+        job_logger().warning("search_index_failed", extra={"error": str(exc)})
+        return
+    job_logger().info("search_indexed", extra={"transcripts": len(transcripts), "segments": count})
+
 
-    for download in download_results:
-        license_gate.ensure_allowed(download.license_info)
-        if download.license_info.requires_attribution:
-            credits_builder.add_entry(download.license_info)
+def _add_input_tasks(ctx: _PipelineContext, work: _InputWork) -> None:
+    """Register probe -> transcribe -> plan tasks; the plan task adds renders and manifests."""
 
-        probe = probe_media(download.path)
-        job_logger().info("media_probed", extra={"probe": asdict(probe)})
-        transcript = transcribe_media(download.path, diarize=options.diarize)
-        transcripts.append(transcript)
-        dump_json(transcript.to_dict(), export_ctx.transcript_dir / "transcript.json")
+    graph = ctx.graph
+    probe_task = graph.add(f"{work.key}:probe", lambda: _probe_input(ctx, work), resource="io")
+    transcribe_task = None
+    if ctx.stages.runs("transcribe"):
+        transcribe_task = graph.add(
+            f"{work.key}:transcribe",
+            lambda: _transcribe_input(ctx, work),
+            resource="stt",
+        )
+    graph.add(
+        f"{work.key}:plan",
+        lambda: _plan_input(ctx, work),
+        deps=[probe_task, transcribe_task],
+        resource="io",
+    )
+
+
+def _probe_input(ctx: _PipelineContext, work: _InputWork) -> None:
+    options = ctx.options
+    loudness_target = None if options.dry_run else options.loudness_target
+    probe = _memo_stage(
+        ctx,
+        work,
+        "probe",
+        {"source": work.source_fp, "loudness": asdict(loudness_target) if loudness_target else None},
+        lambda: probe_media(work.download.path, loudness_target=loudness_target, cache_dir=work.export_ctx.cache_dir),
+        encode=asdict,
+        decode=probe_from_dict,
+    )
+    job_logger().info("media_probed", extra={"probe": asdict(probe)})
+    work.probe = probe
+    work.audio_filter = probe.loudness.filter() if probe.loudness else None
+    if options.audio_only or not probe.has_video:
+        work.audio_output = AudioOutput(container=options.audio_format, source_codec=probe.audio_codec)
+        job_logger().info(
+            "audio_only_render",
+            extra={"container": work.audio_output.container, "stream_copy": work.audio_output.can_copy},
+        )
+
+
+def _transcribe_input(ctx: _PipelineContext, work: _InputWork) -> None:
+    # The transcript is kept as columns and stored as a mapped binary file next to the
+    # stage cache (or in the job cache); cache and checkpoint entries only point at it.
+    inputs = {"source": work.source_fp, "diarize": ctx.options.diarize, "engine": transcription_engine()}
+    store = (ctx.cache.root / "transcript") if ctx.cache.root is not None else work.export_ctx.cache_dir
+    path = store / f"{fingerprint(inputs)}{COLUMNAR_SUFFIX}"
+    work.transcript = _memo_stage(
+        ctx,
+        work,
+        "transcript",
+        inputs,
+        lambda: ColumnarTranscript.from_result(_transcribe_or_reuse(ctx, work)),
+        encode=lambda transcript: store_transcript(transcript, path),
+        decode=restore_transcript,
+    )
+
+
+def _transcribe_or_reuse(ctx: _PipelineContext, work: _InputWork) -> TranscriptResult:
+    """Run STT unless the acoustic index knows this audio from an earlier, differently encoded file."""
+
+    path, diarize = work.download.path, ctx.options.diarize
+    if ctx.acoustic is None:
+        return transcribe_media(path, diarize=diarize)
+    recording = fingerprint(work.source_fp)
+    variant = fingerprint({"diarize": diarize, "engine": transcription_engine()})
+    try:
+        prints = acoustic_fingerprint(path)
+    except FFmpegError as exc:
+        job_logger().warning("acoustic_fingerprint_failed", extra={"error": str(exc)})
+        return transcribe_media(path, diarize=diarize)
+
+    match = ctx.acoustic.match(prints, exclude=recording)
+    data = ctx.acoustic.transcript(match.recording, variant) if match else None
+    if match is not None and data is not None:
+        job_logger().info(
+            "acoustic_match",
+            extra={"recording": match.recording, "offset": match.offset, "score": match.score},
+        )
+        return shift_transcript(TranscriptResult.from_dict(json.loads(data)), match.offset, prints.duration)
+
+    transcript = transcribe_media(path, diarize=diarize)
+    ctx.acoustic.add(recording, prints)
+    ctx.acoustic.store_transcript(recording, variant, json.dumps(transcript.to_dict()))
+    return transcript
+
+
+def _open_acoustic_index(options: RunOptions) -> Optional[AcousticIndex]:
+    if options.acoustic_index is None or options.dry_run:
+        return None
+    if not numpy_available():
+        job_logger().info("acoustic_dedupe_unavailable", extra={"reason": "numpy is not installed"})
+        return None
+    return AcousticIndex(options.acoustic_index)
+
+
+def _plan_input(ctx: _PipelineContext, work: _InputWork) -> None:
+    options, stages, export_ctx = ctx.options, ctx.stages, work.export_ctx
+    assert work.probe is not None
+    transcript = work.transcript or TranscriptResult(language="und", segments=[])
+    duration = work.probe.duration
+    if stages.runs("silence_trim") and "audio" not in work.probe.streams:
+        # Silence is measured on the audio; a silent video has nothing to cut.
+        job_logger().info("silence_trim_skipped", extra={"input": work.key, "reason": "no audio stream"})
+    elif stages.runs("silence_trim"):
+        work.timeline = _build_trim_timeline(ctx, work)
+        transcript = work.timeline.remap_transcript(transcript)
+        duration = work.timeline.duration
+    work.transcript = transcript
+    if stages.runs("transcribe"):
+        dump_json(transcript.to_dict(), export_ctx.transcript_dir / "transcript.json", compact=True)
         (export_ctx.transcript_dir / "transcript.txt").write_text(transcript.to_text(), encoding="utf-8")
+        _deliver(
+            ctx,
+            work,
+            TRANSCRIPT_KIND,
+            [export_ctx.transcript_dir / "transcript.json", export_ctx.transcript_dir / "transcript.txt"],
+        )
 
+    transcript_key = fingerprint(transcript.to_dict())
+    if stages.runs("chapter_plan"):
         chapter_policy = ChapterPolicy(
             target_seconds=options.minutes * 60,
             alignment="sentence" if options.smart else "fixed",
             allow_smart=options.smart,
         )
-        chapter_plan = build_chapter_plan(transcript, probe.duration, chapter_policy)
-        dump_json(chapter_plan.to_dict(), export_ctx.manifests_dir / "chapters.json")
+        chapter_plan = ChapterPlan(
+            policy=chapter_policy,
+            chapters=_memo_stage(
+                ctx,
+                work,
+                "chapter_plan",
+                {"transcript": transcript_key, "duration": duration, "policy": asdict(chapter_policy)},
+                lambda: build_chapter_plan(transcript, duration, chapter_policy).chapters,
+                encode=lambda chapters: [asdict(chapter) for chapter in chapters],
+                decode=lambda data: [Chapter(**chapter) for chapter in data],
+            ),
+        )
+        ctx.manifests.stage(chapter_plan.to_dict(), export_ctx.manifests_dir / "chapters.json")
+        work.chapter_segments = _on_timeline(chapters_to_segments(chapter_plan.chapters), work.timeline)
+
+    if stages.runs("highlight_plan"):
+        work.highlight_plan = _memo_stage(
+            ctx,
+            work,
+            "highlight_plan",
+            {"transcript": transcript_key, "duration": duration, "policy": asdict(options.highlight_policy)},
+            lambda: score_highlights(transcript, duration, options.highlight_policy),
+            encode=lambda plan: [asdict(highlight) for highlight in plan.highlights],
+            decode=lambda data: HighlightPlan(highlights=[Highlight(**highlight) for highlight in data]),
+        )
+        work.highlight_segments = _on_timeline(
+            [MediaSegment(start=h.start, end=h.end, caption=h.caption) for h in work.highlight_plan.highlights],
+            work.timeline,
+        )
+
+    render_tasks = _add_render_tasks(ctx, work)
+    ctx.graph.add(
+        f"{work.key}:manifests",
+        lambda: _write_input_manifests(ctx, work),
+        deps=render_tasks,
+        resource="io",
+    )
+
+
+def _add_render_tasks(ctx: _PipelineContext, work: _InputWork) -> List[str]:
+    """Add one render task per segment and variant so encodes spread over the render pool."""
 
-        chapter_segments = chapters_to_segments(chapter_plan.chapters)
+    options = ctx.options
+    assert work.probe is not None
+    renditions = [] if work.audio_output else select_renditions(options.renditions, work.probe)
+    task_names: List[str] = []
+    for variant in _RENDER_VARIANTS:
+        # Watermarks need pictures; audio-only renders have no branded variant.
+        if not ctx.stages.runs(variant.stage) or (variant.branded and work.audio_output):
+            continue
+        segments = work.highlight_segments if variant.highlights else work.chapter_segments
+        target_dir = getattr(work.export_ctx, variant.dir_attr)
+        work.rendered[variant.stage] = {}
         if options.dry_run:
-            chunk_outputs = plan_chunk_outputs(download.path, export_ctx.chapters_dir, chapter_segments)
-        else:
-            chunk_outputs = chunk_media(
-                download.path,
-                export_ctx.chapters_dir,
-                chapter_segments,
+            planned = plan_chunk_outputs(
+                work.download.path,
+                target_dir,
+                segments,
+                short_mode=variant.highlights,
+                renditions=[] if variant.highlights else renditions,
+                audio_output=work.audio_output,
             )
-        branded_chapters: List[ChunkOutput] = []
-        if brand:
-            if options.dry_run:
-                branded_chapters = plan_chunk_outputs(
-                    download.path, export_ctx.branded_chapters_dir, chapter_segments
-                )
-            else:
-                branded_chapters = chunk_media(
-                    download.path,
-                    export_ctx.branded_chapters_dir,
-                    chapter_segments,
-                    brand=brand,
+            work.rendered[variant.stage] = dict(enumerate(planned, start=1))
+            continue
+        for index, segment in enumerate(segments, start=1):
+            # Branded shorts wait for the plain render so they reuse its crop focus estimate.
+            plain = f"{work.key}:render_highlights-{index:03d}"
+            task_names.append(
+                ctx.graph.add(
+                    f"{work.key}:{variant.stage}-{index:03d}",
+                    _render_task(ctx, work, variant, target_dir, segment, index, renditions),
+                    deps=[plain if variant.stage == "branded_highlights" and plain in task_names else None],
+                    resource="render",
                 )
+            )
+    return task_names
 
-        highlight_plan: Optional[HighlightPlan] = None
-        highlight_outputs: List[ChunkOutput] = []
-        if options.highlights:
-            highlight_plan = score_highlights(transcript, probe.duration, options.highlight_policy)
-            highlight_segments = [
-                MediaSegment(start=h.start, end=h.end, caption=h.caption)
-                for h in highlight_plan.highlights
-            ]
-            if options.dry_run:
-                highlight_outputs = plan_chunk_outputs(
-                    download.path, export_ctx.highlights_dir, highlight_segments, short_mode=True
-                )
-            else:
-                highlight_outputs = chunk_media(
-                    download.path,
-                    export_ctx.highlights_dir,
-                    highlight_segments,
-                    short_mode=True,
-                )
-        branded_highlights: List[ChunkOutput] = []
-        if brand and highlight_plan:
-            highlight_segments = [
-                MediaSegment(start=h.start, end=h.end, caption=h.caption)
-                for h in highlight_plan.highlights
-            ]
-            if options.dry_run:
-                branded_highlights = plan_chunk_outputs(
-                    download.path, export_ctx.branded_highlights_dir, highlight_segments, short_mode=True
-                )
-            else:
-                branded_highlights = chunk_media(
-                    download.path,
-                    export_ctx.branded_highlights_dir,
-                    highlight_segments,
-                    brand=brand,
-                    short_mode=True,
-                )
 
-        write_highlights_manifest(export_ctx, highlight_plan, highlight_outputs)
+def _render_task(
+    ctx: _PipelineContext,
+    work: _InputWork,
+    variant: _RenderVariant,
+    target_dir: Path,
+    segment: MediaSegment,
+    index: int,
+    renditions: List[Rendition],
+) -> Callable[[], None]:
+    brand = ctx.brand if variant.branded else None
+    shorts_profile = ctx.shorts_profile if variant.highlights else None
+    ladder = [] if variant.highlights else renditions
 
-        write_assets_map(
-            export_ctx,
-            download,
-            chunk_outputs,
-            highlight_plan,
-            highlight_outputs,
-            branded_chapters=branded_chapters,
-            branded_highlights=branded_highlights,
+    def _render() -> None:
+        planned = plan_chunk_outputs(
+            work.download.path,
+            target_dir,
+            [segment],
+            short_mode=variant.highlights,
+            renditions=ladder,
+            audio_output=work.audio_output,
+            first_index=index,
+        )[0]
+        files = list(dict.fromkeys([planned.file, *planned.renditions.values(), planned.file.with_suffix(".srt")]))
+        name = f"{work.key}:{variant.stage}-{index:03d}"
+        meta = ctx.checkpoint.restore_artifact(name, files)
+        if meta is not None:
+            if segment.focus_x is None and meta.get("focus_x") is not None:
+                segment.focus_x = meta["focus_x"]
+            work.rendered[variant.stage][index] = planned
+            _deliver(ctx, work, variant.stage, files, duration=segment.end - segment.start)
+            return
+        if shorts_profile and shorts_profile.fit == "crop" and segment.focus_x is None:
+            # Estimated here (not in chunk_media) so the estimate is shared and the render key stays stable.
+            segment.focus_x = ctx.cache.memo(
+                "focus",
+                {"source": work.source_fp, "span": list(segment.source_span)},
+                lambda: estimate_focus_x(work.download.path, *segment.source_span),
+            )
+        work.download.ensure_unchanged()
+        chunk_media(
+            work.download.path,
+            target_dir,
+            [segment],
+            brand=brand,
+            short_mode=variant.highlights,
+            shorts_profile=shorts_profile,
+            renditions=ladder,
+            audio_filter=work.audio_filter,
+            audio_output=work.audio_output,
+            first_index=index,
+            render_cache=ctx.render_cache,
+            has_audio=work.probe is None or "audio" in work.probe.streams,
+        )
+        ctx.checkpoint.record_artifact(
+            name, files, duration=segment.end - segment.start, meta={"focus_x": segment.focus_x}
         )
+        work.rendered[variant.stage][index] = planned
+        _deliver(ctx, work, variant.stage, files, duration=segment.end - segment.start)
 
-        provenance_path = export_ctx.manifests_dir / "provenance.json"
-        provenance_data = {
-            "source": download.source,
-            "license": download.license_info.to_dict(),
-            "retrieved_at": download.retrieved_at.isoformat(),
-            "original_filename": download.original_name,
-        }
-        dump_json(provenance_data, provenance_path)
+    return _render
 
-    if credits_builder:
-        credits_path = export_ctx.manifests_dir / "CREDITS.md"
-        credits_path.write_text(credits_builder.render_markdown(), encoding="utf-8")
-        dump_json(credits_builder.to_dict(), export_ctx.manifests_dir / "credits.json")
-    else:
-        dump_json({"entries": []}, export_ctx.manifests_dir / "credits.json")
 
-    summary_path = export_ctx.manifests_dir / "summary.md"
-    summary_path.write_text(_render_summary(transcripts), encoding="utf-8")
-    dump_json(
+def _deliver(
+    ctx: _PipelineContext, work: _InputWork, kind: str, files: List[Path], *, duration: Optional[float] = None
+) -> None:
+    """Hand finished files to the delivery archive and the job catalog."""
+
+    if ctx.archive is not None:
+        ctx.archive.add(files)
+    if ctx.catalog is not None:
+        ctx.catalog.add_assets(ctx.options.job_id, work.key, kind, files, duration=duration)
+
+
+def _memo_stage(
+    ctx: _PipelineContext,
+    work: _InputWork,
+    stage: str,
+    inputs: dict,
+    compute: Callable[[], Any],
+    *,
+    encode: Callable[[Any], Any] = lambda value: value,
+    decode: Callable[[Any], Any] = lambda data: data,
+) -> Any:
+    """Resume from this job's checkpoint, else the shared stage cache, else compute."""
+
+    return ctx.checkpoint.memo(
+        f"{work.key}:{stage}",
+        lambda: ctx.cache.memo(stage, inputs, compute, encode=encode, decode=decode),
+        encode=encode,
+        decode=decode,
+    )
+
+
+def _cache_summary(ctx: _PipelineContext) -> Dict[str, Dict[str, int]]:
+    summary = ctx.cache.summary()
+    if ctx.render_cache is not None:
+        summary["render"] = ctx.render_cache.summary()
+    return summary
+
+
+def _write_input_manifests(ctx: _PipelineContext, work: _InputWork) -> None:
+    export_ctx = work.export_ctx
+    highlight_outputs = work.outputs("render_highlights")
+    if ctx.stages.runs("highlight_plan"):
+        write_highlights_manifest(export_ctx, work.highlight_plan, highlight_outputs, writer=ctx.manifests)
+
+    write_assets_map(
+        export_ctx,
+        work.download,
+        work.outputs("render_chapters"),
+        work.highlight_plan,
+        highlight_outputs,
+        branded_chapters=work.outputs("branded_chapters"),
+        branded_highlights=work.outputs("branded_highlights"),
+        writer=ctx.manifests,
+    )
+
+    provenance_path = export_ctx.manifests_dir / "provenance.json"
+    provenance_data = {
+        "source": work.download.source,
+        "license": work.download.license_info.to_dict(),
+        "retrieved_at": work.download.retrieved_at.isoformat(),
+        "original_filename": work.download.original_name,
+        "ingest": {
+            "method": work.download.ingest_method,
+            "path": str(work.download.path),
+            "fingerprint": work.download.fingerprint,
+        },
+    }
+    ctx.manifests.stage(provenance_data, provenance_path)
+
+
+def _build_trim_timeline(ctx: _PipelineContext, work: _InputWork) -> TrimTimeline:
+    assert work.probe is not None
+    source, duration, export_ctx = work.download.path, work.probe.duration, work.export_ctx
+    policy = SilencePolicy()
+    silences = _memo_stage(
+        ctx,
+        work,
+        "silences",
+        {"source": work.source_fp, "policy": asdict(policy), "duration": duration},
+        lambda: detect_silences(source, policy, duration, cache_dir=export_ctx.cache_dir),
+        decode=lambda data: [(start, end) for start, end in data],
+    )
+    timeline = TrimTimeline(build_keep_intervals(duration, silences, policy))
+    ctx.manifests.stage(
         {
-            "job_id": options.job_id,
-            "template": options.template,
-            "dry_run": options.dry_run,
-            "inputs": [item.value for item in options.inputs],
+            "policy": asdict(policy),
+            "source_duration": duration,
+            "silences": [[start, end] for start, end in silences],
+            **timeline.to_dict(),
         },
-        export_ctx.manifests_dir / "job.json",
+        export_ctx.manifests_dir / "edit_decisions.json",
     )
+    job_logger().info(
+        "silence_trimmed",
+        extra={"removed_seconds": round(duration - timeline.duration, 3), "pieces": len(timeline.keep)},
+    )
+    return timeline
 
-    job_logger().info("job_completed", extra={"outputs": str(export_ctx.root)})
+
+def _on_timeline(segments: List[MediaSegment], timeline: Optional[TrimTimeline]) -> List[MediaSegment]:
+    if timeline is None:
+        return segments
+    return [timeline.segment(segment.start, segment.end, segment.caption) for segment in segments]
 
 
 def _render_summary(transcripts: List[TranscriptResult]) -> str:
@@ -0,0 +1,325 @@
+"""Acoustic fingerprints that recognise the same recording across re-encodes."""
+from __future__ import annotations
+
+import sqlite3
+import subprocess
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..stt.transcribe import TranscriptResult, TranscriptSegment
+from .ffmpeg_ops import FFmpegError
+
+
+SAMPLE_RATE = 8000
+FRAME_SIZE = 1024
+HOP_SIZE = 512
+# Frequency bands (rfft bins at 8 kHz: ~7.8 Hz each); the loudest bin of each is a candidate peak.
+BANDS = ((10, 20), (20, 40), (40, 80), (80, 160), (160, 320), (320, 512))
+# Each anchor peak is paired with the next FAN_OUT peaks up to MAX_DELTA frames later.
+FAN_OUT = 3
+MAX_DELTA = 63
+# A match needs this many hashes agreeing on one offset, and this share of the query.
+MIN_MATCHES = 20
+MIN_MATCH_RATIO = 0.05
+# Lookups use an evenly spaced subset of the query hashes; plenty to find a full-length duplicate.
+QUERY_SAMPLE = 20000
+_CHUNK_FRAMES = 4096
+# PCM is hashed in blocks of this many bytes (one FFT chunk of frames), so memory does not grow with duration.
+_BLOCK_BYTES = _CHUNK_FRAMES * HOP_SIZE * 2
+# Bumped when the index layout changes; older indexes drop their hashes and refill as jobs run.
+_SCHEMA_VERSION = 2
+
+
+@dataclass
+class AcousticPrint:
+    """Landmark hashes ``(hash, frame)`` of one recording, frames of ``HOP_SIZE / SAMPLE_RATE`` seconds."""
+
+    hashes: List[Tuple[int, int]]
+    duration: float
+
+
+@dataclass
+class AcousticMatch:
+    """An indexed recording that contains the query; ``offset`` is where the query starts in it."""
+
+    recording: str
+    offset: float
+    score: int
+    duration: float
+
+
+def numpy_available() -> bool:
+    try:
+        import numpy  # type: ignore  # noqa: F401
+    except Exception:  # pragma: no cover - optional dependency
+        return False
+    return True
+
+
+def acoustic_fingerprint(source: Path) -> AcousticPrint:
+    """Decode ``source`` to 8 kHz mono and hash its spectral peaks (needs NumPy and ffmpeg).
+
+    The decode is read from ffmpeg's stdout block by block and hashed as it
+    arrives, so a long recording never sits in memory as raw samples.
+    """
+
+    args = [
+        "ffmpeg",
+        "-hide_banner",
+        "-v",
+        "error",
+        "-i",
+        str(source),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "-",
+    ]
+    hasher = _LandmarkHasher()
+    try:
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as exc:  # pragma: no cover - depends on external binary
+        raise FFmpegError(f"ffmpeg command failed: {' '.join(args)}\n{exc}") from exc
+    with process:
+        assert process.stdout is not None and process.stderr is not None
+        while True:
+            block = process.stdout.read(_BLOCK_BYTES)
+            if not block:
+                break
+            hasher.feed(block)
+        stderr = process.stderr.read()
+    if process.returncode:  # pragma: no cover - depends on external binary
+        raise FFmpegError(f"ffmpeg command failed: {' '.join(args)}\n{stderr.decode('utf-8', 'replace')}")
+    return hasher.finish()
+
+
+def hashes_from_pcm(raw: bytes) -> AcousticPrint:
+    """Landmark hashes from signed 16-bit mono PCM at ``SAMPLE_RATE``.
+
+    Every frame contributes the loudest bin of each band that stands above the
+    frame's average band peak; each such peak is paired with the next
+    ``FAN_OUT`` peaks and the pair ``(f1, f2, dt)`` packed into one integer.
+    Pairs survive bitrate and container changes because they only depend on
+    where the strongest frequencies sit relative to each other.
+    """
+
+    hasher = _LandmarkHasher()
+    view = memoryview(raw)
+    for offset in range(0, len(view), _BLOCK_BYTES):
+        hasher.feed(view[offset : offset + _BLOCK_BYTES])
+    return hasher.finish()
+
+
+class _LandmarkHasher:
+    """Incremental :func:`hashes_from_pcm`: PCM goes in block by block, hashes come out as peaks settle.
+
+    Consecutive blocks overlap by the samples of one unfinished frame, so the
+    frames, peaks and hashes are exactly those of the whole signal at once. An
+    anchor peak is paired as soon as every frame within ``MAX_DELTA`` of it
+    has been seen.
+    """
+
+    def __init__(self) -> None:
+        import numpy as np  # type: ignore
+
+        self._np = np
+        self._window = np.hanning(FRAME_SIZE).astype(np.float32)
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._odd = b""
+        self._frames = 0  # frames analysed so far
+        self._samples = 0
+        self._peaks: List[Tuple[int, int]] = []
+        self.hashes: List[Tuple[int, int]] = []
+
+    def feed(self, raw: bytes) -> None:
+        np = self._np
+        if self._odd:
+            raw = self._odd + bytes(raw)
+        even = len(raw) // 2 * 2
+        self._odd = bytes(raw[even:])
+        block = np.frombuffer(raw[:even], dtype="<i2").astype(np.float32) / 32768.0
+        self._samples += len(block)
+        samples = np.concatenate([self._tail, block]) if len(self._tail) else block
+        if len(samples) >= FRAME_SIZE:
+            count = (len(samples) - FRAME_SIZE) // HOP_SIZE + 1
+            frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE][:count]
+            self._find_peaks(frames)
+            samples = samples[count * HOP_SIZE :]
+        self._tail = samples.copy()
+        self._pair(final=False)
+
+    def finish(self) -> AcousticPrint:
+        duration = self._samples / SAMPLE_RATE
+        if self._samples < FRAME_SIZE * 2:
+            return AcousticPrint(hashes=[], duration=duration)
+        self._pair(final=True)
+        return AcousticPrint(hashes=self.hashes, duration=duration)
+
+    def _find_peaks(self, frames) -> None:
+        np = self._np
+        for first in range(0, len(frames), _CHUNK_FRAMES):
+            spectrum = np.abs(np.fft.rfft(frames[first : first + _CHUNK_FRAMES] * self._window, axis=1))
+            bins = np.stack([low + np.argmax(spectrum[:, low:high], axis=1) for low, high in BANDS], axis=1)
+            levels = np.take_along_axis(spectrum, bins, axis=1)
+            keep = (levels > levels.mean(axis=1, keepdims=True)) & (levels > 1e-2)
+            for row, column in zip(*np.nonzero(keep)):
+                self._peaks.append((self._frames + first + int(row), int(bins[row, column])))
+        self._frames += len(frames)
+
+    def _pair(self, *, final: bool) -> None:
+        peaks, paired_anchors = self._peaks, 0
+        for index, (frame, freq) in enumerate(peaks):
+            if not final and frame + MAX_DELTA >= self._frames:
+                break
+            paired, other = 0, index + 1
+            while other < len(peaks) and paired < FAN_OUT:
+                other_frame, other_freq = peaks[other]
+                delta = other_frame - frame
+                if delta > MAX_DELTA:
+                    break
+                if delta > 0:
+                    self.hashes.append(((freq << 16) | (other_freq << 6) | delta, frame))
+                    paired += 1
+                other += 1
+            paired_anchors = index + 1
+        del peaks[:paired_anchors]
+
+
+class AcousticIndex:
+    """SQLite inverted index of landmark hashes, plus the transcripts made for each recording.
+
+    Lookups walk the B-tree on ``hash`` for each query hash, so the cost grows
+    with the query and the number of postings per hash, not with the size of
+    the library. The best recording is the one with the most hashes agreeing
+    on a single time offset. Postings refer to recordings by integer rowid, so
+    each row stays three small integers however long the recording keys are.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS hashes")
+                conn.execute("DROP TABLE IF EXISTS recordings")
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS recordings (
+                    id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, duration REAL, added_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS hashes (
+                    hash INTEGER NOT NULL, recording INTEGER NOT NULL, frame INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS hashes_by_value ON hashes (hash);
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    recording TEXT NOT NULL, variant TEXT NOT NULL, data TEXT NOT NULL,
+                    PRIMARY KEY (recording, variant)
+                );
+                """
+            )
+
+    def add(self, recording: str, fingerprint: AcousticPrint) -> None:
+        added_at = datetime.utcnow().isoformat()
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT id FROM recordings WHERE key = ?", (recording,)).fetchone()
+            if row is None:
+                rowid = conn.execute(
+                    "INSERT INTO recordings (key, duration, added_at) VALUES (?, ?, ?)",
+                    (recording, fingerprint.duration, added_at),
+                ).lastrowid
+            else:
+                rowid = row[0]
+                conn.execute("DELETE FROM hashes WHERE recording = ?", (rowid,))
+                conn.execute(
+                    "UPDATE recordings SET duration = ?, added_at = ? WHERE id = ?",
+                    (fingerprint.duration, added_at, rowid),
+                )
+            conn.executemany(
+                "INSERT INTO hashes (hash, recording, frame) VALUES (?, ?, ?)",
+                ((value, rowid, frame) for value, frame in fingerprint.hashes),
+            )
+
+    def match(self, fingerprint: AcousticPrint, *, exclude: Optional[str] = None) -> Optional[AcousticMatch]:
+        """The indexed recording that contains all of ``fingerprint``, if any."""
+
+        query = fingerprint.hashes
+        if len(query) > QUERY_SAMPLE:
+            step = len(query) / QUERY_SAMPLE
+            query = [query[int(index * step)] for index in range(QUERY_SAMPLE)]
+        if not query:
+            return None
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute("CREATE TEMP TABLE probe (hash INTEGER, frame INTEGER)")
+            conn.executemany("INSERT INTO probe (hash, frame) VALUES (?, ?)", query)
+            row = conn.execute(
+                """
+                SELECT r.key, h.frame - q.frame AS delta, COUNT(*) AS score, r.duration
+                FROM probe q
+                JOIN hashes h ON h.hash = q.hash
+                JOIN recordings r ON r.id = h.recording
+                WHERE r.key != ?
+                GROUP BY h.recording, delta
+                ORDER BY score DESC
+                LIMIT 1
+                """,
+                (exclude or "",),
+            ).fetchone()
+        if row is None:
+            return None
+        recording, delta, score, duration = row
+        if score < max(MIN_MATCHES, MIN_MATCH_RATIO * len(query)):
+            return None
+        offset = delta * HOP_SIZE / SAMPLE_RATE
+        # Reuse needs the query inside the indexed recording (a frame of slack at either end).
+        slack = FRAME_SIZE / SAMPLE_RATE
+        if offset < -slack or offset + fingerprint.duration > duration + slack:
+            return None
+        return AcousticMatch(recording=recording, offset=max(offset, 0.0), score=score, duration=duration)
+
+    def store_transcript(self, recording: str, variant: str, data: str) -> None:
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts (recording, variant, data) VALUES (?, ?, ?)",
+                (recording, variant, data),
+            )
+
+    def transcript(self, recording: str, variant: str) -> Optional[str]:
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT data FROM transcripts WHERE recording = ? AND variant = ?", (recording, variant)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0)
+
+
+def shift_transcript(transcript: TranscriptResult, offset: float, duration: float) -> TranscriptResult:
+    """Cut ``[offset, offset + duration]`` out of ``transcript`` and move it to start at zero."""
+
+    segments: List[TranscriptSegment] = []
+    for segment in transcript.segments:
+        start, end = segment.start - offset, segment.end - offset
+        if end <= 0.0 or start >= duration:
+            continue
+        segments.append(
+            TranscriptSegment(
+                id=len(segments),
+                start=round(max(start, 0.0), 3),
+                end=round(min(end, duration), 3),
+                text=segment.text,
+                speaker=segment.speaker,
+            )
+        )
+    return TranscriptResult(language=transcript.language, segments=segments)
@@ -1,15 +1,19 @@
 """ffmpeg helper wrappers."""
 from __future__ import annotations
 
+import hashlib
 import json
+import math
+import os
 import shutil
 import subprocess
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from ..branding.theme import BrandTheme
 from ..util.errors import CreatorPackError, ExitCodes
+from .render_cache import RenderCache
 
 
 class FFmpegError(CreatorPackError):
@@ -18,12 +22,50 @@ class FFmpegError(CreatorPackError):
     exit_code = ExitCodes.MEDIA_ERROR
 
 
+@dataclass
+class LoudnessTarget:
+    """EBU R128 normalization target passed to ``loudnorm``."""
+
+    integrated: float = -16.0
+    true_peak: float = -1.5
+    lra: float = 11.0
+
+
+@dataclass
+class LoudnessMeasurement:
+    """First-pass ``loudnorm`` statistics for a whole source."""
+
+    target: LoudnessTarget
+    input_i: float
+    input_tp: float
+    input_lra: float
+    input_thresh: float
+    target_offset: float
+
+    def filter(self) -> str:
+        """Second-pass filter that applies the measured values without re-analysis."""
+
+        return (
+            f"loudnorm=I={self.target.integrated}:TP={self.target.true_peak}:LRA={self.target.lra}:"
+            f"measured_I={self.input_i}:measured_TP={self.input_tp}:measured_LRA={self.input_lra}:"
+            f"measured_thresh={self.input_thresh}:offset={self.target_offset}:linear=true"
+        )
+
+
 @dataclass
 class MediaProbe:
     """Minimal probe information about a media file."""
 
     duration: float
     streams: List[str]
+    width: int = 0
+    height: int = 0
+    loudness: Optional[LoudnessMeasurement] = None
+    audio_codec: str = ""
+
+    @property
+    def has_video(self) -> bool:
+        return "video" in self.streams
 
 
 def ensure_ffmpeg_available() -> None:
@@ -34,23 +76,111 @@ def ensure_ffmpeg_available() -> None:
             raise FFmpegError(f"Required binary '{binary}' not found in PATH")
 
 
-def _run_command(args: Sequence[str]) -> subprocess.CompletedProcess[str]:
+def _run_command(args: Sequence[str], *, binary: bool = False) -> subprocess.CompletedProcess:
     try:
         return subprocess.run(
             args,
             check=True,
             capture_output=True,
-            text=True,
+            text=not binary,
         )
     except subprocess.CalledProcessError as exc:  # pragma: no cover - depends on external binary
         joined = ' '.join(args)
-        message = "ffmpeg command failed: {}\n{}".format(joined, exc.stderr)
+        stderr = exc.stderr.decode("utf-8", "replace") if isinstance(exc.stderr, bytes) else exc.stderr
+        message = "ffmpeg command failed: {}\n{}".format(joined, stderr)
         raise FFmpegError(message) from exc
 
 
-def probe_media(path: Path) -> MediaProbe:
-    """Return duration and stream summary for the provided media."""
+def probe_media(
+    path: Path,
+    *,
+    loudness_target: LoudnessTarget | None = None,
+    cache_dir: Path | None = None,
+) -> MediaProbe:
+    """Return duration and stream summary for the provided media.
+
+    With ``loudness_target`` the whole source audio is measured once and the
+    result travels with the probe. With ``cache_dir`` the probe (including the
+    loudness pass) is reused for as long as the file is unchanged.
+    """
+
+    params = {"loudness": asdict(loudness_target) if loudness_target else None}
+    cache_path = _source_cache_path(path, "probe", params, cache_dir) if cache_dir else None
+    if cache_path and cache_path.exists():
+        return probe_from_dict(json.loads(cache_path.read_text(encoding="utf-8")))
+
+    probe = _probe_streams(path)
+    if loudness_target and "audio" in probe.streams:
+        probe.loudness = measure_loudness(path, loudness_target)
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(asdict(probe)), encoding="utf-8")
+    return probe
+
+
+def measure_loudness(path: Path, target: LoudnessTarget) -> LoudnessMeasurement | None:
+    """Run a single ``loudnorm`` analysis pass over the full source audio."""
 
+    args = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        str(path),
+        "-vn",
+        "-af",
+        f"loudnorm=I={target.integrated}:TP={target.true_peak}:LRA={target.lra}:print_format=json",
+        "-f",
+        "null",
+        "-",
+    ]
+    result = _run_command(args)
+    return _parse_loudnorm_stats(result.stderr, target)
+
+
+def _parse_loudnorm_stats(stderr: str, target: LoudnessTarget) -> LoudnessMeasurement | None:
+    start, end = stderr.rfind("{"), stderr.rfind("}")
+    if start == -1 or end < start:
+        return None
+    stats = json.loads(stderr[start : end + 1])
+    try:
+        values = [
+            float(stats[key])
+            for key in ("input_i", "input_tp", "input_lra", "input_thresh", "target_offset")
+        ]
+    except (KeyError, ValueError):
+        return None
+    if not all(math.isfinite(value) for value in values):
+        # Silent sources measure as -inf; linear normalization is meaningless there.
+        return None
+    return LoudnessMeasurement(target, *values)
+
+
+def _source_cache_path(path: Path, kind: str, params: dict, cache_dir: Path) -> Path:
+    """Cache file for a whole-source analysis, invalidated when the file changes."""
+
+    stat = path.stat()
+    key = json.dumps(
+        {
+            "path": str(path.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "params": params,
+        },
+        sort_keys=True,
+    )
+    return cache_dir / f"{kind}-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def probe_from_dict(data: dict) -> MediaProbe:
+    loudness = data.get("loudness")
+    if loudness:
+        target = LoudnessTarget(**loudness.pop("target"))
+        data["loudness"] = LoudnessMeasurement(target=target, **loudness)
+    return MediaProbe(**data)
+
+
+def _probe_streams(path: Path) -> MediaProbe:
     args = [
         "ffprobe",
         "-v",
@@ -64,8 +194,51 @@ def probe_media(path: Path) -> MediaProbe:
     result = _run_command(args)
     payload = json.loads(result.stdout)
     duration = float(payload.get("format", {}).get("duration", 0.0))
-    streams = [stream.get("codec_type", "unknown") for stream in payload.get("streams", [])]
-    return MediaProbe(duration=duration, streams=streams)
+    streams = [_stream_kind(stream) for stream in payload.get("streams", [])]
+    video = next((stream for stream in payload.get("streams", []) if _stream_kind(stream) == "video"), {})
+    audio = next((stream for stream in payload.get("streams", []) if stream.get("codec_type") == "audio"), {})
+    return MediaProbe(
+        duration=duration,
+        streams=streams,
+        width=int(video.get("width", 0) or 0),
+        height=int(video.get("height", 0) or 0),
+        audio_codec=audio.get("codec_name", ""),
+    )
+
+
+def _stream_kind(stream: dict) -> str:
+    # Embedded cover art is reported as a video stream; it must not force a video render.
+    if stream.get("codec_type") == "video" and stream.get("disposition", {}).get("attached_pic"):
+        return "cover"
+    return stream.get("codec_type", "unknown")
+
+
+def parse_rendition_ladder(spec: str) -> List["Rendition"]:
+    """Parse a comma separated ladder such as ``1080p,720p,480p``; repeated rungs are kept once."""
+
+    heights: Set[int] = set()
+    for item in spec.split(","):
+        name = item.strip().lower()
+        if not name:
+            continue
+        if not name.endswith("p") or not name[:-1].isdigit() or int(name[:-1]) < 144:
+            raise CreatorPackError(f"Invalid rendition '{item.strip()}'. Use values like 1080p,720p,480p.")
+        heights.add(int(name[:-1]))
+    return [Rendition(name=f"{height}p", height=height) for height in sorted(heights, reverse=True)]
+
+
+def select_renditions(ladder: Sequence["Rendition"], probe: MediaProbe) -> List["Rendition"]:
+    """Drop ladder rungs that would upscale the source, keeping at least the smallest rung."""
+
+    if not probe.has_video:
+        return []
+    short_side = min(probe.width, probe.height)
+    if short_side <= 0:
+        return list(ladder)
+    selected = [rendition for rendition in ladder if rendition.height <= short_side]
+    if not selected and ladder:
+        selected = [min(ladder, key=lambda rendition: rendition.height)]
+    return selected
 
 
 def chunk_media(
@@ -75,37 +248,132 @@ def chunk_media(
     *,
     brand: BrandTheme | None = None,
     short_mode: bool = False,
+    shorts_profile: "ShortsProfile | None" = None,
+    renditions: Sequence["Rendition"] = (),
+    audio_filter: str | None = None,
+    audio_output: "AudioOutput | None" = None,
+    first_index: int = 1,
+    render_cache: RenderCache | None = None,
+    has_audio: bool = True,
 ) -> List["ChunkOutput"]:
-    """Cut a media file into smaller segments."""
+    """Cut a media file into smaller segments.
+
+    When ``shorts_profile`` is given the vertical reframe (crop or pad, scale and
+    safe-area watermark placement) is applied in the same ffmpeg pass as the cut.
+    Crop focus estimates are stored on each segment so later variants reuse them.
+    ffmpeg writes into ``<target_dir>/.partial/`` and each file is renamed into
+    place only after its encode succeeded, so a crash never leaves a truncated
+    clip under its final name.
+    With ``renditions`` each segment is decoded once and every rung of the ladder
+    is encoded by the same ffmpeg process. ``audio_filter`` (for example the
+    whole-source ``loudnorm`` from :class:`LoudnessMeasurement`) is applied to
+    every encode. ``audio_output`` switches to audio-only files, stream-copied
+    when the source codec already fits the container; video options are ignored.
+    With ``render_cache`` every ffmpeg invocation is looked up by its arguments
+    first and identical renders from earlier jobs are linked in instead.
+    ``has_audio=False`` (from the probe) builds jump-cut graphs for video only.
+    """
 
     target_dir.mkdir(parents=True, exist_ok=True)
     outputs: List[ChunkOutput] = []
-    for index, segment in enumerate(segments, start=1):
+    for index, segment in enumerate(segments, start=first_index):
         suffix = "short" if short_mode else "part"
-        out_name = f"{source.stem}_{suffix}-{index:03d}.mp4"
+        extension = audio_output.extension if audio_output else ".mp4"
+        out_name = f"{source.stem}_{suffix}-{index:03d}{extension}"
         dest = target_dir / out_name
-        _execute_cut(source, dest, segment.start, segment.end, brand=brand)
-        _write_srt(dest.with_suffix('.srt'), segment)
-        outputs.append(ChunkOutput(file=dest, start=segment.start, end=segment.end))
+        if audio_output:
+            _execute_audio_cut(
+                source,
+                _partial_path(dest),
+                segment.start,
+                segment.end,
+                audio_output,
+                audio_filter=audio_filter,
+                pieces=segment.pieces,
+                cache=render_cache,
+            )
+            _commit_partials([dest])
+            _write_srt(dest.with_suffix('.srt'), segment)
+            outputs.append(_chunk_output(dest, segment, []))
+            continue
+        targets = _rendition_targets(dest, renditions)
+        if shorts_profile and shorts_profile.fit == "crop" and segment.focus_x is None:
+            from .reframe import estimate_focus_x
+
+            segment.focus_x = estimate_focus_x(source, *segment.source_span)
+        _execute_cut(
+            source,
+            _partial_path(dest),
+            segment.start,
+            segment.end,
+            brand=brand,
+            profile=shorts_profile,
+            focus_x=segment.focus_x,
+            renditions=[(rendition, _partial_path(path)) for rendition, path in targets],
+            audio_filter=audio_filter,
+            pieces=segment.pieces,
+            cache=render_cache,
+            has_audio=has_audio,
+        )
+        _commit_partials([path for _, path in targets] or [dest])
+        primary = targets[0][1] if targets else dest
+        _write_srt(primary.with_suffix('.srt'), segment)
+        outputs.append(_chunk_output(primary, segment, targets))
     return outputs
 
 
+def _partial_path(path: Path) -> Path:
+    partial = path.parent / ".partial" / path.name
+    partial.parent.mkdir(parents=True, exist_ok=True)
+    return partial
+
+
+def _commit_partials(paths: Sequence[Path]) -> None:
+    for path in paths:
+        partial = path.parent / ".partial" / path.name
+        if partial.exists():
+            os.replace(partial, path)
+
+
 def plan_chunk_outputs(
     source: Path,
     target_dir: Path,
     segments: Iterable["MediaSegment"],
     *,
     short_mode: bool = False,
+    renditions: Sequence["Rendition"] = (),
+    audio_output: "AudioOutput | None" = None,
+    first_index: int = 1,
 ) -> List["ChunkOutput"]:
     outputs: List[ChunkOutput] = []
-    for index, segment in enumerate(segments, start=1):
+    for index, segment in enumerate(segments, start=first_index):
         suffix = "short" if short_mode else "part"
-        out_name = f"{source.stem}_{suffix}-{index:03d}.mp4"
+        extension = audio_output.extension if audio_output else ".mp4"
+        out_name = f"{source.stem}_{suffix}-{index:03d}{extension}"
         dest = target_dir / out_name
-        outputs.append(ChunkOutput(file=dest, start=segment.start, end=segment.end))
+        targets = [] if audio_output else _rendition_targets(dest, renditions)
+        outputs.append(_chunk_output(targets[0][1] if targets else dest, segment, targets))
     return outputs
 
 
+def _rendition_targets(dest: Path, renditions: Sequence["Rendition"]) -> List[Tuple["Rendition", Path]]:
+    return [
+        (rendition, dest.with_name(f"{dest.stem}_{rendition.name}{dest.suffix}"))
+        for rendition in renditions
+    ]
+
+
+def _chunk_output(
+    primary: Path, segment: "MediaSegment", targets: Sequence[Tuple["Rendition", Path]]
+) -> "ChunkOutput":
+    return ChunkOutput(
+        file=primary,
+        start=segment.start,
+        end=segment.end,
+        renditions={rendition.name: path for rendition, path in targets},
+    )
+
+
 @dataclass
 class MediaSegment:
     """Represents a segment boundary for cutting media."""
@@ -113,6 +381,56 @@ class MediaSegment:
     start: float
     end: float
     caption: str | None = None
+    focus_x: float | None = None
+    pieces: List[Tuple[float, float]] | None = None
+
+    @property
+    def source_span(self) -> Tuple[float, float]:
+        """Source-time bounds; differs from start/end when the segment lives on a trimmed timeline."""
+
+        if self.pieces:
+            return self.pieces[0][0], self.pieces[-1][1]
+        return self.start, self.end
+
+
+@dataclass
+class ShortsProfile:
+    """Vertical (9:16) render settings for highlight shorts."""
+
+    width: int = 1080
+    height: int = 1920
+    fit: str = "crop"
+
+
+@dataclass
+class Rendition:
+    """One rung of an output ladder, sized by the short side of the frame."""
+
+    name: str
+    height: int
+
+
+# container -> (codec that can be stream-copied into it, encoder args)
+_AUDIO_CONTAINERS = {
+    "m4a": ("aac", ["-c:a", "aac", "-b:a", "160k", "-movflags", "+faststart"]),
+    "opus": ("opus", ["-c:a", "libopus", "-b:a", "96k"]),
+}
+
+
+@dataclass
+class AudioOutput:
+    """Audio-only render settings for sources without video or audio deliverables."""
+
+    container: str = "m4a"
+    source_codec: str = ""
+
+    @property
+    def extension(self) -> str:
+        return f".{self.container}"
+
+    @property
+    def can_copy(self) -> bool:
+        return _AUDIO_CONTAINERS[self.container][0] == self.source_codec
 
 
 @dataclass
@@ -122,6 +440,10 @@ class ChunkOutput:
     file: Path
     start: float
     end: float
+    renditions: Dict[str, Path] = field(default_factory=dict)
+
+
+_ENCODE_ARGS = ["-c:v", "libx264", "-preset", "veryfast", "-c:a", "aac", "-movflags", "+faststart"]
 
 
 def _execute_cut(
@@ -131,34 +453,213 @@ def _execute_cut(
     end: float,
     *,
     brand: BrandTheme | None = None,
+    profile: ShortsProfile | None = None,
+    focus_x: float | None = None,
+    renditions: Sequence[Tuple[Rendition, Path]] = (),
+    audio_filter: str | None = None,
+    pieces: Sequence[Tuple[float, float]] | None = None,
+    cache: RenderCache | None = None,
+    has_audio: bool = True,
 ) -> None:
+    if pieces:
+        start, end = pieces[0][0], pieces[-1][1]
     duration = max(end - start, 0.1)
+    # -t is an input option so it bounds the single decode shared by every output.
     args = [
         "ffmpeg",
         "-hide_banner",
         "-y",
         "-ss",
         f"{start:.3f}",
-        "-i",
-        str(source),
         "-t",
         f"{duration:.3f}",
+        "-i",
+        str(source),
     ]
 
-    if brand and brand.watermark_path:
-        filter_complex = (
-            "movie='{wm}',scale=iw*{scale}:ih*{scale},format=rgba,"
-            "colorchannelmixer=aa={opacity}[wm];[0:v][wm]overlay={pos}".format(
-                wm=brand.watermark_path.as_posix(),
-                scale=brand.watermark_scale,
-                opacity=brand.watermark_opacity,
-                pos=brand.watermark_position,
+    graphs: List[str] = []
+    video_in, audio_out = "[0:v]", "0:a?"
+    # loudnorm resamples to 192 kHz internally, so pin the delivery rate.
+    audio_args = ["-af", audio_filter, "-ar", "48000"] if audio_filter else []
+    if pieces:
+        # Jump cuts: every kept piece is trimmed from one decode and joined by a single concat.
+        graphs.append(_concat_graph(pieces, offset=start, audio_filter=audio_filter, audio=has_audio))
+        video_in, audio_out = "[vc]", "[ac]" if has_audio else None
+        audio_args = ["-ar", "48000"] if audio_filter and has_audio else []
+
+    base = _build_filter_graph(brand=brand, profile=profile, focus_x=focus_x, source=video_in)
+    if renditions:
+        graphs.append(_ladder_graph(base, [rendition for rendition, _ in renditions], source=video_in))
+        audio_maps: List[str | None] = [audio_out] * len(renditions)
+        if pieces and audio_out:
+            audio_maps = [f"[as{index}]" for index in range(len(renditions))]
+            graphs.append(f"{audio_out}asplit={len(renditions)}{''.join(audio_maps)}")
+        args.extend(["-filter_complex", ";".join(graphs)])
+        for index, (_, path) in enumerate(renditions):
+            args.extend(["-map", f"[v{index}]"])
+            if audio_maps[index]:
+                args.extend(["-map", audio_maps[index]])
+            args.extend(audio_args)
+            args.extend(_ENCODE_ARGS)
+            args.append(str(path))
+        _run_render(args, [path for _, path in renditions], cache)
+        return
+
+    if pieces:
+        video_out = video_in
+        if base:
+            graphs.append(f"{base}[vout]")
+            video_out = "[vout]"
+        args.extend(["-filter_complex", ";".join(graphs), "-map", video_out])
+        if audio_out:
+            args.extend(["-map", audio_out])
+    elif base:
+        args.extend(["-filter_complex", base])
+
+    args.extend(audio_args)
+    args.extend(_ENCODE_ARGS)
+    args.append(str(destination))
+    _run_render(args, [destination], cache)
+
+
+def _execute_audio_cut(
+    source: Path,
+    destination: Path,
+    start: float,
+    end: float,
+    audio_output: AudioOutput,
+    *,
+    audio_filter: str | None = None,
+    pieces: Sequence[Tuple[float, float]] | None = None,
+    cache: RenderCache | None = None,
+) -> None:
+    if pieces:
+        start, end = pieces[0][0], pieces[-1][1]
+    duration = max(end - start, 0.1)
+    args = ["ffmpeg", "-hide_banner", "-y", "-ss", f"{start:.3f}", "-t", f"{duration:.3f}", "-i", str(source), "-vn"]
+    _, encode_args = _AUDIO_CONTAINERS[audio_output.container]
+    if pieces:
+        args.extend(["-filter_complex", _audio_concat_graph(pieces, offset=start, audio_filter=audio_filter)])
+        args.extend(["-map", "[ac]"])
+    elif audio_filter:
+        args.extend(["-af", audio_filter])
+    if audio_filter:
+        args.extend(["-ar", "48000"])
+    if audio_output.can_copy and not pieces and not audio_filter:
+        # Untouched audio in a matching container: remux only, no decode or encode.
+        args.extend(["-c:a", "copy"])
+        if audio_output.container == "m4a":
+            args.extend(["-movflags", "+faststart"])
+    else:
+        args.extend(encode_args)
+    args.append(str(destination))
+    _run_render(args, [destination], cache)
+
+
+def _run_render(args: List[str], outputs: Sequence[Path], cache: RenderCache | None) -> None:
+    if cache is None:
+        _run_command(args)
+        return
+    cache.run(args, outputs, lambda: _run_command(args))
+
+
+def _audio_concat_graph(
+    pieces: Sequence[Tuple[float, float]], *, offset: float, audio_filter: str | None
+) -> str:
+    count = len(pieces)
+    labels = [f"[pa{index}]" for index in range(count)]
+    parts = [f"[0:a]asplit={count}{''.join(labels)}"]
+    for index, (piece_start, piece_end) in enumerate(pieces):
+        parts.append(
+            f"{labels[index]}atrim=start={piece_start - offset:.3f}:end={piece_end - offset:.3f},"
+            f"asetpts=PTS-STARTPTS[ta{index}]"
+        )
+    tail = f",{audio_filter}" if audio_filter else ""
+    parts.append(f"{''.join(f'[ta{index}]' for index in range(count))}concat=n={count}:v=0:a=1{tail}[ac]")
+    return ";".join(parts)
+
+
+def _concat_graph(
+    pieces: Sequence[Tuple[float, float]], *, offset: float, audio_filter: str | None, audio: bool = True
+) -> str:
+    """Trim ``pieces`` from one decode and join them into ``[vc]`` (and ``[ac]`` when the source has audio)."""
+
+    count = len(pieces)
+    video_labels = [f"[pv{index}]" for index in range(count)]
+    audio_labels = [f"[pa{index}]" for index in range(count)]
+    parts = [f"[0:v]split={count}{''.join(video_labels)}"]
+    if audio:
+        parts.append(f"[0:a]asplit={count}{''.join(audio_labels)}")
+    joined = ""
+    for index, (piece_start, piece_end) in enumerate(pieces):
+        rel_start, rel_end = piece_start - offset, piece_end - offset
+        parts.append(
+            f"{video_labels[index]}trim=start={rel_start:.3f}:end={rel_end:.3f},setpts=PTS-STARTPTS[tv{index}]"
+        )
+        joined += f"[tv{index}]"
+        if audio:
+            parts.append(
+                f"{audio_labels[index]}atrim=start={rel_start:.3f}:end={rel_end:.3f},asetpts=PTS-STARTPTS[ta{index}]"
             )
+            joined += f"[ta{index}]"
+    if not audio:
+        parts.append(f"{joined}concat=n={count}:v=1:a=0[vc]")
+        return ";".join(parts)
+    audio_label = "[acat]" if audio_filter else "[ac]"
+    parts.append(f"{joined}concat=n={count}:v=1:a=1[vc]{audio_label}")
+    if audio_filter:
+        parts.append(f"[acat]{audio_filter}[ac]")
+    return ";".join(parts)
+
+
+def _ladder_graph(base: str | None, renditions: Sequence[Rendition], *, source: str = "[0:v]") -> str:
+    labels = "".join(f"[s{index}]" for index in range(len(renditions)))
+    graph = f"{base},split={len(renditions)}{labels}" if base else f"{source}split={len(renditions)}{labels}"
+    for index, rendition in enumerate(renditions):
+        size = rendition.height
+        graph += (
+            f";[s{index}]scale=w='if(gt(iw,ih),-2,{size})':h='if(gt(iw,ih),{size},-2)'[v{index}]"
         )
-        args.extend(["-filter_complex", filter_complex])
+    return graph
+
 
-    args.extend(["-c:v", "libx264", "-preset", "veryfast", "-c:a", "aac", "-movflags", "+faststart", str(destination)])
-    _run_command(args)
+def _build_filter_graph(
+    *,
+    brand: BrandTheme | None = None,
+    profile: ShortsProfile | None = None,
+    focus_x: float | None = None,
+    source: str = "[0:v]",
+) -> str | None:
+    reframe = _vertical_chain(profile, focus_x) if profile else None
+    if not (brand and brand.watermark_path):
+        return f"{source}{reframe}" if reframe else None
+
+    watermark = (
+        "movie='{wm}',scale=iw*{scale}:ih*{scale},format=rgba,"
+        "colorchannelmixer=aa={opacity}[wm]".format(
+            wm=brand.watermark_path.as_posix(),
+            scale=brand.watermark_scale,
+            opacity=brand.watermark_opacity,
+        )
+    )
+    if not reframe:
+        return f"{watermark};{source}[wm]overlay={brand.watermark_position}"
+    return f"{watermark};{source}{reframe}[base];[base][wm]overlay={brand.safe_watermark_position()}"
+
+
+def _vertical_chain(profile: ShortsProfile, focus_x: float | None) -> str:
+    width, height = profile.width, profile.height
+    if profile.fit == "pad":
+        return (
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+        )
+    focus = min(max(focus_x if focus_x is not None else 0.5, 0.0), 1.0)
+    return (
+        f"crop=w='min(iw,ih*{width}/{height})':h='min(ih,iw*{height}/{width})':"
+        f"x='max(0,min(iw-ow,iw*{focus:.4f}-ow/2))':y='(ih-oh)/2',"
+        f"scale={width}:{height},setsar=1"
+    )
 
 
 def _write_srt(path: Path, segment: "MediaSegment") -> None:
@@ -0,0 +1,77 @@
+"""Cheap subject tracking used to position vertical crops."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from .ffmpeg_ops import FFmpegError, _run_command
+
+
+ANALYSIS_WIDTH = 64
+ANALYSIS_HEIGHT = 36
+ANALYSIS_FPS = 2.0
+
+
+def estimate_focus_x(
+    source: Path,
+    start: float,
+    end: float,
+    *,
+    width: int = ANALYSIS_WIDTH,
+    height: int = ANALYSIS_HEIGHT,
+    fps: float = ANALYSIS_FPS,
+) -> float:
+    """Return the horizontal motion centroid of a segment as a 0-1 fraction of the frame width.
+
+    The segment is decoded at a tiny grayscale resolution and low frame rate so the
+    analysis costs a fraction of the actual render.
+    """
+
+    duration = max(end - start, 0.1)
+    args = [
+        "ffmpeg",
+        "-hide_banner",
+        "-v",
+        "error",
+        "-ss",
+        f"{start:.3f}",
+        "-i",
+        str(source),
+        "-t",
+        f"{duration:.3f}",
+        "-an",
+        "-vf",
+        f"fps={fps},scale={width}:{height},format=gray",
+        "-f",
+        "rawvideo",
+        "-",
+    ]
+    try:
+        result = _run_command(args, binary=True)
+    except FFmpegError:
+        return 0.5
+    return focus_from_frames(result.stdout, width, height)
+
+
+def focus_from_frames(raw: bytes, width: int, height: int) -> float:
+    """Compute the motion centroid from concatenated 8-bit grayscale frames."""
+
+    frame_size = width * height
+    count = len(raw) // frame_size if frame_size else 0
+    if count < 2:
+        return 0.5
+
+    energy = [0] * width
+    previous = raw[:frame_size]
+    for index in range(1, count):
+        frame = raw[index * frame_size : (index + 1) * frame_size]
+        for column in range(width):
+            energy[column] += sum(
+                abs(a - b) for a, b in zip(frame[column::width], previous[column::width])
+            )
+        previous = frame
+
+    total = sum(energy)
+    if total == 0:
+        return 0.5
+    centroid = sum(column * value for column, value in enumerate(energy)) / total
+    return (centroid + 0.5) / width
@@ -0,0 +1,268 @@
+"""Content-addressed cache of rendered clips shared across jobs."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..util.fingerprint import content_fingerprint
+from ..util.io import clone_file, write_text_atomic
+from ..util.logging import job_logger
+
+
+# Bump when the way outputs are produced changes without the ffmpeg arguments changing.
+RENDER_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 20 * 1024**3
+# Objects younger than this are never treated as orphans: their entry may still be being written.
+_ORPHAN_GRACE_SECONDS = 600.0
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+# Files a filter graph reads itself (the brand watermark enters as ``movie='<path>'``).
+_FILTER_SOURCE = re.compile(r"\ba?movie=(?:'([^']*)'|([^:,;\[\]']+))")
+
+
+def parse_size(text: str) -> int:
+    """Parse ``"500M"``, ``"20G"``, ``"1.5TiB"`` or a plain byte count."""
+
+    match = _SIZE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"invalid size: {text!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+@dataclass
+class EvictionReport:
+    removed_entries: int
+    removed_bytes: int
+    remaining_entries: int
+    remaining_bytes: int
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "removed_entries": self.removed_entries,
+            "removed_bytes": self.removed_bytes,
+            "remaining_entries": self.remaining_entries,
+            "remaining_bytes": self.remaining_bytes,
+        }
+
+
+class RenderCache:
+    """Rendered files keyed by the exact ffmpeg invocation that produced them.
+
+    The key digests the ffmpeg arguments with every ``-i`` input replaced by a
+    fingerprint of that file and every output path replaced by its slot, so it
+    covers the source, cut points, filter graph and encoder settings but not
+    where a job writes. Files a filter graph opens through ``movie=`` or
+    ``amovie=`` (a watermark) are fingerprinted by content too. File bodies live once under ``objects/`` by content
+    hash, so identical clips from different keys share storage, and hits are
+    materialized as reflinks or hardlinks (copies only across filesystems).
+    An entry's mtime is its last use; :meth:`evict` trims the cache to
+    ``max_bytes`` least recently used first.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: Optional[int] = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counts = {"reused": 0, "recomputed": 0}
+
+    def run(self, args: Sequence[str], outputs: Sequence[Path], render: Callable[[], None]) -> bool:
+        """Materialize ``outputs`` from the cache, or call ``render`` and store them.
+
+        Returns ``True`` on a cache hit.
+        """
+
+        key = self.key(args, outputs)
+        for path in outputs:
+            # Never let an encoder write through a stale link into a cached object.
+            path.unlink(missing_ok=True)
+        if self._restore(key, outputs):
+            self._record(key, reused=True)
+            return True
+        render()
+        try:
+            self._store(key, outputs)
+        except OSError as exc:
+            # A full or read-only cache never fails the render itself.
+            job_logger().warning("render_cache_store_failed", extra={"key": key, "error": str(exc)})
+        self._record(key, reused=False)
+        return False
+
+    def key(self, args: Sequence[str], outputs: Sequence[Path]) -> str:
+        slots = {str(path): f"<out{index}{path.suffix}>" for index, path in enumerate(outputs)}
+        normalized: List[object] = []
+        filter_sources: Dict[str, dict] = {}
+        previous = None
+        for arg in args:
+            if previous == "-i":
+                normalized.append(_input_fingerprint(Path(arg)))
+            else:
+                normalized.append(slots.get(arg, arg))
+                for match in _FILTER_SOURCE.finditer(arg):
+                    path = match.group(1) or match.group(2)
+                    filter_sources[path] = _input_fingerprint(Path(path))
+            previous = arg
+        payload: Dict[str, object] = {"version": RENDER_CACHE_VERSION, "args": normalized}
+        if filter_sources:
+            payload["filter_sources"] = filter_sources
+        encoded = json.dumps(payload, sort_keys=True)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def usage(self) -> Dict[str, int]:
+        entries = self._entries()
+        objects = self._objects()
+        return {"entries": len(entries), "objects": len(objects), "bytes": sum(objects.values())}
+
+    def evict(self, max_bytes: Optional[int] = None) -> EvictionReport:
+        """Drop least recently used entries until the objects fit in ``max_bytes``.
+
+        Objects no longer referenced by any entry are deleted as well.
+        """
+
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        objects = self._objects()
+        entries = sorted(self._entries(), key=lambda item: item[1])
+        references: Dict[str, int] = {}
+        for path, _, digests in entries:
+            for digest in digests:
+                references[digest] = references.get(digest, 0) + 1
+
+        total = sum(objects.values())
+        removed_entries = removed_bytes = 0
+        kept = len(entries)
+        for path, _, digests in entries:
+            if limit is None or total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            removed_entries += 1
+            kept -= 1
+            for digest in digests:
+                references[digest] -= 1
+                if references[digest] == 0 and digest in objects:
+                    size = objects.pop(digest)
+                    self._object_path(digest).unlink(missing_ok=True)
+                    total -= size
+                    removed_bytes += size
+
+        now = time.time()
+        for digest in [digest for digest in objects if not references.get(digest)]:
+            path = self._object_path(digest)
+            try:
+                if now - path.stat().st_ctime < _ORPHAN_GRACE_SECONDS:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            size = objects.pop(digest)
+            total -= size
+            removed_bytes += size
+        report = EvictionReport(removed_entries, removed_bytes, kept, total)
+        if removed_entries:
+            job_logger().info("render_cache_evicted", extra=report.to_dict())
+        return report
+
+    def _restore(self, key: str, outputs: Sequence[Path]) -> bool:
+        entry_path = self._entry_path(key)
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        stored = entry.get("outputs", [])
+        if len(stored) != len(outputs):
+            return False
+        try:
+            for record, path in zip(stored, outputs):
+                source = self._object_path(record["object"])
+                if source.stat().st_size != record["size"]:
+                    raise OSError(f"cached object {record['object']} is damaged")
+                clone_file(source, path)
+            os.utime(entry_path)
+        except (OSError, KeyError):
+            for path in outputs:
+                path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def _store(self, key: str, outputs: Sequence[Path]) -> None:
+        records = []
+        for path in outputs:
+            digest = _file_digest(path)
+            target = self._object_path(digest)
+            if target.exists():
+                # Same bytes already cached under another key: share them instead of keeping two copies.
+                _replace_with_clone(target, path)
+            else:
+                staging = target.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}")
+                staging.unlink(missing_ok=True)
+                clone_file(path, staging)
+                os.replace(staging, target)
+            records.append({"object": digest, "size": path.stat().st_size})
+        write_text_atomic(
+            self._entry_path(key),
+            json.dumps({"version": RENDER_CACHE_VERSION, "outputs": records, "stored_at": time.time()}),
+        )
+
+    def _entries(self) -> List[tuple]:
+        found = []
+        for path in self.root.joinpath("entries").glob("*/*.json"):
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+                used = path.stat().st_mtime
+            except (OSError, ValueError):
+                continue
+            found.append((path, used, [record["object"] for record in entry.get("outputs", [])]))
+        return found
+
+    def _objects(self) -> Dict[str, int]:
+        sizes: Dict[str, int] = {}
+        for path in self.root.joinpath("objects").glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                sizes[path.name] = path.stat().st_size
+            except OSError:
+                continue
+        return sizes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / "entries" / key[:2] / f"{key}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def _record(self, key: str, *, reused: bool) -> None:
+        with self._lock:
+            self._counts["reused" if reused else "recomputed"] += 1
+        job_logger().info("render_cache_hit" if reused else "render_cache_miss", extra={"key": key[:24]})
+
+
+def _input_fingerprint(path: Path) -> dict:
+    try:
+        return {"content": content_fingerprint(path)}
+    except OSError:
+        return {"name": path.name, "missing": True}
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _replace_with_clone(source: Path, path: Path) -> None:
+    staging = path.with_name(f".{path.name}.dedupe")
+    staging.unlink(missing_ok=True)
+    clone_file(source, staging)
+    os.replace(staging, path)
@@ -0,0 +1,157 @@
+"""Silence detection and trimmed-timeline mapping for jump-cut rendering."""
+from __future__ import annotations
+
+import bisect
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from ..stt.transcribe import TranscriptResult, TranscriptSegment
+from .ffmpeg_ops import MediaSegment, _run_command, _source_cache_path
+
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+@dataclass
+class SilencePolicy:
+    """Which silent stretches are removed and how much air is left around cuts."""
+
+    noise_db: float = -35.0
+    threshold_seconds: float = 0.8
+    padding_seconds: float = 0.15
+
+
+def detect_silences(
+    path: Path,
+    policy: SilencePolicy,
+    duration: float,
+    *,
+    cache_dir: Path | None = None,
+) -> List[Tuple[float, float]]:
+    """Return silent intervals longer than the policy threshold, detected in one pass over the source."""
+
+    params = {"noise_db": policy.noise_db, "threshold": policy.threshold_seconds}
+    cache_path = _source_cache_path(path, "silence", params, cache_dir) if cache_dir else None
+    if cache_path and cache_path.exists():
+        return [tuple(item) for item in json.loads(cache_path.read_text(encoding="utf-8"))]
+
+    args = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        str(path),
+        "-vn",
+        "-af",
+        f"silencedetect=noise={policy.noise_db}dB:d={policy.threshold_seconds}",
+        "-f",
+        "null",
+        "-",
+    ]
+    result = _run_command(args)
+    silences = parse_silencedetect(result.stderr, duration)
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(silences), encoding="utf-8")
+    return silences
+
+
+def parse_silencedetect(stderr: str, duration: float) -> List[Tuple[float, float]]:
+    silences: List[Tuple[float, float]] = []
+    pending: float | None = None
+    for line in stderr.splitlines():
+        start_match = _SILENCE_START.search(line)
+        if start_match:
+            pending = max(float(start_match.group(1)), 0.0)
+            continue
+        end_match = _SILENCE_END.search(line)
+        if end_match and pending is not None:
+            silences.append((pending, min(float(end_match.group(1)), duration)))
+            pending = None
+    if pending is not None and pending < duration:
+        # Silence running into the end of the file never reports silence_end.
+        silences.append((pending, duration))
+    return silences
+
+
+def build_keep_intervals(
+    duration: float, silences: Sequence[Tuple[float, float]], policy: SilencePolicy
+) -> List[Tuple[float, float]]:
+    """Invert silences into the source intervals that survive the trim."""
+
+    keep: List[Tuple[float, float]] = []
+    cursor = 0.0
+    for silence_start, silence_end in sorted(silences):
+        if silence_end - silence_start < policy.threshold_seconds:
+            continue
+        cut_start = silence_start + policy.padding_seconds
+        cut_end = silence_end - policy.padding_seconds
+        if cut_end <= cut_start:
+            continue
+        if cut_start > cursor:
+            keep.append((cursor, cut_start))
+        cursor = max(cursor, cut_end)
+    if cursor < duration:
+        keep.append((cursor, duration))
+    return keep or [(0.0, duration)]
+
+
+class TrimTimeline:
+    """Maps between source time and the timeline left after dropping silences."""
+
+    def __init__(self, keep: Sequence[Tuple[float, float]]) -> None:
+        self.keep = [(float(start), float(end)) for start, end in keep]
+        self._starts = [start for start, _ in self.keep]
+        self._offsets: List[float] = []
+        total = 0.0
+        for start, end in self.keep:
+            self._offsets.append(total)
+            total += end - start
+        self.duration = total
+
+    def to_trimmed(self, source_time: float) -> float:
+        """Position of a source timestamp on the trimmed timeline (cut gaps collapse to a point)."""
+
+        index = bisect.bisect_right(self._starts, source_time) - 1
+        if index < 0:
+            return 0.0
+        start, end = self.keep[index]
+        return self._offsets[index] + min(source_time, end) - start
+
+    def to_source_ranges(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """Source intervals that make up the trimmed window ``[start, end)``."""
+
+        ranges: List[Tuple[float, float]] = []
+        for (piece_start, piece_end), offset in zip(self.keep, self._offsets):
+            length = piece_end - piece_start
+            lo = max(start, offset)
+            hi = min(end, offset + length)
+            if hi > lo:
+                ranges.append((piece_start + lo - offset, piece_start + hi - offset))
+        return ranges
+
+    def segment(self, start: float, end: float, caption: str | None = None) -> MediaSegment:
+        return MediaSegment(start=start, end=end, caption=caption, pieces=self.to_source_ranges(start, end))
+
+    def remap_transcript(self, transcript: TranscriptResult) -> TranscriptResult:
+        segments = [
+            TranscriptSegment(
+                id=segment.id,
+                start=self.to_trimmed(segment.start),
+                end=self.to_trimmed(segment.end),
+                text=segment.text,
+                speaker=segment.speaker,
+            )
+            for segment in transcript.segments
+        ]
+        return TranscriptResult(language=transcript.language, segments=segments)
+
+    def to_dict(self) -> dict:
+        return {
+            "keep": [[start, end] for start, end in self.keep],
+            "trimmed_duration": self.duration,
+        }
@@ -0,0 +1,285 @@
+"""SQLite catalog of jobs, their inputs, stages and rendered assets."""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+CATALOG_FILENAME = "catalog.sqlite"
+# Asset kinds written by the pipeline besides the render stages (render_chapters, branded_highlights, ...).
+CAPTIONS_KIND = "captions"
+TRANSCRIPT_KIND = "transcript"
+# assets.map.json section -> (asset kind, directory under the input root); used by :meth:`JobCatalog.sync`.
+_ASSET_SECTIONS = (
+    ("chunks", "render_chapters", "chapters"),
+    ("shorts", "render_highlights", "highlights"),
+    ("branded_chapters", "branded_chapters", "branded/chapters"),
+    ("branded_highlights", "branded_highlights", "branded/highlights"),
+)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY, status TEXT NOT NULL, template TEXT, dry_run INTEGER NOT NULL DEFAULT 0,
+    root TEXT NOT NULL, started_at TEXT NOT NULL, finished_at TEXT, media_seconds REAL, error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_start ON jobs (started_at);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, started_at);
+CREATE TABLE IF NOT EXISTS inputs (
+    job_id TEXT NOT NULL, key TEXT NOT NULL, input TEXT NOT NULL, source TEXT, source_key TEXT, root TEXT,
+    PRIMARY KEY (job_id, key)
+);
+CREATE INDEX IF NOT EXISTS inputs_by_value ON inputs (input);
+CREATE INDEX IF NOT EXISTS inputs_by_source ON inputs (source_key);
+CREATE TABLE IF NOT EXISTS stages (
+    job_id TEXT NOT NULL, name TEXT NOT NULL, planned TEXT, reused INTEGER, recomputed INTEGER,
+    PRIMARY KEY (job_id, name)
+);
+CREATE TABLE IF NOT EXISTS assets (
+    job_id TEXT NOT NULL, input_key TEXT, kind TEXT NOT NULL, path TEXT NOT NULL, size INTEGER, duration REAL,
+    recorded_at TEXT NOT NULL, PRIMARY KEY (job_id, path)
+);
+CREATE INDEX IF NOT EXISTS assets_by_kind ON assets (kind);
+"""
+
+
+class JobCatalog:
+    """Jobs, inputs, stages and assets recorded as the pipeline runs (``<out>/catalog.sqlite``).
+
+    The database runs in WAL mode, so ``creatorpack jobs`` can read while
+    batch, serve or watch workers write, and each write is one short
+    transaction. Listing jobs, finding the exports made from an input and
+    totalling rendered minutes are indexed queries instead of walks over
+    ``<out>/*/manifests``. :meth:`sync` backfills exports made before the
+    catalog existed from their manifests.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def start_job(
+        self, job_id: str, *, template: Optional[str], root: Path, dry_run: bool = False, started_at: Optional[str] = None
+    ) -> None:
+        """Record a (re)started job; rows from an earlier run of the same job id are replaced."""
+
+        with self._lock, closing(self._connect()) as conn, conn:
+            for table in ("inputs", "stages", "assets"):
+                conn.execute(f"DELETE FROM {table} WHERE job_id = ?", (job_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, template, dry_run, root, started_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, "running", template, int(dry_run), str(root), started_at or _now()),
+            )
+
+    def add_input(
+        self, job_id: str, key: str, value: str, *, source: Optional[str], source_key: Optional[str], root: Path
+    ) -> None:
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO inputs (job_id, key, input, source, source_key, root) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, key, value, source, source_key, str(root)),
+            )
+
+    def add_assets(
+        self, job_id: str, input_key: Optional[str], kind: str, files: Sequence[Path], *, duration: Optional[float] = None
+    ) -> None:
+        """Record finished files; captions are filed under ``captions`` without a duration.
+
+        ``files[0]`` is the asset itself and carries ``duration``; the rest are its
+        renditions and captions, so rendered minutes count each clip once.
+        """
+
+        now = _now()
+        rows = []
+        for position, path in enumerate(files):
+            caption = path.suffix == ".srt"
+            rows.append(
+                (
+                    job_id,
+                    input_key,
+                    CAPTIONS_KIND if caption else kind,
+                    str(path),
+                    _size(path),
+                    None if caption or position else duration,
+                    now,
+                )
+            )
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO assets (job_id, input_key, kind, path, size, duration, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def finish_job(
+        self,
+        job_id: str,
+        status: str,
+        *,
+        media_seconds: Optional[float] = None,
+        stages: Optional[dict] = None,
+        stage_cache: Optional[Dict[str, Dict[str, int]]] = None,
+        error: Optional[str] = None,
+        finished_at: Optional[str] = None,
+    ) -> None:
+        rows: Dict[str, List] = {}
+        for name in (stages or {}).get("run", []):
+            rows[name] = [job_id, name, "run", None, None]
+        for name in (stages or {}).get("skipped", []):
+            rows[name] = [job_id, name, "skipped", None, None]
+        for name, counts in (stage_cache or {}).items():
+            row = rows.setdefault(name, [job_id, name, None, None, None])
+            row[3], row[4] = counts.get("reused"), counts.get("recomputed")
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, media_seconds = COALESCE(?, media_seconds), error = ? WHERE job_id = ?",
+                (status, finished_at or _now(), media_seconds, error, job_id),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO stages (job_id, name, planned, reused, recomputed) VALUES (?, ?, ?, ?, ?)",
+                rows.values(),
+            )
+
+    def list_jobs(
+        self,
+        *,
+        status: Optional[str] = None,
+        template: Optional[str] = None,
+        input_value: Optional[str] = None,
+        source_key: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[dict]:
+        """Newest first, with input count and rendered seconds per job."""
+
+        where, params = [], []
+        if status is not None:
+            where.append("j.status = ?")
+            params.append(status)
+        if template is not None:
+            where.append("j.template = ?")
+            params.append(template)
+        if input_value is not None or source_key is not None:
+            where.append("j.job_id IN (SELECT job_id FROM inputs WHERE input = ? OR source_key = ?)")
+            params.extend([input_value, source_key])
+        sql = f"""
+            SELECT j.*,
+                   (SELECT COUNT(*) FROM inputs i WHERE i.job_id = j.job_id) AS inputs,
+                   (SELECT COALESCE(SUM(a.duration), 0) FROM assets a WHERE a.job_id = j.job_id) AS rendered_seconds
+            FROM jobs j
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY j.started_at DESC
+            LIMIT ?
+        """
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, [*params, limit])]
+
+    def show(self, job_id: str) -> Optional[dict]:
+        with closing(self._connect()) as conn:
+            job = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            detail = dict(job)
+            for table, order in (("inputs", "key"), ("stages", "name"), ("assets", "kind, path")):
+                detail[table] = [
+                    {name: value for name, value in dict(row).items() if name != "job_id"}
+                    for row in conn.execute(f"SELECT * FROM {table} WHERE job_id = ? ORDER BY {order}", (job_id,))
+                ]
+        return detail
+
+    def stats(self) -> dict:
+        with closing(self._connect()) as conn:
+            jobs = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            media_seconds = conn.execute(
+                "SELECT COALESCE(SUM(media_seconds), 0) FROM jobs WHERE status = 'completed'"
+            ).fetchone()[0]
+            assets = {
+                kind: {"files": files, "seconds": seconds or 0.0, "bytes": size or 0}
+                for kind, files, seconds, size in conn.execute(
+                    "SELECT kind, COUNT(*), SUM(duration), SUM(size) FROM assets GROUP BY kind ORDER BY kind"
+                )
+            }
+        return {
+            "jobs": jobs,
+            "media_seconds": media_seconds,
+            "rendered_seconds": sum(entry["seconds"] for entry in assets.values()),
+            "assets": assets,
+        }
+
+    def sync(self, output_dir: Path) -> int:
+        """Add completed exports under ``output_dir`` that the catalog does not know yet; returns how many."""
+
+        with closing(self._connect()) as conn:
+            known = {row[0] for row in conn.execute("SELECT job_id FROM jobs")}
+        added = 0
+        for job_id, root, job in _exports(output_dir):
+            if job_id in known:
+                continue
+            self._import_export(job_id, root, job)
+            added += 1
+        return added
+
+    def _import_export(self, job_id: str, root: Path, job: dict) -> None:
+        completed_at = job["completed_at"]
+        self.start_job(
+            job_id, template=job.get("template"), root=root, dry_run=bool(job.get("dry_run")), started_at=completed_at
+        )
+        index = _read_json(root / "manifests" / "index.json") or {"inputs": []}
+        for entry in index.get("inputs", []):
+            key, item_root = entry.get("key"), root / entry.get("root", ".")
+            self.add_input(job_id, key, entry.get("input", ""), source=entry.get("source"), source_key=None, root=item_root)
+            if entry.get("transcript"):
+                self.add_assets(job_id, key, TRANSCRIPT_KIND, [root / entry["transcript"]])
+            assets_map_path = entry.get("manifests", {}).get("assets_map")
+            assets_map = (_read_json(root / assets_map_path) if assets_map_path else None) or {}
+            for section, kind, directory in _ASSET_SECTIONS:
+                for asset in assets_map.get(section, []):
+                    clip = item_root / directory / asset["file"]
+                    files = [clip, *(clip.with_name(rendition["file"]) for rendition in asset.get("renditions", []))]
+                    if clip.with_suffix(".srt").exists():
+                        files.append(clip.with_suffix(".srt"))
+                    self.add_assets(job_id, key, kind, files, duration=asset["end"] - asset["start"])
+        self.finish_job(
+            job_id, "completed", stages=job.get("stages"), stage_cache=job.get("stage_cache"), finished_at=completed_at
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+def _exports(output_dir: Path) -> Iterator[Tuple[str, Path, dict]]:
+    try:
+        entries = list(os.scandir(output_dir))
+    except FileNotFoundError:
+        return
+    for entry in sorted(entries, key=lambda item: item.name):
+        if entry.name.startswith(".") or not entry.is_dir():
+            continue
+        job = _read_json(Path(entry.path) / "manifests" / "job.json")
+        if job and "completed_at" in job:
+            yield job.get("job_id", entry.name), Path(entry.path), job
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _size(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
@@ -1,14 +1,33 @@
 """Export structure helpers."""
 from __future__ import annotations
 
+import hashlib
+import io
+import json
+import os
+import queue
+import re
+import tarfile
+import threading
+import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
 
 from ..ingest.downloader import DownloadResult
 from ..media.ffmpeg_ops import ChunkOutput
 from ..nlp.highlights import HighlightPlan
-from ..util.io import dump_json
+from ..util.io import ManifestWriter, dump_json
+from ..util.logging import job_logger
+
+
+ARCHIVE_FORMATS = ("zip", "tar")
+CHECKSUMS_FILENAME = "SHA256SUMS"
+# Never delivered: source media, per-job caches, in-flight renders and the resume state.
+_ARCHIVE_SKIP_DIRS = frozenset({"input", "cache", ".partial"})
+_ARCHIVE_SKIP_FILES = frozenset({"job.state.json"})
+_ARCHIVE_CHUNK = 1024 * 1024
 
 
 @dataclass
@@ -23,10 +42,39 @@ class ExportContext:
     branded_highlights_dir: Path
     manifests_dir: Path
     logs_dir: Path
+    cache_dir: Path
 
 
 def build_export_structure(output_dir: Path, job_id: str) -> ExportContext:
     root = (output_dir / job_id).resolve()
+    return _build_layout(root, logs_dir=root / "logs", cache_dir=root / "cache")
+
+
+def export_completed(output_dir: Path, job_id: str) -> bool:
+    """True when ``<output_dir>/<job_id>`` holds a finished export (``job.json`` carries ``completed_at``)."""
+
+    job_manifest = output_dir / job_id / "manifests" / "job.json"
+    try:
+        return "completed_at" in json.loads(job_manifest.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+
+
+def build_input_structure(job_ctx: ExportContext, slug: str) -> ExportContext:
+    """Per-input export tree under ``<job>/inputs/<slug>``; logs and cache stay job-wide."""
+
+    return _build_layout(job_ctx.root / "inputs" / slug, logs_dir=job_ctx.logs_dir, cache_dir=job_ctx.cache_dir)
+
+
+def input_slug(index: int, value: str) -> str:
+    """Unique, filesystem-safe directory name for the ``index``-th input of a job."""
+
+    stem = Path(unquote(value.rstrip("/").split("?", 1)[0])).stem or "input"
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", stem).strip("._") or "input"
+    return f"{index:03d}-{safe[:40]}"
+
+
+def _build_layout(root: Path, *, logs_dir: Path, cache_dir: Path) -> ExportContext:
     input_dir = root / "input"
     transcript_dir = root / "transcript"
     chapters_dir = root / "chapters"
@@ -35,7 +83,6 @@ def build_export_structure(output_dir: Path, job_id: str) -> ExportContext:
     branded_chapters_dir = branded_dir / "chapters"
     branded_highlights_dir = branded_dir / "highlights"
     manifests_dir = root / "manifests"
-    logs_dir = root / "logs"
     for directory in (
         input_dir,
         transcript_dir,
@@ -46,6 +93,7 @@ def build_export_structure(output_dir: Path, job_id: str) -> ExportContext:
         branded_highlights_dir,
         manifests_dir,
         logs_dir,
+        cache_dir,
     ):
         directory.mkdir(parents=True, exist_ok=True)
     return ExportContext(
@@ -59,6 +107,7 @@ def build_export_structure(output_dir: Path, job_id: str) -> ExportContext:
         branded_highlights_dir=branded_highlights_dir,
         manifests_dir=manifests_dir,
         logs_dir=logs_dir,
+        cache_dir=cache_dir,
     )
 
 
@@ -70,6 +119,8 @@ def write_assets_map(
     highlight_outputs: Optional[List[ChunkOutput]] = None,
     branded_chapters: Optional[List[ChunkOutput]] = None,
     branded_highlights: Optional[List[ChunkOutput]] = None,
+    *,
+    writer: Optional[ManifestWriter] = None,
 ) -> None:
     assets = {
         "source": download.original_name,
@@ -79,6 +130,7 @@ def write_assets_map(
                 "srt": output.file.with_suffix(".srt").name,
                 "start": output.start,
                 "end": output.end,
+                **_renditions_entry(output),
             }
             for output in chapter_outputs
         ],
@@ -96,19 +148,30 @@ def write_assets_map(
         ]
     if branded_chapters:
         assets["branded_chapters"] = [
-            {"file": output.file.name, "start": output.start, "end": output.end} for output in branded_chapters
+            {"file": output.file.name, "start": output.start, "end": output.end, **_renditions_entry(output)}
+            for output in branded_chapters
         ]
     if branded_highlights:
         assets["branded_highlights"] = [
             {"file": output.file.name, "start": output.start, "end": output.end} for output in branded_highlights
         ]
-    dump_json(assets, ctx.manifests_dir / "assets.map.json")
+    _dump(writer, assets, ctx.manifests_dir / "assets.map.json")
+
+
+def _renditions_entry(output: ChunkOutput) -> dict:
+    if not output.renditions:
+        return {}
+    return {
+        "renditions": [{"name": name, "file": path.name} for name, path in output.renditions.items()]
+    }
 
 
 def write_highlights_manifest(
     ctx: ExportContext,
     highlight_plan: Optional[HighlightPlan],
     highlight_outputs: Optional[List[ChunkOutput]],
+    *,
+    writer: Optional[ManifestWriter] = None,
 ) -> None:
     data = {
         "highlights": [],
@@ -123,4 +186,197 @@ def write_highlights_manifest(
             }
             for output, highlight in zip(highlight_outputs, highlight_plan.highlights)
         ]
-    dump_json(data, ctx.manifests_dir / "highlights.json")
+    _dump(writer, data, ctx.manifests_dir / "highlights.json")
+
+
+def write_job_index(
+    ctx: ExportContext, job_id: str, entries: List[dict], *, writer: Optional[ManifestWriter] = None
+) -> None:
+    """Job-level index pointing at each input's export tree and manifests."""
+
+    _dump(writer, {"job_id": job_id, "inputs": entries}, ctx.manifests_dir / "index.json")
+
+
+def index_entry(
+    job_ctx: ExportContext,
+    item_ctx: ExportContext,
+    key: str,
+    value: str,
+    download: DownloadResult,
+    *,
+    writer: Optional[ManifestWriter] = None,
+) -> dict:
+    exists = writer.exists if writer is not None else Path.exists
+
+    def _rel(path: Path) -> str:
+        return path.relative_to(job_ctx.root).as_posix()
+
+    return {
+        "key": key,
+        "input": value,
+        "source": download.source,
+        "original_filename": download.original_name,
+        "root": _rel(item_ctx.root) if item_ctx.root != job_ctx.root else ".",
+        "manifests": {
+            name: _rel(item_ctx.manifests_dir / filename)
+            for name, filename in (
+                ("assets_map", "assets.map.json"),
+                ("chapters", "chapters.json"),
+                ("highlights", "highlights.json"),
+                ("provenance", "provenance.json"),
+            )
+            if exists(item_ctx.manifests_dir / filename)
+        },
+        "transcript": _rel(item_ctx.transcript_dir / "transcript.json")
+        if exists(item_ctx.transcript_dir / "transcript.json")
+        else None,
+    }
+
+
+def _dump(writer: Optional[ManifestWriter], data: object, path: Path) -> None:
+    if writer is not None:
+        writer.stage(data, path)
+    else:
+        dump_json(data, path)
+
+
+class ExportArchive:
+    """Delivery archive (``<out>/<job_id>.zip`` or ``.tar``) filled while the job runs.
+
+    :meth:`add` queues finished files and a writer thread appends them in the
+    order they arrive, while they are likely still in the page cache. ZIP
+    entries are stored (media does not recompress) and tar is uncompressed.
+    With ``checksums`` each entry's SHA-256 is taken from the bytes as they are
+    written. :meth:`close` appends whatever else the export holds, manifests
+    last, then ``SHA256SUMS``, and renames the archive into place.
+    """
+
+    def __init__(self, path: Path, root: Path, *, fmt: str = "zip", checksums: bool = False) -> None:
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format '{fmt}'")
+        self.path = path
+        self.root = root
+        self.fmt = fmt
+        self.checksums = checksums
+        self._partial = path.with_name(path.name + ".partial")
+        self._added: Set[str] = set()
+        self._digests: List[Tuple[str, str]] = []
+        self._bytes = 0
+        self._error: Optional[BaseException] = None
+        self._queue: "queue.Queue[Optional[Path]]" = queue.Queue()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "zip":
+            self._zip: Optional[zipfile.ZipFile] = zipfile.ZipFile(self._partial, "w", zipfile.ZIP_STORED)
+            self._tar: Optional[tarfile.TarFile] = None
+        else:
+            self._zip, self._tar = None, tarfile.open(self._partial, "w", format=tarfile.PAX_FORMAT)
+        self._writer: Optional[threading.Thread] = threading.Thread(
+            target=self._drain, name="creatorpack-archive", daemon=True
+        )
+        self._writer.start()
+
+    def add(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            self._queue.put(path)
+
+    def close(self) -> Path:
+        self._stop_writer()
+        try:
+            if self._error is not None:
+                raise self._error
+            for path in _archive_order(self.root):
+                self._append(path)
+            if self.checksums:
+                lines = "".join(f"{digest}  {name}\n" for name, digest in self._digests)
+                self._append_bytes(f"{self.root.name}/{CHECKSUMS_FILENAME}", lines.encode("utf-8"))
+            self._close_archive()
+        except BaseException:
+            self.abort()
+            raise
+        os.replace(self._partial, self.path)
+        job_logger().info(
+            "archive_written", extra={"path": str(self.path), "entries": len(self._added), "bytes": self._bytes}
+        )
+        return self.path
+
+    def abort(self) -> None:
+        self._stop_writer()
+        self._close_archive()
+        self._partial.unlink(missing_ok=True)
+
+    def _stop_writer(self) -> None:
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _close_archive(self) -> None:
+        archive, self._zip, self._tar = self._zip or self._tar, None, None
+        if archive is not None:
+            archive.close()
+
+    def _drain(self) -> None:
+        while True:
+            path = self._queue.get()
+            if path is None:
+                return
+            if self._error is None:
+                try:
+                    self._append(path)
+                except BaseException as exc:  # surfaced by close()
+                    self._error = exc
+
+    def _append(self, path: Path) -> None:
+        name = f"{self.root.name}/{path.relative_to(self.root).as_posix()}"
+        if name in self._added or not path.is_file():
+            return
+        self._added.add(name)
+        digest = hashlib.sha256()
+        with path.open("rb") as source:
+            if self._zip is not None:
+                info = zipfile.ZipInfo.from_file(path, name)
+                info.compress_type = zipfile.ZIP_STORED
+                with self._zip.open(info, "w", force_zip64=info.file_size >= zipfile.ZIP64_LIMIT) as target:
+                    for chunk in iter(lambda: source.read(_ARCHIVE_CHUNK), b""):
+                        digest.update(chunk)
+                        target.write(chunk)
+            else:
+                assert self._tar is not None
+                info = self._tar.gettarinfo(str(path), name)
+                # Render-cache hardlinks would otherwise become tar link entries without data.
+                info.type, info.linkname, info.size = tarfile.REGTYPE, "", os.fstat(source.fileno()).st_size
+                self._tar.addfile(info, _HashingReader(source, digest))
+        self._bytes += path.stat().st_size
+        self._digests.append((name, digest.hexdigest()))
+
+    def _append_bytes(self, name: str, data: bytes) -> None:
+        if self._zip is not None:
+            self._zip.writestr(name, data)
+        else:
+            assert self._tar is not None
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            self._tar.addfile(info, io.BytesIO(data))
+        self._added.add(name)
+        self._bytes += len(data)
+
+
+class _HashingReader:
+    def __init__(self, source: BinaryIO, digest: Any) -> None:
+        self.source = source
+        self.digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.source.read(size)
+        self.digest.update(chunk)
+        return chunk
+
+
+def _archive_order(root: Path) -> Iterator[Path]:
+    """Files under ``root`` that belong in the delivery archive, ``manifests`` directories last."""
+
+    found: List[Path] = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in _ARCHIVE_SKIP_DIRS)
+        found.extend(Path(directory) / name for name in sorted(filenames) if name not in _ARCHIVE_SKIP_FILES)
+    return iter(sorted(found, key=lambda path: ("manifests" in path.relative_to(root).parts[:-1], str(path))))
@@ -0,0 +1,242 @@
+"""Full-text search over every exported transcript."""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .stt.columnar import ColumnarTranscript
+from .stt.transcribe import TranscriptResult
+from .util.errors import CreatorPackError
+
+Transcript = Union[TranscriptResult, ColumnarTranscript]
+
+SEARCH_INDEX_FILENAME = "search.sqlite"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, version INTEGER NOT NULL, indexed_at TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY, job_id TEXT NOT NULL, input TEXT NOT NULL, path TEXT NOT NULL, language TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_by_job ON documents (job_id);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY, document INTEGER NOT NULL, segment INTEGER NOT NULL,
+    start_time REAL NOT NULL, end_time REAL NOT NULL, speaker TEXT NOT NULL, text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_by_document ON segments (document);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text, content = 'segments', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS segments_added AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_removed AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts (segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+class SearchError(CreatorPackError):
+    """Raised for a query the full-text index cannot parse."""
+
+
+@dataclass
+class SearchHit:
+    job_id: str
+    input: str
+    segment: int
+    start: float
+    end: float
+    speaker: str
+    text: str
+    snippet: str
+    transcript: str
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class IndexReport:
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    segments: int = 0
+    wall_seconds: float = 0.0
+
+
+class TranscriptIndex:
+    """SQLite FTS5 index of transcript segments across every job under an export root.
+
+    Segments live in a plain table (job, input, segment id, timestamps,
+    speaker, text) with an external-content FTS5 table over the text, kept in
+    step by triggers, so a query is one index lookup ranked by BM25 however
+    many jobs there are. Each job is recorded with the mtime of its
+    ``manifests/job.json``; :meth:`update` re-reads only jobs whose export
+    changed since, and the pipeline calls :meth:`add_job` as each job completes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def add_job(self, job_id: str, root: Path, transcripts: Iterable[Tuple[str, Path, Transcript]]) -> int:
+        """Replace the job's entries with ``(input, transcript.json path, transcript)`` triples."""
+
+        with self._lock, closing(self._connect()) as conn, conn:
+            return self._replace_job(conn, job_id, _job_version(root), transcripts)
+
+    def update(self, output_dir: Path, *, rebuild: bool = False) -> IndexReport:
+        """Bring the index in line with the completed jobs under ``output_dir``."""
+
+        report = IndexReport()
+        started = time.perf_counter()
+        with self._lock, closing(self._connect()) as conn, conn:
+            if rebuild:
+                conn.execute("DELETE FROM segments")
+                conn.execute("DELETE FROM documents")
+                conn.execute("DELETE FROM jobs")
+            known = dict(conn.execute("SELECT job_id, version FROM jobs"))
+            seen: Set[str] = set()
+            for job_id, root, version in _completed_jobs(output_dir):
+                seen.add(job_id)
+                if known.get(job_id) == version:
+                    report.unchanged += 1
+                    continue
+                report.segments += self._replace_job(conn, job_id, version, _read_transcripts(root))
+                report.indexed += 1
+            for job_id in set(known) - seen:
+                self._remove_job(conn, job_id)
+                report.removed += 1
+        report.wall_seconds = time.perf_counter() - started
+        return report
+
+    def search(self, query: str, *, job_id: Optional[str] = None, limit: int = 20, raw: bool = False) -> List[SearchHit]:
+        """Best matching segments first. Unless ``raw``, every word must appear (``word*`` matches a prefix)."""
+
+        expression = query if raw else match_expression(query)
+        if not expression:
+            return []
+        sql = """
+            SELECT d.job_id, d.input, s.segment, s.start_time, s.end_time, s.speaker, s.text,
+                   snippet(segments_fts, 0, '[', ']', '…', 16), d.path
+            FROM segments_fts
+            JOIN segments s ON s.id = segments_fts.rowid
+            JOIN documents d ON d.id = s.document
+            WHERE segments_fts MATCH ?
+        """
+        params: list = [expression]
+        if job_id is not None:
+            sql += " AND d.job_id = ?"
+            params.append(job_id)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            try:
+                rows = conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as exc:
+                raise SearchError(f"invalid search query {query!r}: {exc}") from exc
+        return [SearchHit(*row) for row in rows]
+
+    def _replace_job(
+        self, conn: sqlite3.Connection, job_id: str, version: int, transcripts: Iterable[Tuple[str, Path, Transcript]]
+    ) -> int:
+        self._remove_job(conn, job_id)
+        count = 0
+        for value, path, transcript in transcripts:
+            document = conn.execute(
+                "INSERT INTO documents (job_id, input, path, language) VALUES (?, ?, ?, ?)",
+                (job_id, value, str(path), transcript.language),
+            ).lastrowid
+            rows = [
+                (document, segment.id, segment.start, segment.end, segment.speaker, segment.text)
+                for segment in transcript.segments
+                if segment.text
+            ]
+            conn.executemany(
+                "INSERT INTO segments (document, segment, start_time, end_time, speaker, text) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            count += len(rows)
+        conn.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, version, indexed_at) VALUES (?, ?, ?)",
+            (job_id, version, datetime.utcnow().isoformat()),
+        )
+        return count
+
+    @staticmethod
+    def _remove_job(conn: sqlite3.Connection, job_id: str) -> None:
+        conn.execute("DELETE FROM segments WHERE document IN (SELECT id FROM documents WHERE job_id = ?)", (job_id,))
+        conn.execute("DELETE FROM documents WHERE job_id = ?", (job_id,))
+        conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0)
+
+
+def match_expression(query: str) -> str:
+    """FTS5 expression requiring every word of ``query``; quoting keeps punctuation literal."""
+
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def format_timestamp(seconds: float) -> str:
+    whole = int(seconds)
+    return f"{whole // 3600:02d}:{whole // 60 % 60:02d}:{whole % 60:02d}"
+
+
+def _completed_jobs(output_dir: Path) -> Iterator[Tuple[str, Path, int]]:
+    """``(job_id, root, version)`` for every export under ``output_dir`` that has a ``job.json``."""
+
+    try:
+        entries = list(os.scandir(output_dir))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.name.startswith(".") or not entry.is_dir():
+            continue
+        root = Path(entry.path)
+        version = _job_version(root)
+        if version:
+            yield entry.name, root, version
+
+
+def _job_version(root: Path) -> int:
+    try:
+        return (root / "manifests" / "job.json").stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _read_transcripts(root: Path) -> Iterator[Tuple[str, Path, Transcript]]:
+    try:
+        index = json.loads((root / "manifests" / "index.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    entries = index.get("inputs") if isinstance(index, dict) else None
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or not entry.get("transcript"):
+            continue
+        path = root / str(entry["transcript"])
+        try:
+            transcript = ColumnarTranscript.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, OverflowError):
+            # Unreadable or not a transcript document: index the job's other inputs.
+            continue
+        yield entry.get("input", ""), path, transcript
@@ -0,0 +1,441 @@
+"""Long-running worker daemon with a local HTTP job API."""
+from __future__ import annotations
+
+import contextvars
+import heapq
+import hmac
+import itertools
+import json
+import os
+import secrets
+import socketserver
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .util.errors import CreatorPackError
+from .util.logging import set_event_sink
+
+
+TERMINAL_STATES = ("completed", "failed", "cancelled")
+KEEP_FINISHED_JOBS = 256
+MAX_JOB_EVENTS = 2000
+
+
+@dataclass
+class ServedJob:
+    """One submitted job and its most recent events (``events[0]`` has seq ``event_count - len(events)``)."""
+
+    id: str
+    job_id: str
+    priority: int
+    options: Any
+    status: str = "queued"  # queued | running | completed | failed | cancelled
+    error: Optional[str] = None
+    exit_code: Optional[int] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    events: Deque[Dict[str, Any]] = field(default_factory=deque)
+    event_count: int = 0
+    cancel: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "job_id": self.job_id,
+            "priority": self.priority,
+            "status": self.status,
+            "error": self.error,
+            "exit_code": self.exit_code,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "output": str(Path(self.options.output_dir) / self.job_id),
+        }
+
+
+class JobService:
+    """Prioritized in-process job queue drained by a fixed set of worker threads.
+
+    Workers live as long as the daemon, so the STT model and probe caches stay
+    warm between jobs. Higher ``priority`` runs first; equal priorities run in
+    submission order. ``prepare`` turns request options into run options (raising
+    on invalid input) and ``execute`` runs one job.
+
+    Memory stays bounded however long the daemon runs: only the
+    ``keep_finished`` most recently finished jobs are kept (older ones answer
+    404), and each job keeps its last ``max_events`` events, so a reader that
+    falls further behind than that resumes from the oldest one still held.
+    """
+
+    def __init__(
+        self,
+        *,
+        prepare: Callable[[Dict[str, Any]], Any],
+        execute: Callable[[Any], Any],
+        workers: int = 1,
+        keep_finished: int = KEEP_FINISHED_JOBS,
+        max_events: int = MAX_JOB_EVENTS,
+    ) -> None:
+        self._prepare = prepare
+        self._execute = execute
+        self._keep_finished = max(keep_finished, 0)
+        self._max_events = max(max_events, 1)
+        self._jobs: Dict[str, ServedJob] = {}
+        self._finished: Deque[str] = deque()  # finished job ids, oldest first
+        self._active: Dict[str, ServedJob] = {}  # run job id -> queued/running job
+        self._queue: List[Tuple[int, int, str]] = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"creatorpack-serve-{index}", daemon=True)
+            for index in range(max(workers, 1))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, values: Dict[str, Any], *, priority: int = 0) -> ServedJob:
+        return self.enqueue(self._prepare(values), priority=priority)
+
+    def enqueue(self, options: Any, *, priority: int = 0) -> ServedJob:
+        """Queue already-prepared run options."""
+
+        with self._cond:
+            # Resubmitting identical work while it is still pending returns the existing job.
+            existing = self._active.get(options.job_id)
+            if existing is not None:
+                return existing
+            job = ServedJob(
+                id=uuid.uuid4().hex[:12],
+                job_id=options.job_id,
+                priority=priority,
+                options=options,
+                events=deque(maxlen=self._max_events),
+            )
+            options.cancel = job.cancel
+            self._jobs[job.id] = job
+            self._active[job.job_id] = job
+            heapq.heappush(self._queue, (-priority, next(self._order), job.id))
+            self._record(job, {"message": "job_queued", "priority": priority})
+            self._cond.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Optional[ServedJob]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[ServedJob]:
+        with self._cond:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[ServedJob]:
+        """Cancel a queued job outright; a running job stops before its next task."""
+
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return job
+            job.cancel.set()
+            if job.status == "queued":
+                self._finish(job, "cancelled")
+            else:
+                self._record(job, {"message": "job_cancel_requested"})
+            return job
+
+    def events(self, job_id: str, since: int = 0, timeout: float = 30.0) -> Tuple[List[Dict[str, Any]], bool]:
+        """Events from seq ``since`` on, waiting up to ``timeout`` for new ones; also whether the job ended.
+
+        Events already dropped from the job's buffer are skipped, and a job no
+        longer retained reads as ended with no events.
+        """
+
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return [], True
+            while job.event_count <= since and not job.done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            start = max(since - (job.event_count - len(job.events)), 0)
+            return list(itertools.islice(job.events, start, None)), job.done
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop taking work and cancel what is still queued or running."""
+
+        with self._cond:
+            self._stopping = True
+            for job in self._jobs.values():
+                if not job.done:
+                    job.cancel.set()
+                    if job.status == "queued":
+                        self._finish(job, "cancelled")
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopping and not self._queue:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                _, _, job_id = heapq.heappop(self._queue)
+                job = self._jobs.get(job_id)
+                if job is None or job.status != "queued":
+                    continue
+                job.status = "running"
+                job.started_at = time.time()
+                self._record(job, {"message": "job_running"})
+            # A fresh context per job keeps its log routing and event sink separate from other jobs.
+            contextvars.Context().run(self._run, job)
+
+    def _run(self, job: ServedJob) -> None:
+        set_event_sink(lambda data: self._event(job, data))
+        try:
+            self._execute(job.options)
+        except Exception as exc:
+            with self._cond:
+                job.error = str(exc) or exc.__class__.__name__
+                job.exit_code = getattr(exc, "exit_code", None)
+                self._finish(job, "cancelled" if job.cancel.is_set() else "failed")
+        else:
+            with self._cond:
+                self._finish(job, "completed")
+
+    def _event(self, job: ServedJob, data: Dict[str, Any]) -> None:
+        with self._cond:
+            self._record(job, data)
+
+    def _finish(self, job: ServedJob, status: str) -> None:
+        self._active.pop(job.job_id, None)
+        job.status = status
+        job.finished_at = time.time()
+        self._record(job, {"message": f"job_{status}", "error": job.error})
+        self._finished.append(job.id)
+        while len(self._finished) > self._keep_finished:
+            self._jobs.pop(self._finished.popleft(), None)
+
+    def _record(self, job: ServedJob, data: Dict[str, Any]) -> None:
+        # Callers hold ``self._cond``.
+        event = {key: value for key, value in data.items() if _json_safe(value)}
+        event.update({"seq": job.event_count, "time": time.time()})
+        job.events.append(event)
+        job.event_count += 1
+        self._cond.notify_all()
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """Routes ``/health``, ``/jobs``, ``/jobs/<id>``, ``/jobs/<id>/cancel`` and ``/jobs/<id>/events``.
+
+    Every request must carry a ``Host`` header naming the bound address (DNS rebinding), and
+    the mutating routes additionally need ``Authorization: Bearer <token>``; ``POST /jobs``
+    only accepts ``application/json`` bodies so browsers cannot send it as a simple request.
+    """
+
+    server_version = "creatorpack"
+    protocol_version = "HTTP/1.1"
+    service: JobService
+    token: str
+    allowed_hosts: FrozenSet[str] = frozenset()  # empty: no Host check (Unix socket, wildcard bind)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if not self._check_host():
+            return
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif parts == ["jobs"]:
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.service.list()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            self._with_job(parts[1], lambda job: self._send_json(HTTPStatus.OK, job.to_dict()))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            try:
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+                if since < 0:
+                    raise ValueError("must not be negative")
+            except ValueError as exc:
+                self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"invalid since: {exc}"})
+                return
+            self._with_job(parts[1], lambda job: self._stream_events(job, since))
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        if not (self._check_host() and self._check_token()):
+            return
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        if parts == ["jobs"]:
+            content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+            if content_type != "application/json":
+                self._send_json(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, {"error": "expected application/json"})
+                return
+            self._submit()
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            self._cancel(parts[1])
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    def do_DELETE(self) -> None:  # noqa: N802 - http.server naming
+        if not (self._check_host() and self._check_token()):
+            return
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        if len(parts) == 2 and parts[0] == "jobs":
+            self._cancel(parts[1])
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - keep the daemon quiet
+        return
+
+    def _check_host(self) -> bool:
+        host = (self.headers.get("Host") or "").strip().lower()
+        if self.allowed_hosts and host not in self.allowed_hosts:
+            self._send_json(HTTPStatus.FORBIDDEN, {"error": f"unexpected Host header '{host}'"})
+            return False
+        return True
+
+    def _check_token(self) -> bool:
+        scheme, _, supplied = (self.headers.get("Authorization") or "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip().encode(), self.token.encode()):
+            self._send_json(HTTPStatus.UNAUTHORIZED, {"error": "missing or invalid bearer token"})
+            return False
+        return True
+
+    def _submit(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict) or not isinstance(body.get("options", {}), dict):
+                raise ValueError("expected {\"options\": {...}, \"priority\": int}")
+            job = self.service.submit(body.get("options", {}), priority=int(body.get("priority", 0)))
+        except (ValueError, TypeError) as exc:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"invalid request: {exc}"})
+        except Exception as exc:  # option validation: CreatorPackError or click usage errors
+            self._send_json(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {"error": str(exc), "exit_code": getattr(exc, "exit_code", None)},
+            )
+        else:
+            self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def _cancel(self, job_id: str) -> None:
+        job = self.service.cancel(job_id)
+        if job is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown job '{job_id}'"})
+        else:
+            self._send_json(HTTPStatus.OK, job.to_dict())
+
+    def _with_job(self, job_id: str, respond: Callable[[ServedJob], None]) -> None:
+        job = self.service.get(job_id)
+        if job is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown job '{job_id}'"})
+        else:
+            respond(job)
+
+    def _stream_events(self, job: ServedJob, since: int) -> None:
+        """NDJSON event stream (chunked) that ends once the job reaches a terminal state."""
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        done = False
+        while not done:
+            events, done = self.service.events(job.id, since)
+            if events:
+                since = events[-1]["seq"] + 1
+                payload = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events).encode("utf-8")
+                self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+                self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_json(self, status: HTTPStatus, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):  # type: ignore[override]
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects an (host, port) style client address.
+        return request, ("unix", 0)
+
+
+def create_server(
+    service: JobService,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[Path] = None,
+    token: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """Bind the job API on ``host:port``, or on a Unix socket when ``socket_path`` is given.
+
+    Mutating routes require ``token`` (generated when omitted); it is exposed as ``server.token``.
+    """
+
+    token = token or secrets.token_urlsafe(32)
+    handler = type("JobRequestHandler", (_JobRequestHandler,), {"service": service, "token": token})
+    if socket_path is not None:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise CreatorPackError("Unix sockets are not supported on this platform")
+        if socket_path.exists():
+            socket_path.unlink()
+        server = _UnixHTTPServer(str(socket_path), handler)
+        os.chmod(socket_path, 0o600)
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        handler.allowed_hosts = _allowed_hosts(host, server.server_address[1])
+    server.token = token  # type: ignore[attr-defined]
+    return server
+
+
+def write_token(path: Path, token: str) -> None:
+    """Write the daemon token readable by the owner only."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        os.fchmod(handle.fileno(), 0o600)
+        handle.write(token + "\n")
+
+
+def _allowed_hosts(host: str, port: int) -> FrozenSet[str]:
+    if host in ("", "0.0.0.0", "::"):
+        # Wildcard binds are reached under names we cannot know; the token still guards writes.
+        return frozenset()
+    names = {"127.0.0.1", "localhost", "[::1]", f"[{host}]" if ":" in host else host.lower()}
+    return frozenset(f"{name}:{port}" for name in names)
+
+
+def _json_safe(value: Any) -> bool:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
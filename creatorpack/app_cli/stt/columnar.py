@@ -0,0 +1,304 @@
+"""Array-backed transcript storage with a memory-mapped binary format."""
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union, overload
+
+from ..util.io import write_bytes_atomic
+from .transcribe import TranscriptResult, TranscriptSegment
+
+COLUMNAR_SUFFIX = ".cptr"
+MAGIC = b"CPTR"
+FORMAT_VERSION = 1
+# magic, version, flags, segment count, speaker count, language bytes, text bytes
+_HEADER = struct.Struct("<4sHHQIIQ")
+_LENGTH = struct.Struct("<I")
+# Column typecodes, shared by ``array`` and ``memoryview.cast``; the file is always little-endian.
+_ID, _TIME, _SPEAKER, _OFFSET = "q", "d", "I", "Q"
+# Lone surrogates survive a JSON round trip, so they must survive this one too.
+_ERRORS = "surrogatepass"
+
+
+class ColumnarTranscript:
+    """A transcript held as columns instead of one dataclass per segment.
+
+    Ids, start and end times and speaker indices are typed arrays, speakers are
+    interned in a small table, and all segment text lives in one UTF-8 buffer
+    addressed by an offsets column. :meth:`save` writes the columns back to back
+    (8-byte aligned) and :meth:`load` maps the file and casts each column in
+    place, so reopening a long transcript costs neither a parse nor a copy.
+
+    It reads like a :class:`TranscriptResult` (``language``, ``segments``,
+    ``to_dict``, ``to_text``), with segments built on access, and converts to
+    and from the ``transcript.json`` schema losslessly.
+    """
+
+    def __init__(
+        self,
+        language: str,
+        ids: Sequence[int],
+        starts: Sequence[float],
+        ends: Sequence[float],
+        speaker_index: Sequence[int],
+        speakers: List[str],
+        offsets: Sequence[int],
+        text: Union[bytes, memoryview],
+        *,
+        mapping: Optional[mmap.mmap] = None,
+    ) -> None:
+        self.language = language
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+        self.speaker_index = speaker_index
+        self.speakers = speakers
+        self.offsets = offsets
+        self.text = text
+        self._mapping = mapping
+
+    @classmethod
+    def from_result(cls, transcript: TranscriptResult) -> "ColumnarTranscript":
+        builder = _Builder()
+        for segment in transcript.segments:
+            builder.append(segment.id, segment.start, segment.end, segment.text, segment.speaker)
+        return builder.build(transcript.language)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnarTranscript":
+        """Build the columns straight from ``transcript.json`` data, without segment objects."""
+
+        builder = _Builder()
+        for segment in data["segments"]:
+            builder.append(
+                segment["id"], segment["start"], segment["end"], segment["text"], segment.get("speaker", "S1")
+            )
+        return builder.build(data["language"])
+
+    def to_result(self) -> TranscriptResult:
+        return TranscriptResult(language=self.language, segments=list(self.segments))
+
+    def to_dict(self) -> dict:
+        return {
+            "language": self.language,
+            "segments": [
+                {
+                    "id": self.ids[index],
+                    "start": self.starts[index],
+                    "end": self.ends[index],
+                    "text": self.text_at(index),
+                    "speaker": self.speakers[self.speaker_index[index]],
+                }
+                for index in range(len(self))
+            ],
+        }
+
+    def to_text(self) -> str:
+        return "\n".join(text for text in map(self.text_at, range(len(self))) if text).strip() + "\n"
+
+    @property
+    def segments(self) -> "_SegmentView":
+        return _SegmentView(self)
+
+    def segment(self, index: int) -> TranscriptSegment:
+        return TranscriptSegment(
+            id=self.ids[index],
+            start=self.starts[index],
+            end=self.ends[index],
+            text=self.text_at(index),
+            speaker=self.speakers[self.speaker_index[index]],
+        )
+
+    def text_at(self, index: int) -> str:
+        return str(self.text[self.offsets[index] : self.offsets[index + 1]], "utf-8", _ERRORS)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def save(self, path: Path) -> None:
+        """Write the binary form atomically (temp file, then rename)."""
+
+        language = self.language.encode("utf-8", _ERRORS)
+        parts = [
+            _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self), len(self.speakers), len(language), len(self.text)),
+            language,
+        ]
+        table = b"".join(_LENGTH.pack(len(name)) + name for name in (s.encode("utf-8", _ERRORS) for s in self.speakers))
+        for section in (
+            table,
+            _column_bytes(_ID, self.ids),
+            _column_bytes(_TIME, self.starts),
+            _column_bytes(_TIME, self.ends),
+            _column_bytes(_SPEAKER, self.speaker_index),
+            _column_bytes(_OFFSET, self.offsets),
+        ):
+            parts.append(bytes(-sum(map(len, parts)) % 8))
+            parts.append(section)
+        parts.append(bytes(self.text))
+        write_bytes_atomic(path, b"".join(parts))
+
+    @classmethod
+    def load(cls, path: Path) -> "ColumnarTranscript":
+        """Map ``path`` read-only; columns are views into the mapping.
+
+        Raises :class:`ValueError` for a file that is not a (complete) columnar
+        transcript, so callers can treat it like unreadable JSON.
+        """
+
+        with open(path, "rb") as stream:
+            try:
+                mapping = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:  # empty file
+                raise ValueError(f"{path} is not a columnar transcript") from exc
+        view = memoryview(mapping)
+        columns: List[Sequence] = []
+        try:
+            if len(view) < _HEADER.size:
+                raise ValueError(f"{path} is not a columnar transcript")
+            magic, version, _flags, count, speaker_count, language_size, text_size = _HEADER.unpack_from(view)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a version {FORMAT_VERSION} columnar transcript")
+            cursor = _HEADER.size
+            language = str(view[cursor : cursor + language_size], "utf-8", _ERRORS)
+            cursor += language_size
+            cursor += -cursor % 8
+            speakers: List[str] = []
+            for _ in range(speaker_count):
+                (size,) = _LENGTH.unpack_from(view, cursor)
+                speakers.append(str(view[cursor + 4 : cursor + 4 + size], "utf-8", _ERRORS))
+                cursor += 4 + size
+            for code, length in ((_ID, count), (_TIME, count), (_TIME, count), (_SPEAKER, count), (_OFFSET, count + 1)):
+                cursor += -cursor % 8
+                size = length * struct.calcsize(code)
+                columns.append(_column_view(view[cursor : cursor + size], code, size))
+                cursor += size
+            if len(view) != cursor + text_size:
+                raise ValueError(f"{path} is truncated")
+            text = view[cursor:]
+        except (ValueError, struct.error) as exc:
+            for column in columns:
+                if isinstance(column, memoryview):
+                    column.release()
+            view.release()
+            mapping.close()
+            raise ValueError(str(exc)) from exc
+        ids, starts, ends, speaker_index, offsets = columns
+        return cls(language, ids, starts, ends, speaker_index, speakers, offsets, text, mapping=mapping)
+
+    def close(self) -> None:
+        """Release a mapped file; the transcript is unusable afterwards."""
+
+        if self._mapping is None:
+            return
+        for column in (self.ids, self.starts, self.ends, self.speaker_index, self.offsets, self.text):
+            if isinstance(column, memoryview):
+                column.release()
+        self._mapping.close()
+        self._mapping = None
+
+    def __enter__(self) -> "ColumnarTranscript":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+class _SegmentView(Sequence):
+    """``TranscriptResult.segments`` look-alike that builds each segment when it is read."""
+
+    def __init__(self, transcript: ColumnarTranscript) -> None:
+        self._transcript = transcript
+
+    def __len__(self) -> int:
+        return len(self._transcript)
+
+    @overload
+    def __getitem__(self, index: int) -> TranscriptSegment: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[TranscriptSegment]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._transcript.segment(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return self._transcript.segment(index)
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        return map(self._transcript.segment, range(len(self)))
+
+
+class _Builder:
+    def __init__(self) -> None:
+        self.ids = array(_ID)
+        self.starts = array(_TIME)
+        self.ends = array(_TIME)
+        self.speaker_index = array(_SPEAKER)
+        self.speakers: Dict[str, int] = {}
+        self.offsets = array(_OFFSET, [0])
+        self.text = bytearray()
+
+    def append(self, id: int, start: float, end: float, text: str, speaker: str) -> None:
+        self.ids.append(id)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.speaker_index.append(self.speakers.setdefault(speaker, len(self.speakers)))
+        self.text += text.encode("utf-8", _ERRORS)
+        self.offsets.append(len(self.text))
+
+    def build(self, language: str) -> ColumnarTranscript:
+        return ColumnarTranscript(
+            language,
+            self.ids,
+            self.starts,
+            self.ends,
+            self.speaker_index,
+            list(self.speakers),
+            self.offsets,
+            bytes(self.text),
+        )
+
+
+def _column_bytes(code: str, column: Sequence) -> bytes:
+    if isinstance(column, memoryview):
+        return column.tobytes()
+    values = column if isinstance(column, array) and column.typecode == code else array(code, column)
+    if sys.byteorder == "little":
+        return values.tobytes()
+    swapped = array(code, values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _column_view(raw: memoryview, code: str, size: int) -> Sequence:
+    if len(raw) != size:
+        raise ValueError("transcript column is truncated")
+    if sys.byteorder == "little":
+        return raw.cast(code)
+    values = array(code, raw.tobytes())
+    values.byteswap()
+    return values
+
+
+def store_transcript(transcript: Union[TranscriptResult, ColumnarTranscript], path: Path) -> dict:
+    """Save ``transcript`` to ``path`` and return the small JSON record that points at it."""
+
+    if not isinstance(transcript, ColumnarTranscript):
+        transcript = ColumnarTranscript.from_result(transcript)
+    transcript.save(path)
+    return {"columnar": str(path), "segments": len(transcript)}
+
+
+def restore_transcript(data: dict) -> Union[TranscriptResult, ColumnarTranscript]:
+    """Inverse of :func:`store_transcript`; records that hold the transcript inline still load."""
+
+    if "columnar" not in data:
+        return TranscriptResult.from_dict(data)
+    return ColumnarTranscript.load(Path(data["columnar"]))
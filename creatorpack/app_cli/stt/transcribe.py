@@ -1,7 +1,9 @@
 """faster-whisper transcription wrapper."""
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -12,6 +14,10 @@ class TranscriptionError(CreatorPackError):
     exit_code = ExitCodes.TRANSCRIPTION_ERROR
 
 
+# One inference at a time per process: the model is shared by every job in a warm batch/serve run.
+_STT_LOCK = threading.Lock()
+
+
 @dataclass
 class TranscriptSegment:
     id: int
@@ -41,6 +47,13 @@ class TranscriptResult:
             ],
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "TranscriptResult":
+        return cls(
+            language=data["language"],
+            segments=[TranscriptSegment(**segment) for segment in data["segments"]],
+        )
+
     def to_text(self) -> str:
         return "\n".join(segment.text for segment in self.segments if segment.text).strip() + "\n"
 
@@ -52,15 +65,27 @@ def ensure_faster_whisper_available() -> None:
         raise TranscriptionError("faster-whisper is not available") from exc
 
 
+def transcription_engine() -> str:
+    """Identify the engine :func:`transcribe_media` will use, for cache keys."""
+
+    try:
+        from faster_whisper import WhisperModel  # type: ignore  # noqa: F401
+    except Exception:  # pragma: no cover - optional dependency
+        return "fallback"
+    return "faster-whisper:base"
+
+
 def transcribe_media(path: Path, diarize: bool = False) -> TranscriptResult:
     try:
-        from faster_whisper import WhisperModel  # type: ignore
+        from faster_whisper import WhisperModel  # type: ignore  # noqa: F401
     except Exception:  # pragma: no cover - optional dependency
         return _dummy_transcript(path)
 
     try:
-        model = WhisperModel("base", device="auto")
-        segments, info = model.transcribe(str(path), beam_size=1)
+        with _STT_LOCK:
+            model = _load_model("base")
+            segments, info = model.transcribe(str(path), beam_size=1)
+            segments = list(segments)
     except Exception as exc:  # pragma: no cover - actual inference heavy
         raise TranscriptionError(str(exc)) from exc
 
@@ -80,6 +105,15 @@ def transcribe_media(path: Path, diarize: bool = False) -> TranscriptResult:
     return TranscriptResult(language=language, segments=transcript_segments)
 
 
+@lru_cache(maxsize=2)
+def _load_model(size: str):  # pragma: no cover - optional dependency
+    """Load a WhisperModel once per process so later jobs skip the model load."""
+
+    from faster_whisper import WhisperModel  # type: ignore
+
+    return WhisperModel(size, device="auto")
+
+
 def _dummy_transcript(path: Path) -> TranscriptResult:
     # Basic fallback splitting the duration into placeholder segments
     from ..media.ffmpeg_ops import probe_media, FFmpegError
@@ -0,0 +1,83 @@
+"""Output templates and the pipeline stages each one needs."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List
+
+
+STAGES = (
+    "transcribe",
+    "silence_trim",
+    "chapter_plan",
+    "render_chapters",
+    "branded_chapters",
+    "highlight_plan",
+    "render_highlights",
+    "branded_highlights",
+)
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    """Declares which deliverables a template produces."""
+
+    name: str
+    chapters: bool
+    highlights: bool
+    transcript: bool
+    silence_trim: bool = False
+    force_highlights: bool = False
+
+
+TEMPLATES: Dict[str, TemplateSpec] = {
+    "creator-pack": TemplateSpec(name="creator-pack", chapters=True, highlights=True, transcript=True),
+    "podcast": TemplateSpec(name="podcast", chapters=True, highlights=True, transcript=True, silence_trim=True),
+    "chapters-only": TemplateSpec(name="chapters-only", chapters=True, highlights=False, transcript=False),
+    "shorts-only": TemplateSpec(
+        name="shorts-only", chapters=False, highlights=True, transcript=False, force_highlights=True
+    ),
+}
+
+
+@dataclass
+class StagePlan:
+    """Resolved set of stages for one run; anything not enabled is never computed."""
+
+    template: str
+    enabled: FrozenSet[str]
+
+    def runs(self, stage: str) -> bool:
+        return stage in self.enabled
+
+    @property
+    def skipped(self) -> List[str]:
+        return [stage for stage in STAGES if stage not in self.enabled]
+
+    def to_dict(self) -> dict:
+        return {
+            "run": [stage for stage in STAGES if stage in self.enabled],
+            "skipped": self.skipped,
+        }
+
+
+def plan_stages(template: str, *, smart: bool, highlights: bool, branded: bool) -> StagePlan:
+    """Return the stages a template needs given the per-run flags."""
+
+    spec = TEMPLATES[template]
+    want_highlights = spec.highlights and (highlights or spec.force_highlights)
+    enabled = set()
+    if spec.chapters:
+        enabled.update({"chapter_plan", "render_chapters"})
+        if branded:
+            enabled.add("branded_chapters")
+    if want_highlights:
+        enabled.update({"highlight_plan", "render_highlights"})
+        if branded:
+            enabled.add("branded_highlights")
+    if spec.silence_trim and spec.chapters:
+        enabled.add("silence_trim")
+    # Transcription only runs when something consumes it: the transcript deliverable,
+    # sentence-aligned chapters, highlight scoring or caption remapping.
+    if spec.transcript or want_highlights or (spec.chapters and smart):
+        enabled.add("transcribe")
+    return StagePlan(template=template, enabled=frozenset(enabled))
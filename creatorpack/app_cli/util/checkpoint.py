@@ -0,0 +1,146 @@
+"""Persisted job progress for crash-safe resume."""
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, TypeVar
+
+from .io import dump_json
+from .logging import job_logger
+
+
+T = TypeVar("T")
+
+STATE_FILENAME = "job.state.json"
+# Rendered clips may differ from their planned length by up to this much (keyframes, audio padding).
+DURATION_TOLERANCE_SECONDS = 1.0
+
+
+class JobCheckpoint:
+    """Job state file (``<export root>/job.state.json``) rewritten atomically after every step.
+
+    Stage results are stored inline; rendered artifacts are recorded with their
+    size and expected duration. With ``resume=True`` an existing state file is
+    loaded and steps already recorded are skipped, provided their artifacts
+    still verify; otherwise the state starts empty.
+    """
+
+    def __init__(self, root: Path, job_id: str, *, resume: bool = False) -> None:
+        self.path = root / STATE_FILENAME
+        self.root = root
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {"job_id": job_id, "status": "running", "stages": {}, "artifacts": {}}
+        self.resumed = 0
+        if resume and self.path.exists():
+            try:
+                previous = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                previous = None
+            if isinstance(previous, dict) and previous.get("job_id") == job_id:
+                self._state["stages"] = previous.get("stages", {})
+                self._state["artifacts"] = previous.get("artifacts", {})
+        self._flush()
+
+    def memo(
+        self,
+        name: str,
+        compute: Callable[[], T],
+        *,
+        encode: Callable[[T], Any] = lambda value: value,
+        decode: Callable[[Any], T] = lambda data: data,
+    ) -> T:
+        """Return the recorded result of step ``name``, or compute and record it."""
+
+        with self._lock:
+            entry = self._state["stages"].get(name)
+        if entry is not None:
+            try:
+                value = decode(entry["result"])
+            except (OSError, ValueError):
+                pass
+            else:
+                self._resumed(name)
+                return value
+        value = compute()
+        with self._lock:
+            self._state["stages"][name] = {"result": encode(value), "at": _now()}
+            self._flush()
+        return value
+
+    def restore_artifact(self, name: str, files: Sequence[Path]) -> Optional[dict]:
+        """Metadata of a recorded artifact whose files still verify, else ``None``."""
+
+        with self._lock:
+            entry = self._state["artifacts"].get(name)
+        if entry is None or not _verify(self.root, entry, files):
+            return None
+        self._resumed(name)
+        return entry.get("meta") or {}
+
+    def record_artifact(
+        self, name: str, files: Sequence[Path], *, duration: Optional[float] = None, meta: Optional[dict] = None
+    ) -> None:
+        records = []
+        for path in files:
+            record: Dict[str, Any] = {"path": _relative(self.root, path), "size": path.stat().st_size if path.exists() else None}
+            if duration is not None and path.suffix != ".srt":
+                record["duration"] = round(duration, 3)
+            records.append(record)
+        with self._lock:
+            self._state["artifacts"][name] = {"files": records, "meta": meta or {}, "at": _now()}
+            self._flush()
+
+    def finish(self, status: str, *, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._state["status"] = status
+            if error:
+                self._state["error"] = error
+            self._flush()
+
+    def _resumed(self, name: str) -> None:
+        with self._lock:
+            self.resumed += 1
+        job_logger().info("checkpoint_resumed", extra={"step": name})
+
+    def _flush(self) -> None:
+        # Callers hold the lock (or are the constructor).
+        self._state["updated_at"] = _now()
+        # fsync'd like the manifests: a resume must never find a recorded step whose state was lost in a crash.
+        dump_json(self._state, self.path)
+
+
+def _verify(root: Path, entry: dict, files: Sequence[Path]) -> bool:
+    records = {record["path"]: record for record in entry.get("files", [])}
+    for path in files:
+        record = records.get(_relative(root, path))
+        if record is None or not path.exists() or path.stat().st_size != record.get("size"):
+            return False
+        expected = record.get("duration")
+        if expected is not None:
+            actual = _media_duration(path)
+            if actual is not None and abs(actual - expected) > DURATION_TOLERANCE_SECONDS:
+                return False
+    return True
+
+
+def _media_duration(path: Path) -> Optional[float]:
+    from ..media.ffmpeg_ops import FFmpegError, probe_media
+
+    try:
+        return probe_media(path).duration
+    except (FFmpegError, OSError, ValueError):
+        # Without ffprobe only the size check applies.
+        return None
+
+
+def _relative(root: Path, path: Path) -> str:
+    try:
+        return path.resolve().relative_to(root.resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
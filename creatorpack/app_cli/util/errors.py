@@ -13,6 +13,7 @@ class ExitCodes:
     DOWNLOAD_FAILED = 4
     MEDIA_ERROR = 5
     TRANSCRIPTION_ERROR = 6
+    PARTIAL_FAILURE = 7
 
 
 class CreatorPackError(Exception):
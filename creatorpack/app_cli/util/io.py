@@ -2,10 +2,198 @@
 from __future__ import annotations
 
 import json
+import os
+import shutil
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 
+from .logging import job_logger
+
+try:  # pragma: no cover - optional dependency
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def encode_json(data: Any, *, compact: bool = False) -> bytes:
+    """UTF-8 JSON, indented unless ``compact``; uses orjson when installed, else the stdlib."""
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2)
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            pass  # values orjson rejects (e.g. integers beyond 64 bits) still encode below
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def dump_json(data: Any, path: Path, *, compact: bool = False) -> None:
+    """Write ``data`` as JSON atomically and durably (see :func:`write_bytes_atomic`)."""
+
+    write_bytes_atomic(path, encode_json(data, compact=compact), fsync=True)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write ``text`` to a temp file next to ``path`` and rename it into place."""
+
+    write_bytes_atomic(path, text.encode("utf-8"))
+
+
+def write_bytes_atomic(path: Path, data: bytes, *, fsync: bool = False, sync_dir: bool = True) -> None:
+    """Write ``data`` to a temp file next to ``path`` and rename it into place.
+
+    With ``fsync`` the file is flushed to disk before the rename and, unless
+    ``sync_dir`` is off, the directory entry after it, so a crash leaves either
+    the old or the new file, never a truncated one.
+    """
 
-def dump_json(data: Any, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    handle, temp = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    try:
+        with os.fdopen(handle, "wb") as stream:
+            stream.write(data)
+            if fsync:
+                stream.flush()
+                os.fsync(stream.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+    if fsync and sync_dir:
+        fsync_dir(path.parent)
+
+
+def fsync_dir(directory: Path) -> None:
+    try:
+        handle = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(handle)
+    except OSError:  # pragma: no cover - some filesystems refuse directory fsync
+        pass
+    finally:
+        os.close(handle)
+
+
+class ManifestWriter:
+    """Collects a job's manifests and writes them together at the end.
+
+    :meth:`stage` keeps the latest payload per path in first-staged order,
+    so the manifest staged last is written last; :meth:`flush`
+    encodes each one, writes it atomically with an ``fsync`` and then syncs
+    each directory once. ``compact`` drops indentation for large payloads.
+    """
+
+    def __init__(self) -> None:
+        self._staged: Dict[Path, Tuple[Any, bool]] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, data: Any, path: Path, *, compact: bool = False) -> None:
+        with self._lock:
+            self._staged[path] = (data, compact)
+
+    def exists(self, path: Path) -> bool:
+        """True when ``path`` is staged or already on disk."""
+
+        with self._lock:
+            staged = path in self._staged
+        return staged or path.exists()
+
+    def flush(self) -> int:
+        with self._lock:
+            staged, self._staged = self._staged, {}
+        directories: Set[Path] = set()
+        written = 0
+        for path, (data, compact) in staged.items():
+            payload = encode_json(data, compact=compact)
+            write_bytes_atomic(path, payload, fsync=True, sync_dir=False)
+            directories.add(path.parent)
+            written += len(payload)
+        for directory in sorted(directories):
+            fsync_dir(directory)
+        if staged:
+            job_logger().info("manifests_written", extra={"files": len(staged), "bytes": written})
+        return len(staged)
+
+
+# Linux FICLONE ioctl: share the source's extents copy-on-write (btrfs, XFS, bcachefs).
+_FICLONE = 0x40049409
+
+
+def clone_file(source: Path, destination: Path) -> str:
+    """Materialize ``source`` at ``destination`` as cheaply as the filesystem allows.
+
+    Tries a reflink first (a private copy-on-write clone), then a hardlink, and
+    copies only when neither works (different filesystems, unsupported FS).
+    ``destination`` must not exist. Returns ``"reflink"``, ``"hardlink"`` or ``"copy"``.
+    """
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if reflink_file(source, destination):
+        return "reflink"
+    try:
+        os.link(source, destination)
+        return "hardlink"
+    except OSError:
+        shutil.copy2(source, destination)
+        return "copy"
+
+
+def reflink_file(source: Path, destination: Path) -> bool:
+    """Create ``destination`` as a copy-on-write clone of ``source``; ``False`` when unsupported."""
+
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - not available on Windows
+        return False
+    try:
+        with open(source, "rb") as src, open(destination, "xb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            except OSError:
+                cloned = False
+            else:
+                cloned = True
+    except OSError:
+        return False
+    if cloned:
+        shutil.copystat(source, destination)
+    else:
+        destination.unlink(missing_ok=True)
+    return cloned
+
+
+def copy_with_progress(
+    source: Path,
+    destination: Path,
+    progress: Optional[Callable[[int, int], None]] = None,
+    *,
+    chunk_size: int = 8 * 1024 * 1024,
+) -> None:
+    """Copy ``source`` in ``chunk_size`` blocks, calling ``progress(copied, total)`` after each.
+
+    The data goes to a temp file next to ``destination`` that is renamed into
+    place at the end, so an interrupted copy never looks complete.
+    """
+
+    total = source.stat().st_size
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp = tempfile.mkstemp(prefix=f".{destination.name}-", dir=destination.parent)
+    copied = 0
+    try:
+        with open(source, "rb") as src, os.fdopen(handle, "wb") as dst:
+            for block in iter(lambda: src.read(chunk_size), b""):
+                dst.write(block)
+                copied += len(block)
+                if progress is not None:
+                    progress(copied, total)
+        shutil.copystat(source, temp)
+        os.replace(temp, destination)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
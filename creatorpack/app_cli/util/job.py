@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Iterable
 
 from ..ingest.sources import IngestInput
+from .fingerprint import content_fingerprint
 
 
 def compute_job_id(
@@ -20,37 +21,51 @@ def compute_job_id(
     brand_path: Path | None,
     diarize: bool,
     localize: str | None,
+    vertical_shorts: bool = False,
+    renditions: list[str] | None = None,
+    loudness: dict | None = None,
+    audio_only: bool = False,
+    audio_format: str = "m4a",
+    full_hash: bool = False,
 ) -> str:
-    """Return a deterministic job id based on inputs and parameters."""
+    """Return a deterministic job id based on inputs and parameters.
+
+    Local inputs count by content, so a touched, copied or renamed file keeps
+    its job id and the same recording under two names is one job.
+    """
+    fingerprints = [input_fingerprint(item, full=full_hash) for item in inputs]
     payload = {
-        "inputs": [_input_fingerprint(item) for item in sorted(inputs, key=lambda i: (i.kind, i.value))],
+        "inputs": sorted(fingerprints, key=lambda item: json.dumps(item, sort_keys=True)),
         "template": template,
         "minutes": minutes,
         "smart": smart,
         "highlights": highlights,
         "highlight_config": highlight_config,
-        "brand": _path_fingerprint(brand_path),
+        "brand": path_fingerprint(brand_path),
         "diarize": diarize,
         "localize": localize,
+        "vertical_shorts": vertical_shorts,
+        "renditions": renditions or [],
+        "loudness": loudness,
+        "audio_only": audio_only,
+        "audio_format": audio_format,
     }
     digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
     return f"job-{digest[:12]}"
 
 
-def _input_fingerprint(ingest: IngestInput) -> dict:
+def input_fingerprint(ingest: IngestInput, *, full: bool = False) -> dict:
     if ingest.kind != "local":
         return {"kind": ingest.kind, "value": ingest.value}
     path = Path(ingest.value)
-    stat = path.stat()
     return {
         "kind": ingest.kind,
-        "value": str(path.resolve()),
-        "mtime": stat.st_mtime,
-        "size": stat.st_size,
+        "content": content_fingerprint(path, full=full),
+        "size": path.stat().st_size,
     }
 
 
-def _path_fingerprint(path: Path | None) -> dict | None:
+def path_fingerprint(path: Path | None) -> dict | None:
     if path is None:
         return None
     resolved = path.resolve()
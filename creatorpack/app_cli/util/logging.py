@@ -1,41 +1,111 @@
 """Structured logging helpers."""
 from __future__ import annotations
 
+import contextvars
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 
 _LOGGER_NAME = "creatorpack.job"
 _RESERVED_LOG_RECORD_KEYS = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys())
+# Which job log the current context writes to; lets several jobs share one warm process.
+_ACTIVE_LOG: contextvars.ContextVar[Optional[Path]] = contextvars.ContextVar("creatorpack_job_log", default=None)
+# Optional per-context listener that also receives each record (used to stream job events).
+_EVENT_SINK: contextvars.ContextVar[Optional[Callable[[Dict[str, Any]], None]]] = contextvars.ContextVar(
+    "creatorpack_event_sink", default=None
+)
 
 
 def configure_logging(log_dir: Path) -> None:
     log_dir.mkdir(parents=True, exist_ok=True)
     log_path = log_dir / "job.log.jsonl"
 
-    handler = logging.FileHandler(log_path, encoding="utf-8")
-    handler.setFormatter(_JsonLogFormatter())
-
     logger = logging.getLogger(_LOGGER_NAME)
     logger.setLevel(logging.INFO)
-    logger.handlers = [handler]
+    if not any(isinstance(handler, _JobRouterHandler) for handler in logger.handlers):
+        logger.handlers = [_JobRouterHandler()]
     logger.propagate = False
+    _router(logger).default_path = log_path
+    _ACTIVE_LOG.set(log_path)
+
+
+def release_logging() -> None:
+    """Close the current context's job log handle; later records reopen it in append mode."""
+
+    router = _router(logging.getLogger(_LOGGER_NAME))
+    path = _ACTIVE_LOG.get()
+    if router is not None and path is not None:
+        router.close_path(path)
+
+
+def set_event_sink(sink: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+    """Forward every job log record emitted in the current context to ``sink`` as a dict."""
+
+    _EVENT_SINK.set(sink)
 
 
 def job_logger() -> logging.Logger:
     return logging.getLogger(_LOGGER_NAME)
 
 
+def _router(logger: logging.Logger) -> Optional["_JobRouterHandler"]:
+    return next((handler for handler in logger.handlers if isinstance(handler, _JobRouterHandler)), None)
+
+
+class _JobRouterHandler(logging.Handler):
+    """Dispatches each record to the ``job.log.jsonl`` of the job active in the emitting context."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.default_path: Optional[Path] = None
+        self._handlers: Dict[Path, logging.FileHandler] = {}
+        self._handlers_lock = threading.Lock()
+        self.setFormatter(_JsonLogFormatter())
+
+    def emit(self, record: logging.LogRecord) -> None:
+        sink = _EVENT_SINK.get()
+        if sink is not None:
+            sink(_record_fields(record))
+        path = _ACTIVE_LOG.get() or self.default_path
+        if path is None:
+            return
+        with self._handlers_lock:
+            handler = self._handlers.get(path)
+            if handler is None:
+                handler = logging.FileHandler(path, encoding="utf-8")
+                handler.setFormatter(self.formatter)
+                self._handlers[path] = handler
+        handler.emit(record)
+
+    def close_path(self, path: Path) -> None:
+        with self._handlers_lock:
+            handler = self._handlers.pop(path, None)
+        if handler is not None:
+            handler.close()
+
+    def close(self) -> None:
+        with self._handlers_lock:
+            handlers, self._handlers = list(self._handlers.values()), {}
+        for handler in handlers:
+            handler.close()
+        super().close()
+
+
 class _JsonLogFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:  # noqa: D401
-        data: Dict[str, Any] = {
-            "level": record.levelname,
-            "message": record.getMessage(),
-        }
-        for key, value in record.__dict__.items():
-            if key in _RESERVED_LOG_RECORD_KEYS:
-                continue
-            data[key] = value
-        return json.dumps(data, ensure_ascii=False)
+        return json.dumps(_record_fields(record), ensure_ascii=False)
+
+
+def _record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "level": record.levelname,
+        "message": record.getMessage(),
+    }
+    for key, value in record.__dict__.items():
+        if key in _RESERVED_LOG_RECORD_KEYS:
+            continue
+        data[key] = value
+    return data
@@ -0,0 +1,151 @@
+"""Dependency-aware task scheduler with per-resource worker pools."""
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .errors import CreatorPackError
+from .logging import job_logger
+
+
+DEFAULT_POOLS = {"stt": 1, "render": 2, "io": 1}
+
+
+class SchedulerError(CreatorPackError):
+    """Raised when a task graph is malformed."""
+
+
+class JobCancelled(SchedulerError):
+    """Raised by :meth:`TaskGraph.run` when its cancel event is set."""
+
+
+@dataclass
+class Task:
+    name: str
+    fn: Callable[[], Any]
+    deps: Tuple[str, ...]
+    resource: str
+    submitted_at: float = 0.0
+
+
+class TaskGraph:
+    """Collects tasks with explicit dependencies and runs independent work concurrently.
+
+    Each task is bound to a resource pool (for example one STT slot, N render
+    slots and an I/O slot), so CPU-bound transcription of one input can overlap
+    with ffmpeg encodes of another. Tasks may add further tasks while they run,
+    which is how work that depends on a computed plan (one render per chapter)
+    joins the graph. Per-task wait and run times go to the job log.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, Task] = {}
+        self._started: set[str] = set()
+        self._lock = threading.Lock()
+        self.results: Dict[str, Any] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        *,
+        deps: Iterable[Optional[str]] = (),
+        resource: str = "io",
+    ) -> str:
+        resolved = tuple(dep for dep in deps if dep)
+        with self._lock:
+            if name in self._tasks:
+                raise SchedulerError(f"Duplicate task '{name}'")
+            for dep in resolved:
+                if dep not in self._tasks:
+                    raise SchedulerError(f"Task '{name}' depends on unknown task '{dep}'")
+            self._tasks[name] = Task(name=name, fn=fn, deps=resolved, resource=resource)
+        return name
+
+    def run(
+        self,
+        pools: Dict[str, int] | None = None,
+        *,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """Execute every task, respecting dependencies and pool sizes.
+
+        The first failing task stops new submissions; running tasks finish and the
+        original exception is re-raised. Setting ``cancel`` behaves like a failure
+        and raises :class:`JobCancelled`.
+        """
+
+        sizes = {**DEFAULT_POOLS, **(pools or {})}
+        executors: Dict[str, ThreadPoolExecutor] = {}
+        running: Dict[Future, Task] = {}
+        done: set[str] = set()
+        failure: BaseException | None = None
+        try:
+            while True:
+                if failure is None and cancel is not None and cancel.is_set():
+                    failure = JobCancelled("Job cancelled")
+                if failure is None:
+                    for task in self._ready(done):
+                        executor = executors.get(task.resource)
+                        if executor is None:
+                            executor = ThreadPoolExecutor(
+                                max_workers=max(sizes.get(task.resource, 1), 1),
+                                thread_name_prefix=f"creatorpack-{task.resource}",
+                            )
+                            executors[task.resource] = executor
+                        task.submitted_at = time.monotonic()
+                        # Run in a copy of the caller's context so task logs reach this job's log.
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, self._timed, task)] = task
+                if not running:
+                    break
+                # With a cancel event, wake up periodically so cancellation is noticed mid-task.
+                finished, _ = wait(
+                    list(running), timeout=0.2 if cancel is not None else None, return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    task = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        failure = failure or error
+                        continue
+                    self.results[task.name] = future.result()
+                    done.add(task.name)
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+        if failure is not None:
+            raise failure
+        with self._lock:
+            blocked = sorted(set(self._tasks) - self._started)
+        if blocked:
+            raise SchedulerError(f"Tasks never became runnable: {blocked}")
+        return self.results
+
+    def _ready(self, done: set[str]) -> list[Task]:
+        with self._lock:
+            ready = [
+                task
+                for name, task in self._tasks.items()
+                if name not in self._started and all(dep in done for dep in task.deps)
+            ]
+            self._started.update(task.name for task in ready)
+        return ready
+
+    def _timed(self, task: Task) -> Any:
+        started = time.monotonic()
+        result = task.fn()
+        job_logger().info(
+            "task_completed",
+            extra={
+                "task": task.name,
+                "resource": task.resource,
+                "wait_seconds": round(started - task.submitted_at, 3),
+                "run_seconds": round(time.monotonic() - started, 3),
+            },
+        )
+        return result
@@ -0,0 +1,82 @@
+"""Shared, fingerprint-keyed memoization of pipeline stage results."""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .io import write_text_atomic
+from .logging import job_logger
+
+
+T = TypeVar("T")
+
+
+def fingerprint(inputs: Any) -> str:
+    """Stable digest of JSON-serialisable stage inputs."""
+
+    encoded = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:24]
+
+
+class StageCache:
+    """Stores each stage's result under a fingerprint of that stage's own inputs.
+
+    The cache lives outside any one job directory (``<out>/.cache/stages`` by
+    default), so a job that changes only ``--brand`` reuses the probe,
+    transcript and plans of an earlier job; rendered files are cached by
+    :class:`~creatorpack.app_cli.media.render_cache.RenderCache`. Every lookup is logged as ``stage_reused`` or
+    ``stage_recomputed`` and counted for :meth:`summary`. With ``root=None``
+    nothing is cached and every stage simply runs.
+    """
+
+    def __init__(self, root: Optional[Path]) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def memo(
+        self,
+        stage: str,
+        inputs: Any,
+        compute: Callable[[], T],
+        *,
+        encode: Callable[[T], Any] = lambda value: value,
+        decode: Callable[[Any], T] = lambda data: data,
+    ) -> T:
+        """Return the cached result for ``inputs`` or compute, store and return it."""
+
+        if self.root is None:
+            return compute()
+        key = fingerprint(inputs)
+        path = self.root / stage / f"{key}.json"
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = None
+        if data is not None:
+            try:
+                value = decode(data["value"])
+            except (OSError, ValueError, KeyError, TypeError):
+                # A stale or foreign entry, or one whose payload file is gone or damaged.
+                pass
+            else:
+                self._record(stage, key, reused=True)
+                return value
+        value = compute()
+        write_text_atomic(path, json.dumps({"stage": stage, "inputs": inputs, "value": encode(value)}, default=str))
+        self._record(stage, key, reused=False)
+        return value
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {stage: dict(counts) for stage, counts in sorted(self._counts.items())}
+
+    def _record(self, stage: str, key: str, *, reused: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(stage, {"reused": 0, "recomputed": 0})
+            counts["reused" if reused else "recomputed"] += 1
+        job_logger().info("stage_reused" if reused else "stage_recomputed", extra={"stage": stage, "key": key})
+
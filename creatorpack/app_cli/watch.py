@@ -0,0 +1,313 @@
+"""Watch-folder ingest: detect new media files and report them once they stop changing."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .util.errors import CreatorPackError
+
+
+MEDIA_EXTENSIONS = frozenset(
+    {".mp4", ".mov", ".mkv", ".m4v", ".webm", ".avi", ".mp3", ".wav", ".m4a", ".aac", ".flac", ".ogg", ".opus"}
+)
+
+_Signature = Tuple[int, int]  # (size, mtime_ns)
+_Ignore = Callable[[Path], bool]
+
+
+class WatchError(CreatorPackError):
+    """Raised when a folder cannot be watched."""
+
+
+class FolderWatcher:
+    """Reports media files under ``root`` once their size and mtime hold still for ``settle_seconds``.
+
+    Change detection uses inotify on Linux and falls back to polling elsewhere (or
+    when a watch cannot be added, e.g. at ``max_user_watches``, even mid-run;
+    an explicit ``inotify`` backend raises :class:`WatchError` instead). Neither backend rescans the whole tree
+    per tick: inotify reports paths directly, and polling only lists directories
+    whose mtime moved, with a full rescan every ``full_scan_every`` ticks to catch
+    files rewritten in place. Only files still settling are stat'ed each tick.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        settle_seconds: float = 5.0,
+        backend: str = "auto",
+        extensions: Iterable[str] = MEDIA_EXTENSIONS,
+        ignore: Iterable[Path] = (),
+        full_scan_every: int = 60,
+    ) -> None:
+        self.root = root.resolve()
+        if not self.root.is_dir():
+            raise WatchError(f"Watch folder not found: {root}")
+        self._settle = settle_seconds
+        self._extensions = {extension.lower() for extension in extensions}
+        self._ignore = [path.resolve() for path in ignore]
+        self._pending: Dict[Path, Tuple[_Signature, float]] = {}
+        self._backend = backend
+        self._full_scan_every = full_scan_every
+        self._source = _open_source(self.root, backend, self._ignored, full_scan_every)
+        self.backend = self._source.name
+        for path in self._read(self._source.scan):
+            self._observe(path, time.monotonic())
+
+    def poll(self, timeout: float = 1.0) -> List[Path]:
+        """Wait up to ``timeout`` for changes; return files that have finished settling."""
+
+        for path in self._read(lambda: self._source.changes(timeout)):
+            self._observe(path, time.monotonic())
+        return self._settled(time.monotonic())
+
+    def close(self) -> None:
+        self._source.close()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _read(self, read: Callable[[], Set[Path]]) -> Set[Path]:
+        """Call the source, switching to polling (which rescans the tree) if inotify fails."""
+
+        try:
+            return read()
+        except OSError as exc:
+            self._source.close()
+            if self._source.name == "poll" or self._backend == "inotify":
+                raise WatchError(f"Cannot watch {self.root}: {exc}") from exc
+            self._source = _PollingSource(self.root, self._ignored, self._full_scan_every)
+            self.backend = self._source.name
+            return self._source.scan()
+
+    def _observe(self, path: Path, now: float) -> None:
+        if path.suffix.lower() not in self._extensions or path.name.startswith(".") or self._ignored(path):
+            return
+        signature = _signature(path)
+        if signature is None:
+            self._pending.pop(path, None)
+            return
+        current = self._pending.get(path)
+        if current is None or current[0] != signature:
+            self._pending[path] = (signature, now)
+
+    def _settled(self, now: float) -> List[Path]:
+        ready: List[Path] = []
+        for path, (signature, since) in list(self._pending.items()):
+            latest = _signature(path)
+            if latest is None:
+                del self._pending[path]
+            elif latest != signature:
+                self._pending[path] = (latest, now)
+            elif now - since >= self._settle:
+                del self._pending[path]
+                ready.append(path)
+        return sorted(ready)
+
+    def _ignored(self, path: Path) -> bool:
+        return any(path == ignored or ignored in path.parents for ignored in self._ignore)
+
+
+def _signature(path: Path) -> Optional[_Signature]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if not path.is_file():
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _open_source(root: Path, backend: str, ignored: _Ignore, full_scan_every: int):
+    if backend not in {"auto", "inotify", "poll"}:
+        raise WatchError(f"Unknown watch backend '{backend}'")
+    if backend != "poll":
+        try:
+            return _InotifySource(root, ignored)
+        except OSError as exc:
+            if backend == "inotify":
+                raise WatchError(f"inotify unavailable: {exc}") from exc
+    return _PollingSource(root, ignored, full_scan_every)
+
+
+class _PollingSource:
+    name = "poll"
+
+    def __init__(self, root: Path, ignored: _Ignore, full_scan_every: int) -> None:
+        self._root = root
+        self._ignored = ignored
+        self._full_scan_every = max(full_scan_every, 1)
+        self._ticks = 0
+        self._dirs: Dict[Path, int] = {}
+        self._files: Dict[Path, _Signature] = {}
+
+    def scan(self) -> Set[Path]:
+        return self._scan_tree(self._root)
+
+    def changes(self, timeout: float) -> Set[Path]:
+        time.sleep(timeout)
+        self._ticks += 1
+        if self._ticks % self._full_scan_every == 0:
+            return self._scan_tree(self._root)
+        changed: Set[Path] = set()
+        for directory, mtime in list(self._dirs.items()):
+            try:
+                current = directory.stat().st_mtime_ns
+            except OSError:
+                self._forget(directory)
+                continue
+            if current != mtime:
+                changed |= self._scan_dir(directory)
+        return changed
+
+    def close(self) -> None:
+        return
+
+    def _scan_tree(self, top: Path) -> Set[Path]:
+        changed: Set[Path] = set()
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            changed |= self._scan_dir(directory, stack)
+        return changed
+
+    def _scan_dir(self, directory: Path, stack: Optional[List[Path]] = None) -> Set[Path]:
+        """List one directory; new subdirectories are walked (or pushed on ``stack``)."""
+
+        changed: Set[Path] = set()
+        try:
+            self._dirs[directory] = directory.stat().st_mtime_ns
+            entries = list(os.scandir(directory))
+        except OSError:
+            self._forget(directory)
+            return changed
+        for entry in entries:
+            path = Path(entry.path)
+            if self._ignored(path):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if path not in self._dirs:
+                        if stack is None:
+                            changed |= self._scan_tree(path)
+                        else:
+                            stack.append(path)
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._files.get(path) != signature:
+                self._files[path] = signature
+                changed.add(path)
+        return changed
+
+    def _forget(self, directory: Path) -> None:
+        self._dirs.pop(directory, None)
+        for known in [path for path in self._dirs if directory in path.parents]:
+            del self._dirs[known]
+        for known in [path for path in self._files if directory in path.parents]:
+            del self._files[known]
+
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _InotifySource:
+    name = "inotify"
+
+    def __init__(self, root: Path, ignored: _Ignore) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify requires Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._root = root
+        self._ignored = ignored
+        self._watches: Dict[int, Path] = {}
+
+    def scan(self) -> Set[Path]:
+        return self._watch_tree(self._root)
+
+    def changes(self, timeout: float) -> Set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed: Set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    # The kernel dropped events: fall back to one full listing.
+                    changed |= self._watch_tree(self._root)
+                    continue
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & (_IN_IGNORED | _IN_DELETE_SELF):
+                    self._watches.pop(wd, None)
+                    continue
+                path = directory / name
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO) and not self._ignored(path):
+                        changed |= self._watch_tree(path)
+                else:
+                    changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch_tree(self, top: Path) -> Set[Path]:
+        """Add watches below ``top`` and return the files already there."""
+
+        files: Set[Path] = set()
+        for directory, dirnames, filenames in os.walk(top):
+            path = Path(directory)
+            dirnames[:] = [name for name in dirnames if not self._ignored(path / name)]
+            try:
+                wd = self._add_watch(path)
+            except OSError as exc:
+                if exc.errno in (errno.EACCES, errno.ENOENT, errno.ENOTDIR):
+                    continue  # unreadable or already gone: nothing to list there either
+                raise
+            self._watches[wd] = path
+            files.update(path / name for name in filenames)
+        return files
+
+    def _add_watch(self, path: Path) -> int:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, f"inotify_add_watch failed for {path}: {os.strerror(code)}")
+        return wd
@@ -0,0 +1,98 @@
+"""Shared fixtures: pipeline options and stubbed probe/STT/ffmpeg calls."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Union
+
+import pytest
+
+from creatorpack.app_cli import main
+from creatorpack.app_cli.ingest.sources import IngestInput
+from creatorpack.app_cli.main import RunOptions
+from creatorpack.app_cli.media import ffmpeg_ops
+from creatorpack.app_cli.media.ffmpeg_ops import MediaProbe
+from creatorpack.app_cli.nlp.highlights import HighlightPolicy
+from creatorpack.app_cli.stt.transcribe import TranscriptResult, TranscriptSegment
+
+
+@dataclass
+class FakePipeline:
+    """Stand-ins for ``probe_media``, ``transcribe_media`` and ffmpeg that record their calls.
+
+    Tests adjust the fields before running a job: ``transcript`` may be a callable taking the
+    media path, and ``on_command`` runs before each ffmpeg call writes its output (raise to fail it).
+    """
+
+    probe_result: MediaProbe = field(default_factory=lambda: MediaProbe(duration=120.0, streams=["video", "audio"]))
+    transcript: Union[TranscriptResult, Callable[[Path], TranscriptResult]] = field(
+        default_factory=lambda: TranscriptResult(
+            language="en", segments=[TranscriptSegment(id=0, start=0.0, end=30.0, text="Hi")]
+        )
+    )
+    on_command: Optional[Callable[[List[str]], None]] = None
+    write_outputs: bool = True
+    probes: int = 0
+    transcribed: List[Path] = field(default_factory=list)
+    commands: List[List[str]] = field(default_factory=list)
+
+    @property
+    def renders(self) -> List[Path]:
+        return [Path(args[-1]) for args in self.commands]
+
+    def probe(self, *_: Any, **__: Any) -> MediaProbe:
+        self.probes += 1
+        return self.probe_result
+
+    def transcribe(self, path: Path, diarize: bool = False) -> TranscriptResult:
+        self.transcribed.append(Path(path))
+        return self.transcript(Path(path)) if callable(self.transcript) else self.transcript
+
+    def run_command(self, args: List[str], **_: Any) -> None:
+        if self.on_command is not None:
+            self.on_command(list(args))
+        self.commands.append(list(args))
+        output = Path(args[-1])
+        if self.write_outputs and args[0] != "ffprobe" and args[-1] != "-" and output.parent.is_dir():
+            output.write_bytes(b"clip")
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch: pytest.MonkeyPatch) -> FakePipeline:
+    fake = FakePipeline()
+    monkeypatch.setattr(main, "probe_media", fake.probe)
+    monkeypatch.setattr(main, "transcribe_media", fake.transcribe)
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", fake.run_command)
+    return fake
+
+
+@pytest.fixture
+def run_options(tmp_path: Path) -> Callable[..., RunOptions]:
+    """Build ``RunOptions`` for local media (``tmp_path/talk.mp4`` by default); keywords override."""
+
+    def _build(*media: Path, **overrides: Any) -> RunOptions:
+        if not media:
+            default = tmp_path / "talk.mp4"
+            if not default.exists():
+                default.write_bytes(b"media")
+            media = (default,)
+        values = dict(
+            inputs=[IngestInput(kind="local", value=str(path)) for path in media],
+            template="creator-pack",
+            minutes=1,
+            smart=False,
+            highlights=False,
+            highlight_policy=HighlightPolicy(),
+            brand_path=None,
+            localize=None,
+            diarize=False,
+            output_dir=tmp_path / "exports",
+            allow_sources=["local"],
+            block_nc_nd=True,
+            dry_run=False,
+            job_id="job-test",
+        )
+        values.update(overrides)
+        return RunOptions(**values)
+
+    return _build
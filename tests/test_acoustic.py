@@ -0,0 +1,143 @@
+"""Tests for acoustic fingerprint dedupe."""
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from conftest import FakePipeline
+from creatorpack.app_cli import main
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.media.acoustic import (
+    HOP_SIZE,
+    SAMPLE_RATE,
+    AcousticIndex,
+    AcousticPrint,
+    _LandmarkHasher,
+    hashes_from_pcm,
+    shift_transcript,
+)
+from creatorpack.app_cli.stt.transcribe import TranscriptResult, TranscriptSegment
+
+FRAME_SECONDS = HOP_SIZE / SAMPLE_RATE
+
+
+def _recording(seconds: float, seed: int) -> AcousticPrint:
+    rng = random.Random(seed)
+    frames = int(seconds / FRAME_SECONDS)
+    return AcousticPrint(
+        hashes=[(rng.getrandbits(26), frame) for frame in range(frames) for _ in range(3)],
+        duration=seconds,
+    )
+
+
+def _excerpt(full: AcousticPrint, start_frame: int, frames: int) -> AcousticPrint:
+    hashes = [(value, frame - start_frame) for value, frame in full.hashes if start_frame <= frame < start_frame + frames]
+    return AcousticPrint(hashes=hashes, duration=frames * FRAME_SECONDS)
+
+
+def test_index_finds_contained_audio_and_offset(tmp_path: Path) -> None:
+    index = AcousticIndex(tmp_path / "acoustic.sqlite")
+    talk = _recording(120.0, seed=1)
+    index.add("talk", talk)
+    index.add("other", _recording(120.0, seed=2))
+
+    match = index.match(_excerpt(talk, 500, 400))
+    assert match is not None and match.recording == "talk"
+    assert match.offset == pytest.approx(500 * FRAME_SECONDS)
+    assert index.match(_recording(30.0, seed=3)) is None
+    assert index.match(talk, exclude="talk") is None
+    with sqlite3.connect(tmp_path / "acoustic.sqlite") as conn:
+        assert conn.execute("SELECT DISTINCT typeof(recording) FROM hashes").fetchall() == [("integer",)]
+
+    # Longer than anything indexed: the old transcript would not cover it.
+    longer = AcousticPrint(hashes=talk.hashes, duration=talk.duration + 30.0)
+    assert index.match(longer) is None
+
+    transcript = TranscriptResult(
+        language="en",
+        segments=[
+            TranscriptSegment(id=0, start=10.0, end=31.0, text="intro"),
+            TranscriptSegment(id=1, start=31.0, end=40.0, text="body"),
+            TranscriptSegment(id=2, start=60.0, end=70.0, text="outro"),
+        ],
+    )
+    shifted = shift_transcript(transcript, offset=30.0, duration=20.0)
+    assert [(s.id, s.start, s.end, s.text) for s in shifted.segments] == [(0, 0.0, 1.0, "intro"), (1, 1.0, 10.0, "body")]
+
+
+def test_reencoded_upload_reuses_transcript(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_pipeline: FakePipeline,
+    run_options: Callable[..., RunOptions],
+) -> None:
+    talk = _recording(120.0, seed=7)
+    prints = {"talk.mp4": talk, "talk-low.webm": _excerpt(talk, 0, int(120.0 / FRAME_SECONDS))}
+    monkeypatch.setattr(main, "numpy_available", lambda: True)
+    monkeypatch.setattr(main, "acoustic_fingerprint", lambda path: prints[path.name])
+
+    def _run(name: str, content: bytes) -> dict:
+        media = tmp_path / name
+        media.write_bytes(content)
+        options = run_options(
+            media,
+            job_id=f"job-{media.stem}",
+            stage_cache_dir=tmp_path / "cache" / "stages",
+            acoustic_index=tmp_path / "cache" / "acoustic.sqlite",
+        )
+        result = _run_pipeline(options)
+        return json.loads((result.export_root / "transcript" / "transcript.json").read_text(encoding="utf-8"))
+
+    first = _run("talk.mp4", b"h264 bytes")
+    second = _run("talk-low.webm", b"vp9 bytes")
+    assert [path.name for path in fake_pipeline.transcribed] == ["talk.mp4"]
+    assert second == first
+
+
+def test_peaks_survive_noise_and_gain(tmp_path: Path) -> None:
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    # A melody of random tones, 20 seconds at 8 kHz.
+    tones = rng.uniform(200.0, 2500.0, size=80)
+    time = np.arange(int(SAMPLE_RATE * 0.25)) / SAMPLE_RATE
+    signal = np.concatenate([np.sin(2 * np.pi * tone * time) for tone in tones]) * 0.5
+
+    def _pcm(values) -> bytes:
+        return (np.clip(values, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+    index = AcousticIndex(tmp_path / "acoustic.sqlite")
+    index.add("melody", hashes_from_pcm(_pcm(signal)))
+    start = 4 * SAMPLE_RATE  # the copy starts 4 s in, quieter and noisy
+    copy = signal[start:] * 0.6 + rng.normal(0.0, 0.01, size=len(signal) - start)
+    match = index.match(hashes_from_pcm(_pcm(copy)))
+    assert match is not None and match.recording == "melody"
+    assert match.offset == pytest.approx(4.0, abs=FRAME_SECONDS)
+
+
+def test_streamed_blocks_hash_like_the_whole_signal(tmp_path: Path) -> None:
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(1)
+    raw = (rng.normal(0.0, 0.3, size=1_234_567) * 32767).clip(-32767, 32767).astype("<i2").tobytes()
+    whole = hashes_from_pcm(raw)
+
+    hasher = _LandmarkHasher()
+    position = 0
+    while position < len(raw):  # odd-sized reads, as from a pipe
+        step = int(rng.integers(1, 300_000))
+        hasher.feed(raw[position : position + step])
+        position += step
+    streamed = hasher.finish()
+    assert whole.hashes and streamed.hashes == whole.hashes and streamed.duration == whole.duration
+
+    # An index written with text recording keys on every posting is rebuilt in the integer layout.
+    with sqlite3.connect(tmp_path / "old.sqlite") as conn:
+        conn.execute("CREATE TABLE recordings (id TEXT PRIMARY KEY, duration REAL, added_at TEXT)")
+        conn.execute("CREATE TABLE hashes (hash INTEGER NOT NULL, recording TEXT NOT NULL, frame INTEGER NOT NULL)")
+    index = AcousticIndex(tmp_path / "old.sqlite")
+    index.add("noise", whole)
+    assert index.match(AcousticPrint(hashes=whole.hashes, duration=whole.duration)).recording == "noise"
@@ -0,0 +1,83 @@
+"""Tests for the streaming delivery archive."""
+from __future__ import annotations
+
+import hashlib
+import os
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from conftest import FakePipeline
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.media.ffmpeg_ops import MediaProbe
+from creatorpack.app_cli.outputs.packaging import ExportArchive
+
+
+def test_zip_is_filled_while_clips_render(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_pipeline: FakePipeline,
+    run_options: Callable[..., RunOptions],
+) -> None:
+    appended: List[str] = []
+    append = ExportArchive._append
+
+    def _append(self: ExportArchive, path: Path) -> None:
+        append(self, path)
+        appended.append(path.name)
+
+    def _encode(args: List[str]) -> None:
+        if args[-1].endswith("talk_part-004.mp4"):
+            deadline = time.monotonic() + 5.0
+            while "talk_part-003.mp4" not in appended and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert "talk_part-001.mp4" in appended  # earlier clips are archived before the job ends
+
+    monkeypatch.setattr(ExportArchive, "_append", _append)
+    fake_pipeline.probe_result = MediaProbe(duration=240.0, streams=["video", "audio"])
+    fake_pipeline.on_command = _encode
+    options = run_options(job_id="job-archive", render_jobs=1, archive_format="zip", archive_checksums=True)
+    _run_pipeline(options)
+
+    archive = tmp_path / "exports" / "job-archive.zip"
+    assert not archive.with_name("job-archive.zip.partial").exists()
+    with zipfile.ZipFile(archive) as bundle:
+        names = bundle.namelist()
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in bundle.infolist())
+        sums = dict(
+            reversed(line.split("  ", 1)) for line in bundle.read("job-archive/SHA256SUMS").decode().splitlines()
+        )
+        for name in names[:-1]:
+            assert sums[name] == hashlib.sha256(bundle.read(name)).hexdigest()
+    assert names[-1] == "job-archive/SHA256SUMS"
+    assert "job-archive/chapters/talk_part-004.mp4" in names and "job-archive/transcript/transcript.json" in names
+    manifests = [index for index, name in enumerate(names) if "/manifests/" in name]
+    assert manifests and min(manifests) > names.index("job-archive/chapters/talk_part-004.mp4")
+    assert "job-archive/manifests/job.json" in names
+    assert not any("/input/" in name or name.endswith("job.state.json") for name in names)
+
+
+def test_tar_keeps_data_of_hardlinked_clips(tmp_path: Path) -> None:
+    root = tmp_path / "job"
+    (root / "chapters").mkdir(parents=True)
+    (root / "manifests").mkdir()
+    (root / "chapters" / "a.mp4").write_bytes(b"same clip")
+    os.link(root / "chapters" / "a.mp4", root / "chapters" / "b.mp4")
+    (root / "manifests" / "job.json").write_text("{}", encoding="utf-8")
+
+    archive = ExportArchive(tmp_path / "job.tar", root, fmt="tar", checksums=True)
+    archive.add([root / "chapters" / "b.mp4"])
+    archive.close()
+    with tarfile.open(tmp_path / "job.tar") as bundle:
+        names = bundle.getnames()
+        assert names == ["job/chapters/b.mp4", "job/chapters/a.mp4", "job/manifests/job.json", "job/SHA256SUMS"]
+        assert bundle.extractfile("job/chapters/a.mp4").read() == b"same clip"
+
+    aborted = ExportArchive(tmp_path / "other.zip", root)
+    aborted.add([root / "chapters" / "a.mp4"])
+    aborted.abort()
+    assert not list(tmp_path.glob("other.zip*"))
@@ -0,0 +1,52 @@
+"""Tests for the audio-only render path."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from creatorpack.app_cli.media import ffmpeg_ops
+from creatorpack.app_cli.media.ffmpeg_ops import AudioOutput, MediaSegment, chunk_media
+
+
+def _capture(monkeypatch: pytest.MonkeyPatch) -> List[List[str]]:
+    calls: List[List[str]] = []
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", lambda args, **_: calls.append(list(args)))
+    return calls
+
+
+def test_matching_codec_is_stream_copied(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _capture(monkeypatch)
+    outputs = chunk_media(
+        tmp_path / "episode.m4a",
+        tmp_path / "out",
+        [MediaSegment(start=0.0, end=600.0)],
+        audio_output=AudioOutput(container="m4a", source_codec="aac"),
+    )
+    args = calls[0]
+    assert args[args.index("-c:a") + 1] == "copy"
+    assert "-vn" in args and "libx264" not in args
+    assert outputs[0].file.name == "episode_part-001.m4a"
+    assert (tmp_path / "out" / "episode_part-001.srt").exists()
+
+
+def test_mismatched_codec_or_filter_reencodes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _capture(monkeypatch)
+    chunk_media(
+        tmp_path / "episode.mp3",
+        tmp_path / "out",
+        [MediaSegment(start=0.0, end=600.0)],
+        audio_output=AudioOutput(container="opus", source_codec="mp3"),
+    )
+    chunk_media(
+        tmp_path / "episode.m4a",
+        tmp_path / "out",
+        [MediaSegment(start=0.0, end=60.0, pieces=[(0.0, 20.0), (25.0, 65.0)])],
+        audio_output=AudioOutput(container="m4a", source_codec="aac"),
+    )
+    assert calls[0][calls[0].index("-c:a") + 1] == "libopus"
+    assert calls[0][-1].endswith(".opus")
+    graph = calls[1][calls[1].index("-filter_complex") + 1]
+    assert "concat=n=2:v=0:a=1[ac]" in graph
+    assert calls[1][calls[1].index("-c:a") + 1] == "aac"
@@ -0,0 +1,96 @@
+"""Tests for the bulk license audit."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from creatorpack.app_cli import audit, main
+from creatorpack.app_cli.audit import SidecarFinder, audit_inputs, iter_library
+from creatorpack.app_cli.ingest.license_gate import LicenseGate
+from creatorpack.app_cli.ingest.sources import IngestInput
+
+XMP = """<x:xmpmeta xmlns:x="adobe:ns:meta/">
+ <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+  <rdf:Description xmlns:cc="http://creativecommons.org/ns#" xmlns:dc="http://purl.org/dc/elements/1.1/">
+   <cc:license rdf:resource="https://creativecommons.org/licenses/by-nc/4.0/"/>
+   <dc:creator><rdf:Seq><rdf:li>Ada</rdf:li></rdf:Seq></dc:creator>
+  </rdf:Description>
+ </rdf:RDF>
+</x:xmpmeta>
+"""
+
+
+def _library(root: Path) -> Path:
+    (root / "talks" / "2024").mkdir(parents=True)
+    (root / ".trash").mkdir()
+    (root / "open.mp4").write_bytes(b"v")
+    (root / "open.mp4.json").write_text(json.dumps({"license": "CC BY 4.0", "creator": "Bo"}), encoding="utf-8")
+    (root / "nc.mov").write_bytes(b"v")
+    (root / "nc.xmp").write_text(XMP, encoding="utf-8")
+    (root / "bare.wav").write_bytes(b"a")
+    (root / "notes.txt").write_text("not media", encoding="utf-8")
+    (root / "talks" / "license.yaml").write_text("license: cc0\n", encoding="utf-8")
+    (root / "talks" / "2024" / "keynote.mp3").write_bytes(b"a")
+    (root / "talks" / "sa.mp4").write_bytes(b"v")
+    (root / "talks" / "sa.yaml").write_text(
+        "license_url: https://creativecommons.org/licenses/by-sa/4.0/\n", encoding="utf-8"
+    )
+    (root / ".trash" / "old.mp4").write_bytes(b"v")
+    return root
+
+
+def test_audit_streams_a_verdict_per_file(tmp_path: Path) -> None:
+    library = _library(tmp_path / "library")
+    report = tmp_path / "audit.jsonl"
+
+    result = CliRunner().invoke(main.cli, ["audit", str(library), "--report", str(report), "--workers", "4"])
+    assert result.exit_code == 3, result.output
+    rows = {Path(row["path"]).relative_to(library).as_posix(): row for row in map(json.loads, report.read_text().splitlines())}
+    assert {name: row["status"] for name, row in rows.items()} == {
+        "bare.wav": "missing",
+        "nc.mov": "blocked",
+        "open.mp4": "allowed",
+        "talks/2024/keynote.mp3": "allowed",
+        "talks/sa.mp4": "blocked",
+    }
+    # Walk order (files of a folder, then its subfolders) is kept despite the worker pool.
+    assert list(rows) == ["bare.wav", "nc.mov", "open.mp4", "talks/sa.mp4", "talks/2024/keynote.mp3"]
+    assert rows["open.mp4"]["license_code"] == "cc-by-4.0" and rows["open.mp4"]["requires_attribution"]
+    assert rows["nc.mov"]["license_code"] == "cc-by-nc-4.0"
+    assert rows["talks/2024/keynote.mp3"]["sidecar"].endswith("talks/license.yaml")
+    assert rows["talks/sa.mp4"]["license_code"] == "cc-by-sa-4.0"
+    assert "5 files" in result.stderr
+
+    manifest = tmp_path / "rows.csv"
+    manifest.write_text(f"file\n{library / 'bare.wav'};{library / 'open.mp4'}\n", encoding="utf-8")
+    result = CliRunner().invoke(
+        main.cli, ["audit", str(manifest), "--report", str(report), "--default-license", "pd"]
+    )
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line)["status"] for line in report.read_text().splitlines()] == ["allowed", "allowed"]
+
+
+def test_walk_lists_each_directory_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    library = _library(tmp_path / "library")
+    listed = []
+    monkeypatch.setattr(audit.os, "listdir", lambda path: listed.append(path) or os.listdir(path))
+
+    finder = SidecarFinder(library)
+    inputs = (IngestInput("local", str(path)) for path in iter_library(library, finder))
+    results = list(audit_inputs(inputs, LicenseGate(), finder=finder, workers=2))
+    assert len(results) == 5 and listed == []
+
+
+def test_broken_sidecar_is_reported_not_fatal(tmp_path: Path) -> None:
+    (tmp_path / "talk.mp4").write_bytes(b"v")
+    (tmp_path / "talk.yaml").write_text("license: [cc0\ncreator: {Bo\n", encoding="utf-8")
+    (tmp_path / "ok.mp4").write_bytes(b"v")
+    (tmp_path / "ok.yaml").write_text("license: cc0\n", encoding="utf-8")
+
+    results = list(audit_inputs([IngestInput("local", str(tmp_path / name)) for name in ("talk.mp4", "ok.mp4")], LicenseGate()))
+    assert [result.status for result in results] == ["error", "allowed"]
+    assert "talk.yaml is not valid YAML" in results[0].reason
@@ -0,0 +1,93 @@
+"""Tests for the batch command."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from conftest import FakePipeline
+from creatorpack.app_cli import main
+from creatorpack.app_cli.batch import load_batch_manifest
+from creatorpack.app_cli.media.ffmpeg_ops import MediaProbe
+from creatorpack.app_cli.stt.transcribe import TranscriptResult, TranscriptSegment
+from creatorpack.app_cli.util.errors import ExitCodes
+
+
+@pytest.fixture
+def fake_media(monkeypatch: pytest.MonkeyPatch, fake_pipeline: FakePipeline) -> None:
+    monkeypatch.setattr(main, "run_preflight", lambda inputs: None)
+    fake_pipeline.probe_result = MediaProbe(duration=1800.0, streams=["video", "audio"])
+    fake_pipeline.transcript = lambda path: TranscriptResult(
+        language="en", segments=[TranscriptSegment(id=0, start=0.0, end=5.0, text=path.name)]
+    )
+
+
+def test_load_manifest_csv_and_jsonl(tmp_path: Path) -> None:
+    csv_path = tmp_path / "batch.csv"
+    csv_path.write_text("file,minutes,smart\n/a.mp4,5,yes\n\n/b.mp4;/c.mp4,,\n", encoding="utf-8")
+    rows = load_batch_manifest(csv_path)
+    assert [row.values for row in rows] == [
+        {"file": "/a.mp4", "minutes": "5", "smart": "yes"},
+        {"file": "/b.mp4;/c.mp4"},
+    ]
+
+    jsonl_path = tmp_path / "batch.jsonl"
+    jsonl_path.write_text('# library\n{"file": ["/a.mp4"], "highlights": true}\n', encoding="utf-8")
+    assert [(row.line, row.values) for row in load_batch_manifest(jsonl_path)] == [
+        (2, {"file": ["/a.mp4"], "highlights": True})
+    ]
+
+
+def test_batch_runs_rows_skips_done_and_reports(tmp_path: Path, fake_media: None) -> None:
+    media = []
+    for name in ("one.mp4", "two.mp4"):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        media.append(path)
+    manifest = tmp_path / "library.jsonl"
+    manifest.write_text(
+        "\n".join(
+            json.dumps(row)
+            for row in (
+                {"file": str(media[0]), "minutes": 10},
+                {"file": str(media[1]), "template": "chapters-only"},
+                {"file": str(media[0]), "minutes": 10},
+                {"file": str(media[1]), "minutes": 500},
+                {"file": str(media[1]), "colour": "red"},
+            )
+        ),
+        encoding="utf-8",
+    )
+    out = tmp_path / "exports"
+    runner = CliRunner()
+
+    result = runner.invoke(main.cli, ["batch", str(manifest), "--out", str(out), "--jobs", "2"])
+    assert result.exit_code == ExitCodes.PARTIAL_FAILURE, result.output
+
+    statuses = [
+        json.loads(line)["status"] for line in (out / "batch.results.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert statuses == ["completed", "completed", "duplicate", "failed", "failed"]
+    failures = (out / "batch.failures.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["exit_code"] for line in failures] == [ExitCodes.INVALID_INPUT] * 2
+    summary = json.loads((out / "batch.summary.json").read_text(encoding="utf-8"))
+    assert summary["media_hours"] == pytest.approx(1.0)
+    assert summary["media_hours_per_wall_hour"] > 0
+
+    # Each job logs into its own export even though both ran in one process.
+    for line in (out / "batch.results.jsonl").read_text(encoding="utf-8").splitlines()[:2]:
+        job_id = json.loads(line)["job_id"]
+        events = [
+            json.loads(entry)
+            for entry in (out / job_id / "logs" / "job.log.jsonl").read_text(encoding="utf-8").splitlines()
+        ]
+        assert {event["job_id"] for event in events if event["message"] == "job_started"} == {job_id}
+
+    rerun = runner.invoke(main.cli, ["batch", str(manifest), "--out", str(out)])
+    statuses = [
+        json.loads(line)["status"] for line in (out / "batch.results.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert statuses[:2] == ["skipped", "skipped"]
+    assert rerun.exit_code == ExitCodes.PARTIAL_FAILURE
@@ -0,0 +1,127 @@
+"""Tests for the SQLite job catalog."""
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import pytest
+from click.testing import CliRunner
+
+from conftest import FakePipeline
+from creatorpack.app_cli import main
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.media.ffmpeg_ops import MediaProbe, parse_rendition_ladder
+from creatorpack.app_cli.nlp.highlights import HighlightPolicy
+from creatorpack.app_cli.outputs.catalog import CATALOG_FILENAME, JobCatalog
+from creatorpack.app_cli.stt.transcribe import TranscriptResult, TranscriptSegment, TranscriptionError
+
+
+@pytest.fixture
+def run(fake_pipeline: FakePipeline, run_options: Callable[..., RunOptions]) -> Callable[..., None]:
+    def _rendition_outputs(args: List[str]) -> None:
+        for arg in args[1:-1]:  # the last output is written by the fake itself
+            if arg.endswith(".mp4") and Path(arg).parent.is_dir() and not Path(arg).exists():
+                Path(arg).write_bytes(b"clip")
+
+    fake_pipeline.probe_result = MediaProbe(duration=150.0, streams=["video", "audio"], height=1080)
+    fake_pipeline.on_command = _rendition_outputs
+
+    def _run(job_id: str, *, catalog: Optional[Path], fail: bool = False, renditions: str = "") -> None:
+        def _transcribe(path: Path) -> TranscriptResult:
+            if fail:
+                raise TranscriptionError("model crashed")
+            return TranscriptResult(language="en", segments=[TranscriptSegment(id=0, start=0.0, end=30.0, text="Hi")])
+
+        fake_pipeline.transcript = _transcribe
+        options = run_options(
+            highlights=True,
+            highlight_policy=HighlightPolicy(top_k=1, min_seconds=20.0, max_seconds=30.0),
+            job_id=job_id,
+            catalog_path=catalog,
+            renditions=parse_rendition_ladder(renditions) if renditions else [],
+        )
+        _run_pipeline(options)
+
+    return _run
+
+
+def test_jobs_are_recorded_as_they_run(tmp_path: Path, run: Callable[..., None]) -> None:
+    out = tmp_path / "exports"
+    run("job-ok", catalog=out / CATALOG_FILENAME)
+    with pytest.raises(TranscriptionError):
+        run("job-bad", catalog=out / CATALOG_FILENAME, fail=True)
+    runner = CliRunner()
+
+    result = runner.invoke(main.cli, ["jobs", "--out", str(out), "list", "--json"])
+    assert result.exit_code == 0, result.output
+    jobs = {job["job_id"]: job for job in map(json.loads, result.output.splitlines())}
+    assert jobs["job-ok"]["status"] == "completed" and jobs["job-ok"]["media_seconds"] == 150.0
+    assert jobs["job-ok"]["rendered_seconds"] == 150.0 + 30.0  # three chapters and one highlight
+    assert jobs["job-bad"]["status"] == "failed" and jobs["job-bad"]["error"] == "model crashed"
+
+    # A renamed copy of the source still finds the job through its content fingerprint.
+    shutil.copy(tmp_path / "talk.mp4", tmp_path / "renamed.mp4")
+    result = runner.invoke(
+        main.cli, ["jobs", "--out", str(out), "list", "--status", "completed", "--input", str(tmp_path / "renamed.mp4")]
+    )
+    assert [line.split()[0] for line in result.output.splitlines()] == ["job-ok"]
+
+    detail = json.loads(runner.invoke(main.cli, ["jobs", "--out", str(out), "show", "job-ok"]).output)
+    kinds = [asset["kind"] for asset in detail["assets"]]
+    assert kinds.count("render_chapters") == 3 and kinds.count("render_highlights") == 1
+    assert kinds.count("captions") == 4 and kinds.count("transcript") == 2
+    assert {stage["name"]: stage["planned"] for stage in detail["stages"]}["render_highlights"] == "run"
+    assert detail["inputs"][0]["input"] == str(tmp_path / "talk.mp4")
+    assert runner.invoke(main.cli, ["jobs", "--out", str(out), "show", "nope"]).exit_code == 2
+
+    stats = json.loads(runner.invoke(main.cli, ["jobs", "--out", str(out), "stats", "--json"]).output)
+    assert stats["jobs"] == {"completed": 1, "failed": 1}
+    assert stats["rendered_seconds"] == 180.0 and stats["assets"]["render_chapters"]["files"] == 3
+
+
+def test_failure_while_finalizing_marks_the_job_failed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, run: Callable[..., None]
+) -> None:
+    out = tmp_path / "exports"
+
+    def _disk_full(*_, **__) -> None:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(main, "write_job_index", _disk_full)
+    with pytest.raises(OSError):
+        run("job-full", catalog=out / CATALOG_FILENAME)
+    (job,) = JobCatalog(out / CATALOG_FILENAME).list_jobs()
+    assert job["status"] == "failed" and "No space left" in job["error"] and job["finished_at"]
+
+
+def test_renditions_count_once_in_rendered_minutes(tmp_path: Path, run: Callable[..., None]) -> None:
+    out = tmp_path / "exports"
+    run("job-ladder", catalog=out / CATALOG_FILENAME, renditions="1080p,720p,480p")
+
+    catalog = JobCatalog(out / CATALOG_FILENAME)
+    chapters = [asset for asset in catalog.show("job-ladder")["assets"] if asset["kind"] == "render_chapters"]
+    assert len(chapters) == 9 and all(Path(asset["path"]).exists() for asset in chapters)
+    assert sorted(asset["duration"] for asset in chapters if asset["duration"]) == [30.0, 60.0, 60.0]
+    stats = catalog.stats()
+    assert stats["assets"]["render_chapters"] == {"files": 9, "seconds": 150.0, "bytes": 9 * len(b"clip")}
+    assert stats["rendered_seconds"] == 180.0
+
+
+def test_sync_backfills_existing_exports(tmp_path: Path, run: Callable[..., None]) -> None:
+    out = tmp_path / "exports"
+    run("job-old", catalog=None)
+    catalog = JobCatalog(out / CATALOG_FILENAME)
+    assert catalog.list_jobs() == []
+
+    result = CliRunner().invoke(main.cli, ["jobs", "--out", str(out), "sync"])
+    assert result.output == "1 jobs added\n"
+    assert catalog.sync(out) == 0
+    (job,) = catalog.list_jobs()
+    assert (job["job_id"], job["status"], job["template"]) == ("job-old", "completed", "creator-pack")
+    assert job["rendered_seconds"] == 180.0
+    detail = catalog.show("job-old")
+    assert all(Path(asset["path"]).exists() and asset["size"] for asset in detail["assets"])
+    kinds = [asset["kind"] for asset in detail["assets"]]
+    assert kinds.count("captions") == 4 and kinds.count("transcript") == 1  # transcript.txt is not in the index
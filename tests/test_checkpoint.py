@@ -0,0 +1,81 @@
+"""Tests for crash-safe checkpoints and --resume."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from conftest import FakePipeline
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.media import ffmpeg_ops
+from creatorpack.app_cli.media.ffmpeg_ops import FFmpegError, MediaProbe, MediaSegment, chunk_media
+from creatorpack.app_cli.util import io
+from creatorpack.app_cli.util.checkpoint import STATE_FILENAME, JobCheckpoint
+
+
+def test_renders_land_under_final_name_only_on_success(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def _encode(args: List[str], **_) -> None:
+        Path(args[-1]).write_bytes(b"partial")
+        if args[-1].endswith("talk_part-002.mp4"):
+            raise FFmpegError("encoder crashed")
+
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", _encode)
+    out = tmp_path / "out"
+    chunk_media(tmp_path / "talk.mp4", out, [MediaSegment(start=0.0, end=5.0)])
+    assert (out / "talk_part-001.mp4").read_bytes() == b"partial"
+    assert not (out / ".partial" / "talk_part-001.mp4").exists()
+
+    with pytest.raises(FFmpegError):
+        chunk_media(tmp_path / "talk.mp4", out, [MediaSegment(start=5.0, end=10.0)], first_index=2)
+    assert not (out / "talk_part-002.mp4").exists()
+
+
+def test_resume_continues_remaining_renders(
+    tmp_path: Path, fake_pipeline: FakePipeline, run_options: Callable[..., RunOptions]
+) -> None:
+    crash = {"at": "talk_part-003.mp4"}
+
+    def _encode(args: List[str]) -> None:
+        if args[0] == "ffprobe":
+            raise FFmpegError("ffprobe not installed")  # resume then verifies sizes only
+        if Path(args[-1]).name == crash["at"]:
+            raise FFmpegError("ffmpeg killed")
+
+    fake_pipeline.probe_result = MediaProbe(duration=240.0, streams=["video", "audio"])
+    fake_pipeline.on_command = _encode
+    root = tmp_path / "exports" / "job-resume"
+
+    with pytest.raises(FFmpegError):
+        _run_pipeline(run_options(job_id="job-resume", render_jobs=1))
+    state = json.loads((root / "job.state.json").read_text(encoding="utf-8"))
+    assert state["status"] == "failed"
+    assert "input-001:transcript" in state["stages"]
+    done = sorted(name for name in state["artifacts"])
+    assert "input-001:render_chapters-003" not in done and len(done) == len(fake_pipeline.renders)
+
+    # A clip truncated after it was recorded fails verification and is rendered again.
+    (root / "chapters" / "talk_part-001.mp4").write_bytes(b"cl")
+    crash["at"] = None
+    stt, probes, rendered = len(fake_pipeline.transcribed), fake_pipeline.probes, len(fake_pipeline.renders)
+    _run_pipeline(run_options(job_id="job-resume", render_jobs=1, resume=True))
+
+    renders = [path.name for path in fake_pipeline.renders[rendered:]]
+    assert len(fake_pipeline.transcribed) == stt and fake_pipeline.probes == probes
+    assert "talk_part-001.mp4" in renders and "talk_part-003.mp4" in renders
+    assert len(renders) == 4 - len(done) + 1
+    assert json.loads((root / "job.state.json").read_text(encoding="utf-8"))["status"] == "completed"
+
+
+def test_state_is_synced_to_disk_on_every_write(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    synced: List[str] = []
+    monkeypatch.setattr(io, "fsync_dir", lambda path: synced.append(f"dir {Path(path).name}"))
+    real_fsync = io.os.fsync
+    monkeypatch.setattr(io.os, "fsync", lambda fd: synced.append("file") or real_fsync(fd))
+
+    checkpoint = JobCheckpoint(tmp_path, "job-1")
+    checkpoint.memo("probe", lambda: {"duration": 1.0})
+    assert synced == ["file", f"dir {tmp_path.name}"] * 2
+    state = json.loads((tmp_path / STATE_FILENAME).read_text(encoding="utf-8"))
+    assert state["stages"]["probe"]["result"] == {"duration": 1.0}
@@ -0,0 +1,88 @@
+"""Tests for the columnar transcript store."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from conftest import FakePipeline
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.media.ffmpeg_ops import MediaProbe
+from creatorpack.app_cli.stt.columnar import ColumnarTranscript
+from creatorpack.app_cli.stt.transcribe import TranscriptResult, TranscriptSegment
+
+TRANSCRIPT = {
+    "language": "de",
+    "segments": [
+        {"id": 0, "start": 0.0, "end": 1.125, "text": "Grüße aus Köln 👋", "speaker": "S1"},
+        {"id": 1, "start": 1.125, "end": 2.5, "text": "", "speaker": "S2"},
+        {"id": 7, "start": 2.5, "end": 3.0000000001, "text": "three", "speaker": "S1"},
+    ],
+}
+
+
+def test_binary_round_trip_is_lossless(tmp_path: Path) -> None:
+    lone = {"id": 8, "start": 3.5, "end": 4.0, "text": "lone \ud800 surrogate", "speaker": "S3"}
+    transcript = {"language": "de", "segments": [*TRANSCRIPT["segments"], lone]}
+    columns = ColumnarTranscript.from_dict(transcript)
+    assert columns.speakers == ["S1", "S2", "S3"] and list(columns.speaker_index) == [0, 1, 0, 2]
+    columns.save(tmp_path / "t.cptr")
+
+    with ColumnarTranscript.load(tmp_path / "t.cptr") as loaded:
+        assert isinstance(loaded.starts, memoryview)  # mapped, not parsed
+        assert loaded.to_dict() == transcript
+        assert json.dumps(loaded.to_dict()) == json.dumps(transcript)
+        result = TranscriptResult.from_dict(transcript)
+        assert loaded.to_result() == result and loaded.to_text() == result.to_text()
+        assert loaded.segments[-1] == result.segments[-1] and loaded.segments[:2] == result.segments[:2]
+        assert ColumnarTranscript.from_result(loaded.to_result()).to_dict() == transcript
+
+    raw = (tmp_path / "t.cptr").read_bytes()
+    (tmp_path / "short.cptr").write_bytes(raw[:-3])
+    (tmp_path / "empty.cptr").write_bytes(b"")
+    for name in ("short.cptr", "empty.cptr"):
+        with pytest.raises(ValueError):
+            ColumnarTranscript.load(tmp_path / name)
+
+
+def test_pipeline_stores_transcripts_as_columns(
+    tmp_path: Path, fake_pipeline: FakePipeline, run_options: Callable[..., RunOptions]
+) -> None:
+    fake_pipeline.probe_result = MediaProbe(duration=60.0, streams=["video", "audio"])
+    fake_pipeline.transcript = TranscriptResult.from_dict(TRANSCRIPT)
+
+    def _run(job_id: str) -> int:
+        before = len(fake_pipeline.transcribed)
+        _run_pipeline(run_options(smart=True, job_id=job_id, stage_cache_dir=tmp_path / "cache"))
+        return len(fake_pipeline.transcribed) - before
+
+    assert _run("job-a") == 1
+    stored = list((tmp_path / "cache" / "transcript").glob("*.cptr"))
+    assert len(stored) == 1
+    state = json.loads((tmp_path / "exports" / "job-a" / "job.state.json").read_text(encoding="utf-8"))
+    record = next(entry["result"] for name, entry in state["stages"].items() if name.endswith(":transcript"))
+    assert record == {"columnar": str(stored[0]), "segments": 3}
+
+    assert _run("job-b") == 0
+    for job in ("job-a", "job-b"):
+        written = (tmp_path / "exports" / job / "transcript" / "transcript.json").read_text(encoding="utf-8")
+        assert json.loads(written) == TRANSCRIPT
+
+    # A cache entry whose binary file is gone is recomputed instead of failing the job.
+    stored[0].unlink()
+    assert _run("job-c") == 1
+    assert stored[0].exists()
+
+
+def test_segments_view_matches_list_semantics() -> None:
+    columns = ColumnarTranscript.from_result(
+        TranscriptResult(language="en", segments=[TranscriptSegment(id=n, start=n, end=n + 1, text=str(n)) for n in range(4)])
+    )
+    assert len(columns.segments) == 4 and columns.segments
+    assert [segment.text for segment in columns.segments[::2]] == ["0", "2"]
+    assert columns.segments[-1].start == 3.0
+    with pytest.raises(IndexError):
+        columns.segments[4]
+    assert not ColumnarTranscript.from_dict({"language": "en", "segments": []}).segments
@@ -0,0 +1,71 @@
+"""Tests for sampled content fingerprints and content-based job ids."""
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from creatorpack.app_cli.ingest.sources import IngestInput
+from creatorpack.app_cli.util import fingerprint
+from creatorpack.app_cli.util.fingerprint import BLOCK_SIZE, content_fingerprint
+from creatorpack.app_cli.util.job import compute_job_id
+
+
+def _job_id(path: Path, **kwargs) -> str:
+    return compute_job_id(
+        [IngestInput(kind="local", value=str(path))],
+        template="creator-pack",
+        minutes=10,
+        smart=False,
+        highlights=False,
+        highlight_config={},
+        brand_path=None,
+        diarize=False,
+        localize=None,
+        **kwargs,
+    )
+
+
+def test_sampled_fingerprint_follows_content(tmp_path: Path) -> None:
+    original = tmp_path / "talk.mp4"
+    original.write_bytes(bytes(range(256)) * (BLOCK_SIZE // 8))  # 32 blocks, sampled
+    copy = tmp_path / "elsewhere" / "renamed.mp4"
+    copy.parent.mkdir()
+    shutil.copyfile(original, copy)
+    os.utime(copy, ns=(1, 1))
+
+    value = content_fingerprint(original)
+    assert value.startswith("sampled:")
+    assert content_fingerprint(copy) == value
+    assert _job_id(copy) == _job_id(original)
+
+    # A byte the sampler never reads only shows up in the full hash.
+    data = bytearray(copy.read_bytes())
+    data[BLOCK_SIZE + 10] ^= 0xFF
+    copy.write_bytes(bytes(data))
+    assert content_fingerprint(copy) == value
+    assert content_fingerprint(copy, full=True) != content_fingerprint(original, full=True)
+    assert _job_id(copy, full_hash=True) != _job_id(original, full_hash=True)
+
+    data[0] ^= 0xFF
+    copy.write_bytes(bytes(data))
+    assert content_fingerprint(copy) != value
+
+
+def test_unchanged_files_are_read_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "talk.mp4"
+    path.write_bytes(b"x" * BLOCK_SIZE * 20)
+    reads = []
+    sampled = fingerprint._sampled_digest
+    monkeypatch.setattr(fingerprint, "_sampled_digest", lambda *args: reads.append(1) or sampled(*args))
+
+    first = content_fingerprint(path)
+    assert content_fingerprint(path) == first and len(reads) == 1
+    os.utime(path, ns=(2, 2))
+    assert content_fingerprint(path) == first and len(reads) == 2
+
+    small = tmp_path / "clip.wav"
+    small.write_bytes(b"tiny")
+    assert content_fingerprint(small).startswith("sha256:")
@@ -0,0 +1,193 @@
+"""Tests for the resumable HTTP downloader against a local stand-in server."""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+from creatorpack.app_cli.ingest.downloader import download_inputs
+from creatorpack.app_cli.ingest.http import HttpDownloader, HttpDownloadError
+from creatorpack.app_cli.ingest.license_gate import LicenseGate, LicenseViolationError
+from creatorpack.app_cli.ingest.sources import IngestInput
+
+
+class _StandIn:
+    """Serves in-memory assets with ranges, validators, redirects and scripted failures (``503`` or ``cut``)."""
+
+    def __init__(self) -> None:
+        self.assets: Dict[str, bytes] = {}
+        self.redirects: Dict[str, str] = {}
+        self.failures: Dict[str, List[str]] = {}
+        self.log: List[Tuple[str, str, Optional[str], int]] = []
+        self.lock = threading.Lock()
+        standin = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_):  # keep pytest output quiet
+                pass
+
+            def do_HEAD(self) -> None:
+                self._respond(head=True)
+
+            def do_GET(self) -> None:
+                self._respond(head=False)
+
+            def _respond(self, *, head: bool) -> None:
+                with standin.lock:
+                    standin.log.append((self.command, self.path, self.headers.get("Range"), self.client_address[1]))
+                    body = standin.assets.get(self.path)
+                    location = standin.redirects.get(self.path)
+                    failure = standin.failures.get(self.path, []).pop(0) if not head and standin.failures.get(self.path) else None
+                if location is not None:
+                    return self._empty(302, {"Location": location})
+                if body is None:
+                    return self._empty(404)
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._empty(304, {"ETag": etag})
+                if failure == "503":
+                    return self._empty(503)
+                start, end, status = 0, len(body) - 1, 200
+                wanted = self.headers.get("Range")
+                if wanted and self.headers.get("If-Range", etag) == etag:
+                    first, _, last = wanted.removeprefix("bytes=").partition("-")
+                    start, end, status = int(first), int(last) if last else len(body) - 1, 206
+                chunk = body[start : end + 1]
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(len(chunk)))
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                self.end_headers()
+                if head:
+                    return
+                if failure == "cut":
+                    self.wfile.write(chunk[: len(chunk) // 2])
+                    self.close_connection = True
+                    return
+                self.wfile.write(chunk)
+
+            def _empty(self, status: int, headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def gets(self, path: str) -> List[Optional[str]]:
+        return [wanted for method, logged, wanted, _ in self.log if method == "GET" and logged == path]
+
+
+@pytest.fixture()
+def standin() -> Iterator[_StandIn]:
+    server = _StandIn()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def test_segments_download_in_parallel_and_retry_from_where_they_stopped(tmp_path: Path, standin: _StandIn) -> None:
+    body = os.urandom(3 * 1024 * 1024 + 17)
+    standin.assets["/talk.mp4"] = body
+    standin.failures["/talk.mp4"] = ["503", "cut"]
+    downloader = HttpDownloader(tmp_path, segments=4, segment_threshold=1024 * 1024, backoff=0.0)
+
+    result = downloader.fetch(f"{standin.url}/talk.mp4")
+    assert result.path.read_bytes() == body and result.filename == "talk.mp4"
+    assert not list(tmp_path.glob("*/body.part*"))
+
+    step = -(-len(body) // 4)
+    starts = {int(wanted.removeprefix("bytes=").partition("-")[0]) for wanted in standin.gets("/talk.mp4")}
+    assert {0, step, 2 * step, 3 * step} <= starts
+    assert len(starts) == 5  # the cut segment resumed mid-way
+
+    # Unchanged on the server: a conditional HEAD, no body transfer, pooled connections.
+    gets = len(standin.gets("/talk.mp4"))
+    again = downloader.fetch(f"{standin.url}/talk.mp4")
+    assert again.reused and again.path.read_bytes() == body
+    assert len(standin.gets("/talk.mp4")) == gets
+    assert len({port for *_, port in standin.log}) < len(standin.log)
+
+    standin.assets["/talk.mp4"] = b"new cut" * 1000
+    changed = downloader.fetch(f"{standin.url}/talk.mp4")
+    assert not changed.reused and changed.path.read_bytes() == b"new cut" * 1000
+    downloader.close()
+
+
+def test_interrupted_download_resumes_from_part_file(tmp_path: Path, standin: _StandIn) -> None:
+    body = os.urandom(600 * 1024)
+    standin.assets["/clip.mov"] = body
+    standin.failures["/clip.mov"] = ["cut"]
+    with pytest.raises(HttpDownloadError):
+        HttpDownloader(tmp_path, retries=0).fetch(f"{standin.url}/clip.mov")
+    assert list(tmp_path.glob("*/body.part.json"))
+
+    result = HttpDownloader(tmp_path, retries=0).fetch(f"{standin.url}/clip.mov")
+    assert result.path.read_bytes() == body
+    first, resumed = standin.gets("/clip.mov")
+    assert first == f"bytes=0-{len(body) - 1}"
+    assert resumed != first and resumed.endswith(f"-{len(body) - 1}")
+
+
+def test_redirects_are_followed_to_allowed_hosts_only(tmp_path: Path, standin: _StandIn) -> None:
+    body = os.urandom(2 * 1024 * 1024)
+    port = standin.server.server_address[1]
+    standin.assets["/items/talk.mp4"] = body
+    standin.redirects["/download/talk.mp4"] = f"http://localhost:{port}/items/talk.mp4"
+    url = f"{standin.url}/download/talk.mp4"
+
+    with pytest.raises(HttpDownloadError, match="not an allowlisted source"):
+        HttpDownloader(tmp_path, backoff=0.0).fetch(url)
+    assert standin.gets("/items/talk.mp4") == []
+
+    downloader = HttpDownloader(tmp_path, segment_threshold=1024 * 1024, allowed_hosts=["localhost"])
+    result = downloader.fetch(url)
+    assert result.path.read_bytes() == body and result.filename == "talk.mp4"
+    assert len(standin.gets("/items/talk.mp4")) == 4  # ranged GETs go straight to the final location
+    assert downloader.fetch(url).reused
+    downloader.close()
+
+    standin.redirects["/loop"] = "/loop"
+    with pytest.raises(HttpDownloadError, match="redirected more than"):
+        HttpDownloader(tmp_path).fetch(f"{standin.url}/loop")
+
+
+def test_concurrent_fetches_of_one_url_share_a_single_download(tmp_path: Path, standin: _StandIn) -> None:
+    body = os.urandom(3 * 1024 * 1024)
+    standin.assets["/talk.mp4"] = body
+    url = f"{standin.url}/talk.mp4"
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: HttpDownloader(tmp_path, segment_threshold=1024 * 1024).fetch(url), range(4)))
+
+    assert all(result.path.read_bytes() == body for result in results)
+    assert sum(not result.reused for result in results) == 1
+    assert len(standin.gets("/talk.mp4")) == 4  # one segmented download, the rest revalidated
+    assert (next(tmp_path.iterdir()) / ".lock").exists()
+
+
+def test_download_inputs_checks_license_before_fetching(tmp_path: Path, standin: _StandIn) -> None:
+    standin.assets["/apollo.mp4"] = b"moon"
+    result = download_inputs(
+        [IngestInput(kind="nasa", value=f"{standin.url}/apollo.mp4")], tmp_path / "input", LicenseGate()
+    )[0]
+    assert result.path == tmp_path / "input" / "apollo.mp4" and result.path.read_bytes() == b"moon"
+    assert result.ingest_method == "download" and result.license_info.license_code == "pd"
+
+    requests = len(standin.log)
+    with pytest.raises(LicenseViolationError):
+        download_inputs([IngestInput(kind="pexels", value=f"{standin.url}/apollo.mp4")], tmp_path / "b", LicenseGate())
+    assert len(standin.log) == requests
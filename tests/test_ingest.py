@@ -0,0 +1,65 @@
+"""Tests for local ingest strategies."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from creatorpack.app_cli.ingest.downloader import DownloadError, download_inputs
+from creatorpack.app_cli.ingest.license_gate import LicenseGate
+from creatorpack.app_cli.ingest.sources import IngestInput
+from creatorpack.app_cli.util.io import copy_with_progress
+
+
+def _ingest(source: Path, target: Path, strategy: str):
+    return download_inputs([IngestInput(kind="local", value=str(source))], target, LicenseGate(), strategy=strategy)[0]
+
+
+@pytest.fixture()
+def recording(tmp_path: Path) -> Path:
+    path = tmp_path / "src" / "talk.mp4"
+    path.parent.mkdir()
+    path.write_bytes(b"frames" * 1000)
+    return path
+
+
+def test_strategies_avoid_copying(tmp_path: Path, recording: Path) -> None:
+    hardlinked = _ingest(recording, tmp_path / "a", "hardlink")
+    assert hardlinked.ingest_method == "hardlink" and os.path.samefile(hardlinked.path, recording)
+
+    symlinked = _ingest(recording, tmp_path / "b", "symlink")
+    assert symlinked.ingest_method == "symlink" and symlinked.path.is_symlink()
+
+    referenced = _ingest(recording, tmp_path / "c", "reference")
+    assert referenced.path == recording.resolve() and not any((tmp_path / "c").iterdir())
+
+    copied = _ingest(recording, tmp_path / "d", "copy")
+    assert copied.ingest_method == "copy" and copied.fingerprint is None
+    assert copied.path.read_bytes() == recording.read_bytes() and not os.path.samefile(copied.path, recording)
+
+    auto = _ingest(recording, tmp_path / "e", "auto")
+    assert auto.ingest_method in ("reflink", "hardlink")
+
+    with pytest.raises(DownloadError):
+        _ingest(recording, tmp_path / "f", "teleport")
+
+
+def test_changed_source_is_detected(tmp_path: Path, recording: Path) -> None:
+    result = _ingest(recording, tmp_path / "job", "reference")
+    result.ensure_unchanged()
+    with recording.open("ab") as handle:
+        handle.write(b"more")
+    with pytest.raises(DownloadError):
+        result.ensure_unchanged()
+
+
+def test_chunked_copy_reports_progress(tmp_path: Path, recording: Path) -> None:
+    seen: List[Tuple[int, int]] = []
+    dest = tmp_path / "out" / "talk.mp4"
+    copy_with_progress(recording, dest, lambda copied, total: seen.append((copied, total)), chunk_size=2500)
+    assert seen == [(2500, 6000), (5000, 6000), (6000, 6000)]
+    assert dest.read_bytes() == recording.read_bytes()
+    assert dest.stat().st_mtime_ns == recording.stat().st_mtime_ns
+    assert [path.name for path in dest.parent.iterdir()] == ["talk.mp4"]
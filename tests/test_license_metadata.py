@@ -0,0 +1,164 @@
+"""Tests for per-source license metadata resolution against local fixture servers."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from creatorpack.app_cli.ingest.downloader import download_inputs
+from creatorpack.app_cli.ingest.license_gate import LicenseGate, LicenseViolationError
+from creatorpack.app_cli.ingest.metadata import (
+    ArchiveAdapter,
+    CommonsAdapter,
+    LicenseLookupError,
+    LicenseResolver,
+    NasaAdapter,
+    license_code_from_url,
+)
+from creatorpack.app_cli.ingest.sources import IngestInput
+
+
+class _Fixtures:
+    """A metadata API stand-in that answers like archive.org, Commons and the NASA images API."""
+
+    def __init__(self) -> None:
+        self.items: Dict[str, dict] = {}
+        self.fail_next: List[int] = []
+        self.requests: List[str] = []
+        self.active = self.peak = 0
+        self.delay = 0.0
+        self.lock = threading.Lock()
+        fixtures = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_):
+                pass
+
+            def do_GET(self) -> None:
+                with fixtures.lock:
+                    fixtures.requests.append(self.path)
+                    fixtures.active += 1
+                    fixtures.peak = max(fixtures.peak, fixtures.active)
+                    status = fixtures.fail_next.pop(0) if fixtures.fail_next else 200
+                time.sleep(fixtures.delay)
+                payload = fixtures.answer(self.path) if status == 200 else None
+                if status == 200 and payload is None:
+                    status = 404
+                body = json.dumps(payload or {}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with fixtures.lock:
+                    fixtures.active -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def answer(self, path: str):
+        parsed = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        if parsed.path.startswith("/metadata/"):
+            return self.items.get(parsed.path[len("/metadata/") :])
+        if parsed.path == "/w/api.php":
+            item = self.items.get(query["titles"])
+            return {"query": {"pages": {"1": item or {"missing": ""}}}}
+        if parsed.path == "/search":
+            return self.items.get(query["nasa_id"])
+        return None
+
+    def resolver(self, cache_dir, **kwargs) -> LicenseResolver:
+        adapters = [ArchiveAdapter(self.url), CommonsAdapter(self.url), NasaAdapter(self.url)]
+        return LicenseResolver(cache_dir, adapters=adapters, backoff=0.0, **kwargs)
+
+
+@pytest.fixture()
+def fixtures() -> Iterator[_Fixtures]:
+    server = _Fixtures()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def _archive_item(license_url: str, creator="Prelinger Archives") -> dict:
+    return {"metadata": {"title": "Duck and Cover", "creator": creator, "licenseurl": license_url}}
+
+
+def test_adapters_read_each_source(fixtures: _Fixtures, tmp_path: Path) -> None:
+    fixtures.items["duck"] = _archive_item("http://creativecommons.org/publicdomain/mark/1.0/")
+    fixtures.items["File:Moon.webm"] = {
+        "imageinfo": [
+            {
+                "extmetadata": {
+                    "ObjectName": {"value": "Moon"},
+                    "Artist": {"value": '<a href="//commons.wikimedia.org/wiki/User:X">Jane &amp; Co</a>'},
+                    "License": {"value": "cc-by-4.0"},
+                    "LicenseUrl": {"value": "https://creativecommons.org/licenses/by/4.0"},
+                }
+            }
+        ]
+    }
+    fixtures.items["as11-40-5903"] = {
+        "collection": {"items": [{"data": [{"title": "Apollo 11", "photographer": "Buzz Aldrin"}]}]}
+    }
+    resolver = fixtures.resolver(tmp_path)
+
+    archive, commons, nasa = resolver.resolve_many(
+        [
+            IngestInput("archive", "https://archive.org/details/duck"),
+            IngestInput("commons", "https://commons.wikimedia.org/wiki/File:Moon.webm"),
+            IngestInput("nasa", "https://images.nasa.gov/details/as11-40-5903"),
+        ]
+    )
+    assert (archive.license_code, archive.creator, archive.title) == ("pd", "Prelinger Archives", "Duck and Cover")
+    assert (commons.license_code, commons.creator, commons.requires_attribution) == ("cc-by-4.0", "Jane & Co", True)
+    assert (nasa.license_code, nasa.creator, nasa.title) == ("pd", "Buzz Aldrin", "Apollo 11")
+
+    assert license_code_from_url("https://creativecommons.org/licenses/by-sa/3.0/") == "cc-by-sa-3.0"
+    assert license_code_from_url("https://creativecommons.org/publicdomain/zero/1.0/") == "cc0"
+    assert license_code_from_url("http://rightsstatements.org/vocab/InC/1.0/") == "inc"
+
+    with pytest.raises(LicenseLookupError):
+        resolver.resolve(IngestInput("archive", "https://archive.org/details/missing"))
+
+
+def test_lookups_are_bounded_cached_and_expire(fixtures: _Fixtures, tmp_path: Path) -> None:
+    inputs = [IngestInput("archive", f"https://archive.org/download/item{n}/film.mp4") for n in range(12)]
+    for n in range(12):
+        fixtures.items[f"item{n}"] = _archive_item("https://creativecommons.org/licenses/by/4.0/")
+    fixtures.delay = 0.05
+    fixtures.fail_next = [503]  # retried transparently
+
+    infos = fixtures.resolver(tmp_path, concurrency=4).resolve_many(inputs + inputs[:3])
+    assert [info.license_code for info in infos] == ["cc-by-4.0"] * 15
+    assert len(fixtures.requests) == 13  # one per asset plus the retried 503
+    assert 1 < fixtures.peak <= 4
+
+    # A new process within the TTL reads the on-disk cache; an expired entry is looked up again.
+    assert fixtures.resolver(tmp_path).resolve_many(inputs) == infos[:12]
+    assert len(fixtures.requests) == 13
+    fixtures.resolver(tmp_path, ttl=0.0).resolve(inputs[0])
+    assert len(fixtures.requests) == 14
+
+
+def test_download_inputs_refuses_before_fetching(fixtures: _Fixtures, tmp_path: Path) -> None:
+    fixtures.items["ok"] = _archive_item("https://creativecommons.org/licenses/by/4.0/")
+    fixtures.items["sa"] = _archive_item("https://creativecommons.org/licenses/by-sa/4.0/")
+    inputs = [
+        IngestInput("archive", f"{fixtures.url}/download/ok/a.mp4"),
+        IngestInput("archive", f"{fixtures.url}/download/sa/b.mp4"),
+    ]
+    with pytest.raises(LicenseViolationError):
+        download_inputs(inputs, tmp_path / "input", LicenseGate(), resolver=fixtures.resolver(None))
+    assert all(path.startswith("/metadata/") for path in fixtures.requests)
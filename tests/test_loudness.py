@@ -0,0 +1,72 @@
+"""Tests for whole-source loudness normalization."""
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from creatorpack.app_cli.media import ffmpeg_ops
+from creatorpack.app_cli.media.ffmpeg_ops import LoudnessTarget, MediaSegment, chunk_media, probe_media
+
+_LOUDNORM_STDERR = """[Parsed_loudnorm_0 @ 0x55d]
+{
+\t"input_i" : "-27.61",
+\t"input_tp" : "-4.47",
+\t"input_lra" : "18.06",
+\t"input_thresh" : "-39.20",
+\t"output_i" : "-16.58",
+\t"output_tp" : "-1.50",
+\t"output_lra" : "14.78",
+\t"output_thresh" : "-27.71",
+\t"normalization_type" : "dynamic",
+\t"target_offset" : "0.58"
+}
+"""
+
+
+def _fake_ffmpeg(calls: List[List[str]]):
+    def _run(args, **_):
+        calls.append(list(args))
+        if args[0] == "ffprobe":
+            payload = {"format": {"duration": "120.0"}, "streams": [{"codec_type": "video"}, {"codec_type": "audio"}]}
+            return subprocess.CompletedProcess(args, 0, json.dumps(payload), "")
+        return subprocess.CompletedProcess(args, 0, "", _LOUDNORM_STDERR)
+
+    return _run
+
+
+def test_loudness_measured_once_and_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "talk.mp4"
+    source.write_bytes(b"media")
+    calls: List[List[str]] = []
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", _fake_ffmpeg(calls))
+
+    probe = probe_media(source, loudness_target=LoudnessTarget(), cache_dir=tmp_path / "cache")
+    again = probe_media(source, loudness_target=LoudnessTarget(), cache_dir=tmp_path / "cache")
+
+    assert len(calls) == 2
+    assert probe.loudness is not None
+    assert again.loudness == probe.loudness
+    assert probe.loudness.input_i == pytest.approx(-27.61)
+
+
+def test_measured_values_applied_to_every_cut(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "talk.mp4"
+    source.write_bytes(b"media")
+    calls: List[List[str]] = []
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", _fake_ffmpeg(calls))
+    probe = probe_media(source, loudness_target=LoudnessTarget())
+    calls.clear()
+
+    segments = [MediaSegment(start=0.0, end=60.0), MediaSegment(start=60.0, end=120.0)]
+    chunk_media(source, tmp_path / "out", segments, audio_filter=probe.loudness.filter())
+
+    assert len(calls) == 2
+    for args in calls:
+        audio_filter = args[args.index("-af") + 1]
+        assert "measured_I=-27.61" in audio_filter
+        assert "linear=true" in audio_filter
+        assert "print_format" not in audio_filter
@@ -0,0 +1,62 @@
+"""Tests for atomic manifest writes and the batched manifest writer."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from creatorpack.app_cli.util import io
+from creatorpack.app_cli.util.io import ManifestWriter, dump_json, encode_json
+
+
+def test_failed_write_keeps_previous_manifest(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "manifests" / "chapters.json"
+    dump_json({"chapters": [1, 2]}, path)
+
+    def _crash(*_):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(io.os, "replace", _crash)
+    with pytest.raises(OSError):
+        dump_json({"chapters": [1, 2, 3]}, path)
+    assert json.loads(path.read_text(encoding="utf-8")) == {"chapters": [1, 2]}
+    assert [child.name for child in path.parent.iterdir()] == ["chapters.json"]
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+def test_encodings_match_between_backends(backend: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(io, "orjson", None)
+    data = {"title": "Café", "segments": [{"start": 0.5, "text": "hi"}], "n": 3}
+    assert encode_json(data).decode("utf-8") == json.dumps(data, indent=2, ensure_ascii=False)
+    assert encode_json(data, compact=True).decode("utf-8") == json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_stdlib_takes_over_when_backend_refuses(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("orjson")
+    assert json.loads(encode_json({"big": 2**70})) == {"big": 2**70}
+
+
+def test_writer_flushes_staged_manifests_together(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    synced: List[int] = []
+    fsync = os.fsync
+    monkeypatch.setattr(io.os, "fsync", lambda handle: synced.append(handle) or fsync(handle))
+
+    writer = ManifestWriter()
+    first, job = tmp_path / "manifests" / "chapters.json", tmp_path / "manifests" / "job.json"
+    writer.stage({"v": 1}, first)
+    writer.stage({"done": True}, job)
+    writer.stage({"v": 2}, first, compact=True)
+    assert writer.exists(first) and not first.exists()
+
+    assert writer.flush() == 2
+    assert first.read_text(encoding="utf-8") == '{"v":2}'
+    assert json.loads(job.read_text(encoding="utf-8")) == {"done": True}
+    assert first.stat().st_mtime_ns <= job.stat().st_mtime_ns  # restaging keeps the first position
+    assert len(synced) == 3  # each file, then the shared directory once
+    assert writer.flush() == 0
@@ -0,0 +1,43 @@
+"""Tests for per-input export namespacing."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable
+
+from conftest import FakePipeline
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.media.ffmpeg_ops import MediaProbe
+from creatorpack.app_cli.outputs.packaging import input_slug
+from creatorpack.app_cli.stt.transcribe import TranscriptResult, TranscriptSegment
+
+
+def test_input_slug_is_unique_and_safe() -> None:
+    assert input_slug(1, "/media/ep 1/talk.mp4") == "001-talk"
+    assert input_slug(2, "https://archive.org/download/x/My%20Show.mp3?x=1") == "002-My_Show"
+
+
+def test_same_stem_inputs_get_separate_trees(
+    tmp_path: Path, fake_pipeline: FakePipeline, run_options: Callable[..., RunOptions]
+) -> None:
+    first = tmp_path / "a" / "talk.mp4"
+    second = tmp_path / "b" / "talk.mp4"
+    for path, payload in ((first, b"first"), (second, b"second")):
+        path.parent.mkdir()
+        path.write_bytes(payload)
+
+    fake_pipeline.probe_result = MediaProbe(duration=30.0, streams=["video", "audio"])
+    fake_pipeline.transcript = lambda path: TranscriptResult(
+        language="en", segments=[TranscriptSegment(id=0, start=0.0, end=5.0, text=path.read_text())]
+    )
+    _run_pipeline(run_options(first, second, job_id="job-multi"))
+
+    root = tmp_path / "exports" / "job-multi"
+    index = json.loads((root / "manifests" / "index.json").read_text(encoding="utf-8"))
+    assert [entry["root"] for entry in index["inputs"]] == ["inputs/001-talk", "inputs/002-talk"]
+    for entry, expected in zip(index["inputs"], ("first", "second")):
+        transcript = json.loads((root / entry["transcript"]).read_text(encoding="utf-8"))
+        assert transcript["segments"][0]["text"] == expected
+        assert (root / entry["manifests"]["assets_map"]).exists()
+        assert (root / entry["root"] / "input" / "talk.mp4").read_text() == expected
+    assert (root / "manifests" / "job.json").exists()
@@ -0,0 +1,94 @@
+"""Tests for silence-trimmed podcast rendering."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from conftest import FakePipeline
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.media import ffmpeg_ops
+from creatorpack.app_cli.media.ffmpeg_ops import MediaProbe, chunk_media, parse_rendition_ladder
+from creatorpack.app_cli.media.silence import (
+    SilencePolicy,
+    TrimTimeline,
+    build_keep_intervals,
+    parse_silencedetect,
+)
+from creatorpack.app_cli.stt.transcribe import TranscriptResult, TranscriptSegment
+
+_SILENCEDETECT_STDERR = """[silencedetect @ 0x1] silence_start: 10
+[silencedetect @ 0x1] silence_end: 14 | silence_duration: 4
+[silencedetect @ 0x1] silence_start: 30.5
+[silencedetect @ 0x1] silence_end: 30.9 | silence_duration: 0.4
+[silencedetect @ 0x1] silence_start: 55
+"""
+
+
+def test_keep_intervals_drop_long_silences() -> None:
+    silences = parse_silencedetect(_SILENCEDETECT_STDERR, duration=60.0)
+    assert silences == [(10.0, 14.0), (30.5, 30.9), (55.0, 60.0)]
+    keep = build_keep_intervals(60.0, silences, SilencePolicy(threshold_seconds=1.0, padding_seconds=0.0))
+    assert keep == [(0.0, 10.0), (14.0, 55.0)]
+
+
+def test_timeline_remaps_transcript_and_ranges() -> None:
+    timeline = TrimTimeline([(0.0, 10.0), (14.0, 55.0)])
+    assert timeline.duration == pytest.approx(51.0)
+    assert timeline.to_trimmed(20.0) == pytest.approx(16.0)
+    assert timeline.to_trimmed(12.0) == pytest.approx(10.0)
+    assert timeline.to_source_ranges(5.0, 20.0) == [(5.0, 10.0), (14.0, 24.0)]
+
+    transcript = TranscriptResult(
+        language="en", segments=[TranscriptSegment(id=0, start=15.0, end=18.0, text="after the pause")]
+    )
+    remapped = timeline.remap_transcript(transcript)
+    assert (remapped.segments[0].start, remapped.segments[0].end) == pytest.approx((11.0, 14.0))
+
+
+def test_trimmed_chapter_renders_as_one_concat(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[List[str]] = []
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", lambda args, **_: calls.append(list(args)))
+    timeline = TrimTimeline([(0.0, 10.0), (14.0, 55.0)])
+
+    chunk_media(tmp_path / "pod.mp4", tmp_path / "out", [timeline.segment(0.0, 30.0, "Chapter 1")])
+
+    assert len(calls) == 1
+    args = calls[0]
+    assert args[args.index("-ss") + 1] == "0.000"
+    assert args[args.index("-t") + 1] == "34.000"
+    graph = args[args.index("-filter_complex") + 1]
+    assert "concat=n=2:v=1:a=1[vc][ac]" in graph
+    assert "trim=start=14.000:end=34.000" in graph
+
+
+def test_video_without_audio_concats_video_only(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[List[str]] = []
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", lambda args, **_: calls.append(list(args)))
+    timeline = TrimTimeline([(0.0, 10.0), (14.0, 55.0)])
+    segment = timeline.segment(0.0, 30.0, "Chapter 1")
+
+    chunk_media(tmp_path / "b-roll.mp4", tmp_path / "out", [segment], has_audio=False)
+    ladder = parse_rendition_ladder("720p,480p")
+    chunk_media(tmp_path / "b-roll.mp4", tmp_path / "ladder", [segment], has_audio=False, renditions=ladder)
+
+    for args in calls:
+        graph = args[args.index("-filter_complex") + 1]
+        assert "concat=n=2:v=1:a=0[vc]" in graph and "[0:a]" not in graph and "asplit" not in graph
+        maps = [args[index + 1] for index, arg in enumerate(args) if arg == "-map"]
+        assert maps and all(label.startswith("[v") for label in maps)
+
+
+def test_podcast_template_accepts_silent_video(
+    tmp_path: Path, fake_pipeline: FakePipeline, run_options: Callable[..., RunOptions]
+) -> None:
+    media = tmp_path / "screen.mp4"
+    media.write_bytes(b"video only")
+    fake_pipeline.probe_result = MediaProbe(duration=90.0, streams=["video"])
+    fake_pipeline.transcript = TranscriptResult(language="und", segments=[])
+    _run_pipeline(run_options(media, template="podcast", job_id="job-silent"))
+
+    calls = fake_pipeline.commands
+    assert calls and not any("silencedetect" in " ".join(args) or "0:a]" in " ".join(args) for args in calls)
+    assert not (tmp_path / "exports" / "job-silent" / "manifests" / "edit_decisions.json").exists()
@@ -0,0 +1,122 @@
+"""Tests for the content-addressed render cache."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+from click.testing import CliRunner
+
+from creatorpack.app_cli import main
+from creatorpack.app_cli.branding.theme import BrandTheme
+from creatorpack.app_cli.media import ffmpeg_ops
+from creatorpack.app_cli.media.ffmpeg_ops import MediaSegment, chunk_media
+from creatorpack.app_cli.media.render_cache import RenderCache, parse_size
+
+
+def _fake_encoder(monkeypatch: pytest.MonkeyPatch) -> List[List[str]]:
+    calls: List[List[str]] = []
+
+    def _encode(args: List[str], **_) -> None:
+        calls.append(args)
+        Path(args[-1]).write_bytes(f"clip {args[args.index('-ss') + 1]}".encode())
+
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", _encode)
+    return calls
+
+
+def test_identical_renders_are_linked_across_jobs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _fake_encoder(monkeypatch)
+    cache = RenderCache(tmp_path / "cache")
+    source = tmp_path / "talk.mp4"
+    source.write_bytes(b"media")
+    segments = [MediaSegment(start=0.0, end=5.0), MediaSegment(start=5.0, end=10.0)]
+
+    chunk_media(source, tmp_path / "job-a", segments, render_cache=cache)
+    chunk_media(source, tmp_path / "job-b", segments, render_cache=cache)
+    assert len(calls) == 2
+    assert cache.summary() == {"reused": 2, "recomputed": 2}
+    first, second = tmp_path / "job-a" / "talk_part-001.mp4", tmp_path / "job-b" / "talk_part-001.mp4"
+    assert second.read_bytes() == b"clip 0.000"
+    assert os.path.samefile(first, second) or first.stat().st_nlink == 1  # reflink or copy elsewhere
+
+    # Anything in the ffmpeg invocation (here the audio filter) is part of the key.
+    chunk_media(source, tmp_path / "job-c", segments[:1], render_cache=cache, audio_filter="volume=2")
+    assert len(calls) == 3
+
+    # The source counts by content: touching it still hits, rewriting it misses.
+    os.utime(source, ns=(1, 1))
+    chunk_media(source, tmp_path / "job-d", segments[:1], render_cache=cache)
+    assert len(calls) == 3
+    source.write_bytes(b"other media")
+    chunk_media(source, tmp_path / "job-d", segments[:1], render_cache=cache)
+    assert len(calls) == 4
+    assert cache.usage()["objects"] == 2  # job-c and job-d produced the same bytes as job-a's first clip
+
+
+def test_replaced_watermark_renders_again(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _fake_encoder(monkeypatch)
+    cache = RenderCache(tmp_path / "cache")
+    source = tmp_path / "talk.mp4"
+    source.write_bytes(b"media")
+    logo = tmp_path / "brand" / "logo.png"
+    logo.parent.mkdir()
+    logo.write_bytes(b"old logo")
+    brand = BrandTheme(
+        name="acme",
+        fonts={},
+        colors={},
+        captions={},
+        intro_path=None,
+        outro_path=None,
+        watermark_path=logo,
+        watermark_position_expr="W-w-20:20",
+        watermark_scale=0.2,
+        watermark_opacity=0.8,
+    )
+    segment = [MediaSegment(start=0.0, end=5.0)]
+
+    chunk_media(source, tmp_path / "job-a", segment, brand=brand, render_cache=cache)
+    chunk_media(source, tmp_path / "job-b", segment, brand=brand, render_cache=cache)
+    assert len(calls) == 1 and "movie='" in " ".join(calls[0])
+    # Same path, new artwork: the cached branded clip must not be reused.
+    logo.write_bytes(b"new logo")
+    chunk_media(source, tmp_path / "job-c", segment, brand=brand, render_cache=cache)
+    assert len(calls) == 2
+
+
+def test_evict_drops_least_recently_used_first(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _fake_encoder(monkeypatch)
+    cache = RenderCache(tmp_path / "cache" / "renders")
+    source = tmp_path / "talk.mp4"
+    source.write_bytes(b"media")
+    segments = [MediaSegment(start=float(start), end=start + 5.0) for start in (0, 4, 8)]
+    chunk_media(source, tmp_path / "job-a", segments, render_cache=cache)
+    entries = sorted((cache.root / "entries").glob("*/*.json"))
+    for age, entry in enumerate(entries):
+        os.utime(entry, (1000 + age, 1000 + age))
+    # Reusing the oldest entry makes it the most recently used.
+    chunk_media(source, tmp_path / "job-b", [segments[0]], render_cache=cache)
+    assert len(calls) == 3
+
+    size = len(b"clip 0.000")
+    report = cache.evict(max_bytes=2 * size)
+    assert (report.removed_entries, report.remaining_entries) == (1, 2)
+    assert report.remaining_bytes == 2 * size
+    chunk_media(source, tmp_path / "job-c", [segments[0]], render_cache=cache)
+    assert len(calls) == 3
+
+    result = CliRunner().invoke(main.cli, ["cache", "gc", "--cache-dir", str(tmp_path / "cache"), "--max-size", "0"])
+    assert result.exit_code == 0, result.output
+    assert cache.usage() == {"entries": 0, "objects": 0, "bytes": 0}
+    assert (tmp_path / "job-c" / "talk_part-001.mp4").read_bytes() == b"clip 0.000"
+
+
+def test_parse_size() -> None:
+    assert parse_size("512") == 512
+    assert parse_size("1.5K") == 1536
+    assert parse_size("20G") == 20 * 1024**3
+    assert parse_size("2 GiB") == 2 * 1024**3
+    with pytest.raises(ValueError):
+        parse_size("lots")
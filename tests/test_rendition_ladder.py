@@ -0,0 +1,66 @@
+"""Tests for multi-rendition chapter output."""
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from creatorpack.app_cli.ingest.downloader import DownloadResult
+from creatorpack.app_cli.ingest.license_gate import LicenseGate
+from creatorpack.app_cli.media import ffmpeg_ops
+from creatorpack.app_cli.media.ffmpeg_ops import (
+    MediaProbe,
+    MediaSegment,
+    chunk_media,
+    parse_rendition_ladder,
+    select_renditions,
+)
+from creatorpack.app_cli.outputs.packaging import build_export_structure, write_assets_map
+from creatorpack.app_cli.schemas.validate import validate_manifest
+from creatorpack.app_cli.util.errors import CreatorPackError
+
+
+def test_parse_and_select_ladder() -> None:
+    ladder = parse_rendition_ladder("480p, 1080p,720p")
+    assert [rendition.name for rendition in ladder] == ["1080p", "720p", "480p"]
+    assert [rendition.name for rendition in parse_rendition_ladder("720p,480p,720P,0480p")] == ["720p", "480p"]
+    selected = select_renditions(ladder, MediaProbe(duration=10.0, streams=["video"], width=1280, height=720))
+    assert [rendition.name for rendition in selected] == ["720p", "480p"]
+    with pytest.raises(CreatorPackError):
+        parse_rendition_ladder("hd")
+
+
+def test_ladder_encodes_all_renditions_in_one_process(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[List[str]] = []
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", lambda args, **_: calls.append(list(args)))
+
+    ctx = build_export_structure(tmp_path, "job-ladder")
+    outputs = chunk_media(
+        tmp_path / "talk.mp4",
+        ctx.chapters_dir,
+        [MediaSegment(start=0.0, end=30.0, caption="Chapter 1")],
+        renditions=parse_rendition_ladder("1080p,720p,480p"),
+    )
+
+    assert len(calls) == 1
+    args = calls[0]
+    assert args.count("-i") == 1
+    assert "split=3[s0][s1][s2]" in args[args.index("-filter_complex") + 1]
+    assert args[-1].endswith("talk_part-001_480p.mp4")
+    assert outputs[0].file.name == "talk_part-001_1080p.mp4"
+
+    gate = LicenseGate()
+    download = DownloadResult(
+        path=tmp_path / "talk.mp4",
+        source="local",
+        original_name="talk.mp4",
+        retrieved_at=datetime.utcnow(),
+        license_info=gate.build_info(source="local", title="talk", creator=None, license_code="pd", license_url=None),
+    )
+    write_assets_map(ctx, download, outputs, None)
+    assets = json.loads((ctx.manifests_dir / "assets.map.json").read_text(encoding="utf-8"))
+    validate_manifest(assets, Path("creatorpack/app_cli/schemas/assets_map_schema.json"))
+    assert [item["name"] for item in assets["chunks"][0]["renditions"]] == ["1080p", "720p", "480p"]
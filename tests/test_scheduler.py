@@ -0,0 +1,77 @@
+"""Tests for the pipeline task scheduler."""
+from __future__ import annotations
+
+import threading
+from typing import List
+
+import pytest
+
+from creatorpack.app_cli.util.scheduler import JobCancelled, SchedulerError, TaskGraph
+
+
+def test_dependencies_run_in_order_and_tasks_can_extend_the_graph() -> None:
+    graph = TaskGraph()
+    order: List[str] = []
+
+    def _plan() -> None:
+        order.append("plan")
+        for index in range(3):
+            graph.add(f"render-{index}", lambda index=index: order.append(f"render-{index}"),
+                      deps=["plan"], resource="render")
+
+    graph.add("probe", lambda: order.append("probe"))
+    graph.add("plan", _plan, deps=["probe"])
+    graph.run()
+
+    assert order[:2] == ["probe", "plan"]
+    assert sorted(order[2:]) == ["render-0", "render-1", "render-2"]
+
+
+def test_independent_pools_overlap() -> None:
+    graph = TaskGraph()
+    render_started = threading.Event()
+    stt_saw_render = []
+
+    def _render() -> None:
+        render_started.set()
+
+    def _transcribe() -> None:
+        stt_saw_render.append(render_started.wait(timeout=5))
+
+    graph.add("input-2:transcribe", _transcribe, resource="stt")
+    graph.add("input-1:render", _render, resource="render")
+    graph.run({"stt": 1, "render": 1})
+
+    assert stt_saw_render == [True]
+
+
+def test_failure_is_reraised_and_stops_dependents() -> None:
+    graph = TaskGraph()
+    ran: List[str] = []
+
+    def _boom() -> None:
+        raise ValueError("ffmpeg died")
+
+    graph.add("render", _boom, resource="render")
+    graph.add("manifest", lambda: ran.append("manifest"), deps=["render"])
+    with pytest.raises(ValueError):
+        graph.run()
+    assert ran == []
+
+
+def test_unknown_dependency_rejected() -> None:
+    graph = TaskGraph()
+    with pytest.raises(SchedulerError):
+        graph.add("plan", lambda: None, deps=["missing"])
+
+
+def test_cancel_stops_before_next_task() -> None:
+    graph = TaskGraph()
+    cancel = threading.Event()
+    ran: List[str] = []
+    graph.add("first", lambda: (ran.append("first"), cancel.set()))
+    graph.add("second", lambda: ran.append("second"), deps=["first"])
+
+    with pytest.raises(JobCancelled):
+        graph.run(cancel=cancel)
+    assert ran == ["first"]
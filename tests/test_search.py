@@ -0,0 +1,103 @@
+"""Tests for the cross-job transcript search index."""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, List
+
+from click.testing import CliRunner
+
+from conftest import FakePipeline
+from creatorpack.app_cli import main
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.search import TranscriptIndex, match_expression
+from creatorpack.app_cli.stt.transcribe import TranscriptResult, TranscriptSegment
+
+
+def _export(out: Path, job_id: str, texts: List[str], *, mtime: int = 1_700_000_000) -> None:
+    root = out / job_id
+    (root / "manifests").mkdir(parents=True, exist_ok=True)
+    (root / "transcript").mkdir(exist_ok=True)
+    segments = [
+        {"id": n, "start": 60.0 * n, "end": 60.0 * n + 30.0, "text": text, "speaker": "S1"}
+        for n, text in enumerate(texts)
+    ]
+    (root / "transcript" / "transcript.json").write_text(json.dumps({"language": "en", "segments": segments}))
+    index = {"job_id": job_id, "inputs": [{"key": "input-001", "input": f"{job_id}.mp4", "transcript": "transcript/transcript.json"}]}
+    (root / "manifests" / "index.json").write_text(json.dumps(index))
+    (root / "manifests" / "job.json").write_text(json.dumps({"job_id": job_id, "completed_at": "now"}))
+    os.utime(root / "manifests" / "job.json", ns=(mtime * 10**9, mtime * 10**9))
+
+
+def test_index_updates_incrementally(tmp_path: Path) -> None:
+    out = tmp_path / "exports"
+    _export(out, "ep-1", ["Welcome to the show", "Today we talk about sourdough bread"])
+    _export(out, "ep-2", ["Guest from Köln", "More sourdough starters"])
+    (out / "ep-3" / "manifests").mkdir(parents=True)  # unfinished job: no job.json yet
+    runner = CliRunner()
+
+    result = runner.invoke(main.cli, ["index", "--out", str(out)])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith("2 jobs indexed (4 segments), 0 unchanged, 0 removed")
+
+    result = runner.invoke(main.cli, ["search", "sourdough", "--out", str(out)])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert len(lines) == 2 and {line.split()[0] for line in lines} == {"ep-1", "ep-2"}
+    assert "ep-1  00:01:00  #1  Today we talk about [sourdough] bread" in lines
+
+    result = runner.invoke(main.cli, ["search", "koln", "--out", str(out), "--json"])
+    assert [json.loads(line)["job_id"] for line in result.output.splitlines()] == ["ep-2"]
+
+    _export(out, "ep-2", ["A new cut about rye"], mtime=1_700_000_100)
+    shutil.rmtree(out / "ep-1")
+    result = runner.invoke(main.cli, ["index", "--out", str(out)])
+    assert result.output.startswith("1 jobs indexed (1 segments), 0 unchanged, 1 removed")
+    assert runner.invoke(main.cli, ["index", "--out", str(out)]).output.startswith("0 jobs indexed (0 segments), 1 unchanged")
+    assert runner.invoke(main.cli, ["search", "sourdough", "--out", str(out)]).stderr == "no matches\n"
+
+    result = runner.invoke(main.cli, ["search", 'NEAR("rye"', "--raw", "--out", str(out)])
+    assert result.exit_code == 2 and "invalid search query" in result.stderr
+
+
+def test_malformed_transcripts_are_skipped(tmp_path: Path) -> None:
+    out = tmp_path / "exports"
+    for job_id, document in (("ep-1", ["not", "a", "transcript"]), ("ep-2", {"language": "en"})):
+        _export(out, job_id, ["broken"])
+        (out / job_id / "transcript" / "transcript.json").write_text(json.dumps(document))
+    _export(out, "ep-3", ["Sourdough at last"])
+
+    index = TranscriptIndex(tmp_path / "search.sqlite")
+    report = index.update(out)
+    assert (report.indexed, report.segments) == (3, 1)
+    assert [hit.job_id for hit in index.search("sourdough")] == ["ep-3"]
+
+
+def test_query_words_are_quoted() -> None:
+    assert match_expression('rock-n-roll AND "live"  sour*') == '"rock-n-roll" "AND" """live""" "sour"*'
+    assert match_expression("  ") == ""
+
+
+def test_jobs_index_themselves_when_they_finish(
+    tmp_path: Path, fake_pipeline: FakePipeline, run_options: Callable[..., RunOptions]
+) -> None:
+    fake_pipeline.transcript = TranscriptResult(
+        language="en",
+        segments=[
+            TranscriptSegment(id=0, start=0.0, end=40.0, text="Intro"),
+            TranscriptSegment(id=1, start=40.0, end=95.5, text="The quarterly numbers look great", speaker="S2"),
+        ],
+    )
+    index_path = tmp_path / "search.sqlite"
+    _run_pipeline(run_options(job_id="job-search", search_index=index_path))
+
+    index = TranscriptIndex(index_path)
+    (hit,) = index.search("quarterly numbers")
+    assert (hit.job_id, hit.input, hit.segment, hit.start, hit.speaker) == ("job-search", str(tmp_path / "talk.mp4"), 1, 40.0, "S2")
+    assert hit.transcript == str(tmp_path / "exports" / "job-search" / "transcript" / "transcript.json")
+    assert index.search("quarterly", job_id="other") == []
+    # A later scan finds the job already current.
+    report = index.update(tmp_path / "exports")
+    assert (report.indexed, report.unchanged) == (0, 1)
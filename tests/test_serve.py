@@ -0,0 +1,189 @@
+"""Tests for the serve daemon's job queue and HTTP API."""
+from __future__ import annotations
+
+import http.client
+import json
+import socket
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from conftest import FakePipeline
+from creatorpack.app_cli import main
+from creatorpack.app_cli.media.ffmpeg_ops import MediaProbe
+from creatorpack.app_cli.serve import JobService, create_server, write_token
+
+
+def _request(
+    port: int, method: str, path: str, body: Any = None, token: str = "", **headers: str
+) -> tuple[int, Any]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {token}", **headers}
+    conn.request(method, path, body=payload, headers=headers)
+    response = conn.getresponse()
+    raw = response.read().decode()
+    conn.close()
+    if response.getheader("Content-Type") == "application/x-ndjson":
+        return response.status, [json.loads(line) for line in raw.splitlines()]
+    return response.status, json.loads(raw)
+
+
+def test_queue_runs_by_priority_and_cancels_queued() -> None:
+    gate = threading.Event()
+    ran: List[str] = []
+
+    def _execute(options: SimpleNamespace) -> None:
+        if options.job_id == "blocker":
+            gate.wait(5)
+        ran.append(options.job_id)
+
+    service = JobService(prepare=lambda values: SimpleNamespace(**values), execute=_execute, workers=1)
+    try:
+        blocker = service.submit({"job_id": "blocker", "output_dir": "exports"})
+        while blocker.status != "running":
+            service.events(blocker.id, since=len(blocker.events), timeout=5)
+        low = service.submit({"job_id": "low", "output_dir": "exports"}, priority=0)
+        high = service.submit({"job_id": "high", "output_dir": "exports"}, priority=5)
+        dropped = service.submit({"job_id": "dropped", "output_dir": "exports"}, priority=9)
+        assert service.submit({"job_id": "low", "output_dir": "exports"}) is low
+        assert service.cancel(dropped.id).status == "cancelled"
+        gate.set()
+        for job in (blocker, low, high):
+            while not job.done:
+                service.events(job.id, since=len(job.events), timeout=5)
+        assert ran == ["blocker", "high", "low"]
+        assert low.status == "completed"
+    finally:
+        service.stop(timeout=5)
+
+
+def test_http_api_end_to_end(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fake_pipeline: FakePipeline) -> None:
+    media = tmp_path / "talk.mp4"
+    media.write_bytes(b"talk")
+    monkeypatch.setattr(main, "run_preflight", lambda inputs: None)
+    fake_pipeline.probe_result = MediaProbe(duration=90.0, streams=["video", "audio"])
+
+    defaults = main._job_defaults(1, tmp_path / "exports", "local", True, False)
+    service = JobService(prepare=lambda values: main._prepare_job({**defaults, **values}), execute=main._run_job)
+    server = create_server(service, port=0)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, body = _request(port, "POST", "/jobs", {"options": {"file": str(media), "minutes": 1}}, server.token)
+        assert status == 202
+        job = body["id"]
+
+        status, events = _request(port, "GET", f"/jobs/{job}/events")
+        assert status == 200
+        messages = [event["message"] for event in events]
+        assert messages[0] == "job_queued"
+        assert "job_started" in messages and "task_completed" in messages
+        assert messages[-1] == "job_completed"
+        assert [event["seq"] for event in events] == list(range(len(events)))
+
+        status, body = _request(port, "GET", f"/jobs/{job}")
+        assert body["status"] == "completed"
+        assert (Path(body["output"]) / "manifests" / "job.json").exists()
+
+        status, body = _request(port, "POST", "/jobs", {"options": {"file": str(media), "minutes": 0}}, server.token)
+        assert status == 422 and body["exit_code"] == 2
+        assert _request(port, "POST", "/jobs/nope/cancel", token=server.token)[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop(timeout=5)
+
+
+def test_http_api_rejects_cross_origin_and_unauthenticated_requests() -> None:
+    submitted: List[dict] = []
+
+    def _prepare(values: dict) -> SimpleNamespace:
+        submitted.append(values)
+        return SimpleNamespace(**values)
+
+    service = JobService(prepare=_prepare, execute=lambda options: None)
+    server = create_server(service, port=0, token="s3cret")
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    job = {"options": {"job_id": "job", "output_dir": "exports"}}
+    try:
+        assert server.token == "s3cret"
+        assert _request(port, "POST", "/jobs", job)[0] == 401
+        assert _request(port, "POST", "/jobs", job, "wrong")[0] == 401
+        assert _request(port, "DELETE", "/jobs/job", token="wrong")[0] == 401
+        assert _request(port, "POST", "/jobs", job, "s3cret", **{"Content-Type": "text/plain"})[0] == 415
+        rebound = {"Host": f"attacker.example:{port}"}
+        assert _request(port, "POST", "/jobs", job, "s3cret", **rebound)[0] == 403
+        assert _request(port, "GET", "/jobs", **rebound)[0] == 403
+        assert _request(port, "GET", "/jobs", Host=f"localhost:{port}")[0] == 200
+        assert submitted == []
+
+        status, body = _request(port, "POST", "/jobs", job, "s3cret")
+        assert status == 202
+        for since in ("abc", "-1"):
+            status, error = _request(port, "GET", f"/jobs/{body['id']}/events?since={since}")
+            assert status == 400 and "invalid since" in error["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop(timeout=5)
+
+
+def test_serve_token_file_is_private(tmp_path: Path) -> None:
+    token_path = tmp_path / "exports" / ".serve-token"
+    write_token(token_path, "s3cret")
+    assert token_path.read_text().strip() == "s3cret"
+    assert token_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_finished_jobs_and_events_are_bounded() -> None:
+    def _execute(options: SimpleNamespace) -> None:
+        job = next(job for job in service.list() if job.job_id == options.job_id)
+        for step in range(options.steps):
+            service._event(job, {"message": "task_completed", "step": step})
+
+    service = JobService(
+        prepare=lambda values: SimpleNamespace(**values), execute=_execute, workers=1, keep_finished=2, max_events=5
+    )
+    try:
+        jobs = [service.submit({"job_id": f"job-{n}", "output_dir": "exports", "steps": 20}) for n in range(4)]
+        for job in jobs:
+            while not job.done:
+                service.events(job.id, since=job.event_count, timeout=5)
+
+        assert [job.job_id for job in service.list()] == ["job-2", "job-3"]
+        assert service.get(jobs[0].id) is None and service.events(jobs[0].id) == ([], True)
+        last = jobs[3]
+        assert len(last.events) == 5 and last.event_count == 23  # queued, running, 20 tasks, completed
+        events, done = service.events(last.id, since=0)
+        assert done and [event["seq"] for event in events] == list(range(18, 23))
+        assert events[-1]["message"] == "job_completed"
+        assert [event["seq"] for event in service.events(last.id, since=21)[0]] == [21, 22]
+    finally:
+        service.stop(timeout=5)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+def test_unix_socket_health(tmp_path: Path) -> None:
+    service = JobService(prepare=lambda values: SimpleNamespace(**values), execute=lambda options: None)
+    socket_path = tmp_path / "creatorpack.sock"
+    server = create_server(service, socket_path=socket_path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+        assert response.startswith(b"HTTP/1.1 200")
+        assert response.endswith(b'{"status": "ok"}')
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop(timeout=5)
@@ -0,0 +1,54 @@
+"""Tests for vertical shorts rendering."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from creatorpack.app_cli.branding.theme import load_brand_theme
+from creatorpack.app_cli.media import ffmpeg_ops
+from creatorpack.app_cli.media.ffmpeg_ops import MediaSegment, ShortsProfile, chunk_media
+from creatorpack.app_cli.media.reframe import focus_from_frames
+
+
+def _frames_with_motion(width: int, height: int, column: int, count: int) -> bytes:
+    frames = []
+    for index in range(count):
+        frame = bytearray(width * height)
+        for row in range(height):
+            frame[row * width + column] = 255 if index % 2 else 0
+        frames.append(bytes(frame))
+    return b"".join(frames)
+
+
+def test_focus_tracks_motion_column() -> None:
+    raw = _frames_with_motion(16, 9, column=12, count=4)
+    assert focus_from_frames(raw, 16, 9) == pytest.approx(12.5 / 16)
+
+
+def test_focus_defaults_to_center_without_motion() -> None:
+    assert focus_from_frames(bytes(16 * 9 * 3), 16, 9) == 0.5
+
+
+def test_vertical_crop_happens_in_cut_pass(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"png")
+    brand_file = tmp_path / "brand.yaml"
+    brand_file.write_text(
+        f"name: Test\nwatermark:\n  file: {logo}\n  position: bottom_right\nsafe_areas:\n  tiktok: true\n",
+        encoding="utf-8",
+    )
+    brand = load_brand_theme(brand_file)
+    calls: List[List[str]] = []
+    monkeypatch.setattr(ffmpeg_ops, "_run_command", lambda args, **_: calls.append(list(args)))
+
+    segments = [MediaSegment(start=0.0, end=60.0, caption="Hi", focus_x=0.8)]
+    chunk_media(tmp_path / "in.mp4", tmp_path / "out", segments, brand=brand, short_mode=True,
+                shorts_profile=ShortsProfile())
+
+    assert len(calls) == 1
+    graph = calls[0][calls[0].index("-filter_complex") + 1]
+    assert "iw*0.8000-ow/2" in graph
+    assert "scale=1080:1920" in graph
+    assert "overlay=main_w-overlay_w-main_w*0.14:main_h-overlay_h-main_h*0.2" in graph
@@ -0,0 +1,91 @@
+"""Tests for stage-level memoization across jobs."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import pytest
+
+from conftest import FakePipeline
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.nlp.highlights import HighlightPolicy
+from creatorpack.app_cli.util.stage_cache import StageCache
+
+
+def test_memo_reuses_by_fingerprint(tmp_path: Path) -> None:
+    cache = StageCache(tmp_path / "stages")
+    calls: List[int] = []
+    compute = lambda: calls.append(1) or {"duration": 1.5}  # noqa: E731
+    assert cache.memo("probe", {"source": "a"}, compute) == {"duration": 1.5}
+    assert cache.memo("probe", {"source": "a"}, compute) == {"duration": 1.5}
+    cache.memo("probe", {"source": "b"}, compute)
+    assert len(calls) == 2
+    assert cache.summary() == {"probe": {"reused": 1, "recomputed": 2}}
+
+
+def test_stale_entries_are_recomputed(tmp_path: Path) -> None:
+    cache = StageCache(tmp_path / "stages")
+    codec = {
+        "encode": lambda value: {"seconds": value["duration"]},
+        "decode": lambda data: {"duration": float(data["seconds"])},
+    }
+    cache.memo("probe", {"source": "a"}, lambda: {"duration": 1.5}, **codec)
+    (entry,) = (tmp_path / "stages" / "probe").glob("*.json")
+    # An older layout of the value, a missing value and entries that are not objects at all.
+    for stale in ({"stage": "probe", "value": {"duration": 1.5}}, {"stage": "probe"}, ["value"], "value"):
+        entry.write_text(json.dumps(stale), encoding="utf-8")
+        assert cache.memo("probe", {"source": "a"}, lambda: {"duration": 2.0}, **codec) == {"duration": 2.0}
+    assert cache.memo("probe", {"source": "a"}, lambda: {"duration": 3.0}, **codec) == {"duration": 2.0}
+    assert cache.summary() == {"probe": {"reused": 1, "recomputed": 5}}
+
+
+@pytest.fixture
+def run(
+    tmp_path: Path, fake_pipeline: FakePipeline, run_options: Callable[..., RunOptions]
+) -> Callable[..., dict]:
+    def _run(job_id: str, *, brand: Optional[Path] = None, top_k: int = 1) -> dict:
+        stt, probes, renders = len(fake_pipeline.transcribed), fake_pipeline.probes, len(fake_pipeline.renders)
+        options = run_options(
+            highlights=True,
+            highlight_policy=HighlightPolicy(top_k=top_k, min_seconds=20.0, max_seconds=30.0),
+            brand_path=brand,
+            job_id=job_id,
+            stage_cache_dir=tmp_path / "cache",
+            render_cache_dir=tmp_path / "renders",
+        )
+        _run_pipeline(options)
+        job = json.loads((tmp_path / "exports" / job_id / "manifests" / "job.json").read_text(encoding="utf-8"))
+        return {
+            "stt": len(fake_pipeline.transcribed) - stt,
+            "probe": fake_pipeline.probes - probes,
+            "renders": [
+                path.relative_to(tmp_path / "exports" / job_id).as_posix() for path in fake_pipeline.renders[renders:]
+            ],
+            "stage_cache": job["stage_cache"],
+        }
+
+    return _run
+
+
+def test_brand_change_only_renders_branded_outputs(tmp_path: Path, run: Callable[..., dict]) -> None:
+    first = run("job-plain")
+    assert first["stt"] == 1 and first["probe"] == 1
+    assert len(first["renders"]) == 3
+
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"png")
+    brand = tmp_path / "brand.yaml"
+    brand.write_text(f"name: Test\nwatermark:\n  file: {logo}\n", encoding="utf-8")
+    second = run("job-branded", brand=brand)
+
+    assert second["stt"] == 0 and second["probe"] == 0
+    assert all(path.startswith("branded/") for path in second["renders"])
+    assert len(second["renders"]) == 3
+    assert second["stage_cache"]["render"] == {"reused": 3, "recomputed": 3}
+    assert second["stage_cache"]["transcript"] == {"reused": 1, "recomputed": 0}
+    assert (tmp_path / "exports" / "job-branded" / "chapters" / "talk_part-001.mp4").read_bytes() == b"clip"
+
+    third = run("job-topk", top_k=2)
+    assert third["stage_cache"]["chapter_plan"] == {"reused": 1, "recomputed": 0}
+    assert third["stage_cache"]["highlight_plan"] == {"reused": 0, "recomputed": 1}
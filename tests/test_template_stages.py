@@ -0,0 +1,78 @@
+"""Tests for template-aware stage pruning."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from conftest import FakePipeline
+from creatorpack.app_cli import main
+from creatorpack.app_cli.main import RunOptions, _run_pipeline
+from creatorpack.app_cli.nlp.highlights import HighlightPolicy
+from creatorpack.app_cli.templates import plan_stages
+
+
+@pytest.fixture
+def run(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_pipeline: FakePipeline,
+    run_options: Callable[..., RunOptions],
+) -> Callable[..., dict]:
+    monkeypatch.setattr(main, "detect_silences", lambda *_, **__: [])
+
+    def _run(template: str, *, smart: bool = False, highlights: bool = False) -> dict:
+        _run_pipeline(
+            run_options(
+                template=template,
+                smart=smart,
+                highlights=highlights,
+                highlight_policy=HighlightPolicy(top_k=1),
+                job_id="job-stages",
+            )
+        )
+        return {
+            "stt": len(fake_pipeline.transcribed),
+            "renders": fake_pipeline.renders,
+            "root": tmp_path / "exports" / "job-stages",
+        }
+
+    return _run
+
+
+def test_chapters_only_never_loads_stt(run: Callable[..., dict]) -> None:
+    calls = run("chapters-only", highlights=True)
+    assert calls["stt"] == 0
+    assert sorted(path.name for path in calls["renders"]) == ["talk_part-001.mp4", "talk_part-002.mp4"]
+    assert not (calls["root"] / "transcript" / "transcript.json").exists()
+    assert not (calls["root"] / "manifests" / "highlights.json").exists()
+    job = json.loads((calls["root"] / "manifests" / "job.json").read_text(encoding="utf-8"))
+    assert "transcribe" in job["stages"]["skipped"]
+    assert "render_highlights" in job["stages"]["skipped"]
+
+
+def test_chapters_only_smart_transcribes(run: Callable[..., dict]) -> None:
+    calls = run("chapters-only", smart=True)
+    assert calls["stt"] == 1
+    assert len(calls["renders"]) == 2
+
+
+def test_shorts_only_renders_highlights_only(run: Callable[..., dict]) -> None:
+    calls = run("shorts-only")
+    assert calls["stt"] == 1
+    assert [path.name for path in calls["renders"]] == ["talk_short-001.mp4"]
+    assert not (calls["root"] / "manifests" / "chapters.json").exists()
+
+
+def test_creator_pack_runs_everything_requested(run: Callable[..., dict]) -> None:
+    calls = run("creator-pack", highlights=True)
+    assert calls["stt"] == 1
+    assert len(calls["renders"]) == 3
+
+
+def test_branded_stages_follow_brand() -> None:
+    plan = plan_stages("creator-pack", smart=False, highlights=True, branded=True)
+    assert plan.runs("branded_chapters") and plan.runs("branded_highlights")
+    assert plan.skipped == ["silence_trim"]
@@ -0,0 +1,114 @@
+"""Tests for the watch-folder ingest mode."""
+from __future__ import annotations
+
+import errno
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+
+from creatorpack.app_cli import main
+from creatorpack.app_cli.util.io import dump_json
+from creatorpack.app_cli import watch
+from creatorpack.app_cli.watch import FolderWatcher, WatchError
+
+
+def _poll_until(watcher: FolderWatcher, seconds: float) -> List[Path]:
+    ready: List[Path] = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        ready.extend(watcher.poll(0.05))
+    return ready
+
+
+@pytest.mark.parametrize(
+    "backend",
+    ["poll", pytest.param("inotify", marks=pytest.mark.skipif(sys.platform != "linux", reason="Linux only"))],
+)
+def test_files_are_reported_once_they_settle(tmp_path: Path, backend: str) -> None:
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    existing = tmp_path / "old.mp4"
+    existing.write_bytes(b"done")
+    watcher = FolderWatcher(tmp_path, settle_seconds=0.3, backend=backend, ignore=[exports])
+    try:
+        assert watcher.backend == backend
+        copying = tmp_path / "shows" / "ep1.mov"
+        copying.parent.mkdir()
+        ready: List[Path] = []
+        with copying.open("wb") as handle:
+            for _ in range(4):
+                handle.write(b"x" * 1024)
+                handle.flush()
+                ready.extend(_poll_until(watcher, 0.15))
+                assert copying.resolve() not in ready
+        (tmp_path / "notes.txt").write_text("skip", encoding="utf-8")
+        (exports / "render.mp4").write_bytes(b"output")
+
+        ready.extend(_poll_until(watcher, 0.8))
+        assert sorted(ready) == sorted([existing.resolve(), copying.resolve()])
+        assert watcher.pending == 0
+        assert _poll_until(watcher, 0.4) == []
+    finally:
+        watcher.close()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Linux only")
+def test_watch_limit_falls_back_to_polling(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "old.mp4").write_bytes(b"done")
+    add_watch = watch._InotifySource._add_watch
+    budget = {"watches": 1}
+
+    def _limited(self: watch._InotifySource, path: Path) -> int:
+        if budget["watches"] <= 0:
+            raise OSError(errno.ENOSPC, "inotify_add_watch failed: No space left on device")
+        budget["watches"] -= 1
+        return add_watch(self, path)
+
+    monkeypatch.setattr(watch._InotifySource, "_add_watch", _limited)
+    watcher = FolderWatcher(tmp_path, settle_seconds=0.1)
+    try:
+        assert watcher.backend == "inotify"
+        # The new folder needs a second watch: the watcher carries on by polling.
+        (tmp_path / "shows").mkdir()
+        (tmp_path / "shows" / "ep1.mov").write_bytes(b"new")
+        ready = _poll_until(watcher, 0.5)
+        assert watcher.backend == "poll"
+        assert (tmp_path / "shows" / "ep1.mov").resolve() in ready
+    finally:
+        watcher.close()
+
+    budget["watches"] = 0
+    fallback = FolderWatcher(tmp_path, settle_seconds=0.1)
+    assert fallback.backend == "poll" and fallback.pending == 2
+    fallback.close()
+    with pytest.raises(WatchError, match="No space left"):
+        FolderWatcher(tmp_path, backend="inotify")
+
+
+def test_enqueue_skips_completed_exports(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(main, "run_preflight", lambda inputs: None)
+    media = tmp_path / "talk.mp4"
+    media.write_bytes(b"talk")
+    values = {**main._job_defaults(1, tmp_path / "exports", "local", True, False), "file": str(media)}
+    queued: Dict[str, SimpleNamespace] = {}
+
+    def _enqueue(options: object) -> SimpleNamespace:
+        return queued.setdefault(options.job_id, SimpleNamespace(job_id=options.job_id, options=options))
+
+    service = SimpleNamespace(enqueue=_enqueue)
+
+    assert main._enqueue_watched(service, values).startswith("queued job-")
+    job_id = next(iter(queued))
+    # Same bytes under another name and a newer mtime: the same job.
+    copy = tmp_path / "incoming" / "talk-copy.mp4"
+    copy.parent.mkdir()
+    copy.write_bytes(b"talk")
+    assert main._enqueue_watched(service, {**values, "file": str(copy)}) == f"duplicate {job_id}"
+    dump_json({"job_id": job_id, "completed_at": "now"}, tmp_path / "exports" / job_id / "manifests" / "job.json")
+    assert main._enqueue_watched(service, values) == f"skipped {job_id}"
+    assert main._enqueue_watched(service, {**values, "minutes": "0"}).startswith("rejected")
+    assert len(queued) == 1